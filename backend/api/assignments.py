@@ -0,0 +1,83 @@
+"""
+Juz and surah claiming.
+
+A claim inserts the requested assignment rows with INSERT ... ON CONFLICT DO
+NOTHING (bulk_create(ignore_conflicts=True)) and then reads back which of
+the generated primary keys made it in. The (number, khatmah) unique
+constraint decides every race inside the database, so concurrent claims of
+the same number never surface as an IntegrityError: exactly one request
+wins it and the others see it as taken.
+"""
+import uuid
+
+from django.db import transaction
+
+from . import events, progress
+from .models import Khatmah, Participant, JuzAssignment, SurahAssignment
+
+# khatmah_type -> (assignment model, number field, highest number)
+CLAIM_KINDS = {
+    Khatmah.JUZ_TYPE: (JuzAssignment, 'juz_number', 30),
+    Khatmah.SURAH_TYPE: (SurahAssignment, 'surah_number', 114),
+}
+
+# Most numbers one claim may ask for (a whole surah khatmah)
+MAX_CLAIM_NUMBERS = 114
+
+
+def parse_numbers(kind, raw):
+    """
+    Validate the numbers of a claim: a single value or a list, each within
+    the range of `kind`. Returns them deduplicated in request order, raising
+    ValueError with a client-facing message otherwise.
+    """
+    _, _, highest = CLAIM_KINDS[kind]
+    values = raw if isinstance(raw, (list, tuple)) else [raw]
+    if not values or values == [None]:
+        raise ValueError('At least one number is required')
+    if len(values) > MAX_CLAIM_NUMBERS:
+        raise ValueError(f'At most {MAX_CLAIM_NUMBERS} numbers can be claimed at once')
+
+    numbers = []
+    for value in values:
+        try:
+            number = int(value)
+        except (ValueError, TypeError):
+            raise ValueError(f'Invalid {kind} number format')
+        if number < 1 or number > highest:
+            raise ValueError(f'{kind.capitalize()} number must be between 1 and {highest}')
+        if number not in numbers:
+            numbers.append(number)
+    return numbers
+
+
+def claim(khatmah_id, participant_id, kind, numbers):
+    """
+    Assign `numbers` of `kind` ('juz' or 'surah') to a participant of the
+    khatmah in one transaction. Returns (won, taken): the created assignment
+    instances and the numbers that already belonged to someone. Raises
+    Participant.DoesNotExist if the participant is not part of the khatmah.
+    """
+    model, field, _ = CLAIM_KINDS[kind]
+    with transaction.atomic():
+        participant = Participant.objects.get(pk=participant_id, khatmah_id=khatmah_id)
+        rows = [
+            model(id=uuid.uuid4(), participant=participant, khatmah_id=khatmah_id, **{field: number})
+            for number in numbers
+        ]
+        model.objects.bulk_create(rows, ignore_conflicts=True)
+        # Rows skipped by ON CONFLICT DO NOTHING keep their unsaved primary key
+        inserted = set(model.objects.filter(pk__in=[row.pk for row in rows]).values_list('pk', flat=True))
+        if inserted:
+            # bulk_create sends no post_save signals
+            progress.bump_version(khatmah_id)
+
+    won = [row for row in rows if row.pk in inserted]
+    taken = [getattr(row, field) for row in rows if row.pk not in inserted]
+    if won:
+        events.publish(khatmah_id, events.CLAIM, {
+            'participant': {'id': str(participant.id), 'name': participant.name},
+            'type': kind,
+            'numbers': [getattr(row, field) for row in won],
+        })
+    return won, taken
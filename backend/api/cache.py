@@ -0,0 +1,86 @@
+"""
+Thin helpers over the shared Django cache.
+
+Keys are grouped by namespace ('quran-text', 'hijri-calendar', 'khatmah-progress', ...)
+and every lookup is counted so hit rates can be watched through the
+staff-only /api/cache-stats/ endpoint. Counters are kept per process.
+"""
+import os
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Stored in place of None so a cached None is not mistaken for a miss
+_NONE = '__cached_none__'
+_MISSING = object()
+
+_stats = defaultdict(lambda: {'hits': 0, 'misses': 0})
+_stats_lock = threading.Lock()
+
+
+def make_key(namespace, key):
+    return f'{namespace}:{key}'
+
+
+def _record(namespace, hit):
+    with _stats_lock:
+        _stats[namespace]['hits' if hit else 'misses'] += 1
+
+
+def get(namespace, key, default=None):
+    value = cache.get(make_key(namespace, key), _MISSING)
+    _record(namespace, value is not _MISSING)
+    if value is _MISSING:
+        return default
+    return None if value == _NONE else value
+
+
+def set(namespace, key, value, timeout=_MISSING):
+    """Store `value`; timeout defaults to settings.CACHE_TTL, None caches forever"""
+    if timeout is _MISSING:
+        timeout = settings.CACHE_TTL
+    cache.set(make_key(namespace, key), _NONE if value is None else value, timeout)
+
+
+def add(namespace, key, value, timeout=_MISSING):
+    """Store `value` only if the key is absent; returns whether it was stored"""
+    if timeout is _MISSING:
+        timeout = settings.CACHE_TTL
+    return cache.add(make_key(namespace, key), _NONE if value is None else value, timeout)
+
+
+def delete(namespace, key):
+    cache.delete(make_key(namespace, key))
+
+
+def get_or_set(namespace, key, builder, timeout=_MISSING):
+    """Return the cached value, calling `builder()` and storing its result on a miss"""
+    value = get(namespace, key, _MISSING)
+    if value is _MISSING:
+        value = builder()
+        set(namespace, key, value, timeout)
+    return value
+
+
+def stats():
+    """Hit/miss counters of this process, per namespace"""
+    with _stats_lock:
+        namespaces = {}
+        for namespace, counts in sorted(_stats.items()):
+            lookups = counts['hits'] + counts['misses']
+            namespaces[namespace] = {
+                **counts,
+                'hit_rate': round(counts['hits'] / lookups, 4) if lookups else None,
+            }
+    return {
+        'backend': settings.CACHES['default']['BACKEND'],
+        'pid': os.getpid(),
+        'namespaces': namespaces,
+    }
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
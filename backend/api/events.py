@@ -0,0 +1,225 @@
+"""
+Live khatmah events.
+
+Views publish join, claim, toggle_complete and remove_participant events
+once their transaction commits; the server-sent events endpoint streams
+them to every client watching the khatmah, so they no longer need to
+re-fetch the whole khatmah to notice a change.
+
+Events go through a broker, chosen by settings.KHATMAH_EVENTS_BROKER. The
+default InProcessBroker keeps a ring buffer of the latest events of each
+khatmah so a reconnecting client can resume from its Last-Event-ID, but it
+only reaches clients connected to the same process: deployments running
+several workers need a broker backed by a shared pub/sub with the same
+interface.
+
+Event ids are sent as "{epoch}-{n}". Every InProcessBroker has its own
+epoch, so an id from before a restart, or from another worker, is never
+mistaken for one of its own: the client gets a `reset` instead of silently
+skipping the events numbered up to its old id.
+"""
+import asyncio
+import json
+import threading
+import uuid
+from collections import OrderedDict, deque, namedtuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+JOIN = 'join'
+CLAIM = 'claim'
+TOGGLE_COMPLETE = 'toggle_complete'
+REMOVE_PARTICIPANT = 'remove_participant'
+# Sent when the events after a client's Last-Event-ID are no longer buffered
+RESET = 'reset'
+
+# `id` increases by one with every event of a channel
+Event = namedtuple('Event', ['id', 'type', 'data'])
+
+
+class Subscription:
+    """Events of one channel delivered to one asyncio consumer"""
+
+    def __init__(self, broker, channel):
+        self.broker = broker
+        self.channel = channel
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+
+    def deliver(self, event):
+        # Called from whichever thread published the event
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+        except RuntimeError:
+            # The consumer's loop is closed; it is about to unsubscribe
+            pass
+
+    async def get(self, timeout):
+        """The next event, or None if none arrives within `timeout` seconds"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class _Channel:
+    def __init__(self, buffer_size):
+        self.last_id = 0
+        self.buffer = deque(maxlen=buffer_size)
+        self.subscribers = set()
+
+
+class InProcessBroker:
+    """
+    Pub/sub within this process. Keeps the last `buffer_size` events of at
+    most `max_channels` channels; the least recently used channels without
+    subscribers are forgotten first.
+    """
+
+    def __init__(self, buffer_size=100, max_channels=1000):
+        # Distinguishes this broker's event ids from those of earlier processes
+        self.epoch = uuid.uuid4().hex[:8]
+        self.buffer_size = buffer_size
+        self.max_channels = max_channels
+        self._channels = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _channel(self, name):
+        channel = self._channels.get(name)
+        if channel is None:
+            channel = self._channels[name] = _Channel(self.buffer_size)
+            self._evict()
+        else:
+            self._channels.move_to_end(name)
+        return channel
+
+    def _evict(self):
+        for name in list(self._channels):
+            if len(self._channels) <= self.max_channels:
+                break
+            if not self._channels[name].subscribers:
+                del self._channels[name]
+
+    def publish(self, name, event_type, data):
+        with self._lock:
+            channel = self._channel(name)
+            channel.last_id += 1
+            event = Event(channel.last_id, event_type, data)
+            channel.buffer.append(event)
+            subscribers = list(channel.subscribers)
+        for subscription in subscribers:
+            subscription.deliver(event)
+        return event
+
+    def replay(self, name, last_event_id):
+        """
+        Buffered events after `last_event_id`, or None if some of them have
+        already left the buffer (or were published before a restart).
+        """
+        with self._lock:
+            channel = self._channels.get(name)
+            if channel is None:
+                return None if last_event_id else []
+            if last_event_id > channel.last_id:
+                return None
+            missed = [event for event in channel.buffer if event.id > last_event_id]
+            if len(missed) < channel.last_id - last_event_id:
+                return None
+        return missed
+
+    def subscribe(self, name):
+        """Must be called from the event loop that will consume the subscription"""
+        subscription = Subscription(self, name)
+        with self._lock:
+            self._channel(name).subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            channel = self._channels.get(subscription.channel)
+            if channel is not None:
+                channel.subscribers.discard(subscription)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """The process-wide broker configured by settings.KHATMAH_EVENTS_BROKER"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                broker_class = import_string(settings.KHATMAH_EVENTS_BROKER)
+                _broker = broker_class(buffer_size=settings.KHATMAH_EVENTS_BUFFER)
+    return _broker
+
+
+def publish(khatmah_id, event_type, data):
+    """Publish an event of a khatmah once the current transaction commits"""
+    transaction.on_commit(lambda: get_broker().publish(str(khatmah_id), event_type, data))
+
+
+def parse_event_id(value, epoch):
+    """
+    Number of an event id a client sent back, or None if it was not issued
+    by a broker of `epoch`
+    """
+    given, _, number = value.strip().rpartition('-')
+    if given != epoch or not number.isdigit():
+        return None
+    return int(number)
+
+
+def format_event(event, epoch):
+    """Serialize an event of a broker of `epoch` in the text/event-stream format"""
+    lines = []
+    if event.id is not None:
+        lines.append(f'id: {epoch}-{event.id}')
+    lines.append(f'event: {event.type}')
+    lines.append(f'data: {json.dumps(event.data, cls=DjangoJSONEncoder, ensure_ascii=False)}')
+    return ('\n'.join(lines) + '\n\n').encode('utf-8')
+
+
+async def stream(khatmah_id, last_event_id=None):
+    """
+    Async iterator over the text/event-stream body for a khatmah: the events
+    missed since `last_event_id` (the client's Last-Event-ID) first, then live
+    events, with a comment line every settings.KHATMAH_EVENTS_KEEPALIVE
+    seconds of silence.
+    """
+    broker = get_broker()
+    channel = str(khatmah_id)
+    # Subscribe before replaying so nothing published in between is lost;
+    # events delivered twice are skipped by id
+    subscription = broker.subscribe(channel)
+    try:
+        yield b'retry: 3000\n\n'
+        last_sent = None
+        if last_event_id is not None:
+            last_sent = parse_event_id(last_event_id, broker.epoch)
+            missed = None if last_sent is None else broker.replay(channel, last_sent)
+            if missed is None:
+                yield format_event(Event(None, RESET, {'khatmah': channel}), broker.epoch)
+                missed = []
+                last_sent = None
+            for event in missed:
+                yield format_event(event, broker.epoch)
+                last_sent = event.id
+
+        while True:
+            event = await subscription.get(settings.KHATMAH_EVENTS_KEEPALIVE)
+            if event is None:
+                yield b': keepalive\n\n'
+            elif last_sent is None or event.id > last_sent:
+                yield format_event(event, broker.epoch)
+                last_sent = event.id
+    finally:
+        subscription.close()
@@ -0,0 +1,351 @@
+"""
+Hijri calendar services.
+
+MonthResolver answers "which HijriMonth contains this Gregorian date" (or the
+nearest one when none does) from sorted in-memory interval arrays, so lookups
+cost a bisect instead of database queries. The arrays are loaded once per
+process and reloaded after any HijriMonth is saved or deleted: the signal
+receivers bump a version token in the shared cache, which every worker
+compares against the token it loaded with.
+
+The get_hijri_calendar payload of each month is built in one pass over its
+events and materialized into the cache whenever the month or one of its
+events changes, so reads are a single cache fetch.
+
+The year view (every month of a year with its days and event summaries)
+is built from one annotated query and two prefetches and cached per year
+until a month or event of that year changes.
+"""
+import functools
+import threading
+import uuid
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Prefetch
+
+from . import cache
+from .models import HijriMonth, HijriEvent, AstronomicalEvent
+from .serializers import HijriEventSerializer, AstronomicalEventSerializer
+
+
+class MonthIntervals:
+    """
+    Immutable snapshot of every month's (gregorian_start, gregorian_end, id,
+    year, number, source)
+    """
+
+    def __init__(self, rows):
+        # (year, number) -> (gregorian_start, gregorian_end, source)
+        self.months = {(row[3], row[4]): (row[0], row[1], row[5]) for row in rows}
+
+        by_start = sorted(rows, key=lambda row: row[0])
+        self.starts = [row[0] for row in by_start]
+        self.ends = [row[1] for row in by_start]
+        self.ids = [row[2] for row in by_start]
+
+        by_end = sorted(rows, key=lambda row: row[1])
+        self.sorted_ends = [row[1] for row in by_end]
+        self.sorted_end_ids = [row[2] for row in by_end]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def containing(self, day):
+        """Id of the month whose range contains `day`, or None"""
+        index = bisect_right(self.starts, day) - 1
+        if index >= 0 and self.ends[index] >= day:
+            return self.ids[index]
+        return None
+
+    def nearest(self, day):
+        """
+        Id of the month containing `day`, otherwise of the closer of the next
+        month to start and the last month to end (the past month wins ties).
+        Returns None only when there are no months at all.
+        """
+        month_id = self.containing(day)
+        if month_id is not None:
+            return month_id
+
+        future_index = bisect_right(self.starts, day)
+        past_index = bisect_left(self.sorted_ends, day) - 1
+        has_future = future_index < len(self.starts)
+        has_past = past_index >= 0
+
+        if has_future and has_past:
+            days_to_future = (self.starts[future_index] - day).days
+            days_from_past = (day - self.sorted_ends[past_index]).days
+            if days_to_future < days_from_past:
+                return self.ids[future_index]
+            return self.sorted_end_ids[past_index]
+        if has_future:
+            return self.ids[future_index]
+        if has_past:
+            return self.sorted_end_ids[past_index]
+        return None
+
+
+class MonthResolver:
+    VERSION_KEY = 'version'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._intervals = None
+        self._version = None
+
+    def _current_version(self):
+        version = cache.get('hijri-months', self.VERSION_KEY)
+        if version is None:
+            # First worker to look (or an evicted key): publish a fresh token
+            cache.set('hijri-months', self.VERSION_KEY, uuid.uuid4().hex, timeout=None)
+            version = cache.get('hijri-months', self.VERSION_KEY)
+        return version
+
+    def intervals(self):
+        version = self._current_version()
+        intervals = self._intervals
+        if intervals is not None and self._version == version:
+            return intervals
+
+        with self._lock:
+            if self._intervals is None or self._version != version:
+                rows = list(HijriMonth.objects.order_by().values_list(
+                    'gregorian_start', 'gregorian_end', 'id', 'year', 'number', 'source'
+                ))
+                self._intervals = MonthIntervals(rows)
+                self._version = version
+            return self._intervals
+
+    def invalidate(self):
+        """Make every process reload its intervals on the next lookup"""
+        cache.set('hijri-months', self.VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        with self._lock:
+            self._intervals = None
+
+    def containing(self, day):
+        return self.intervals().containing(day)
+
+    def nearest(self, day):
+        return self.intervals().nearest(day)
+
+
+month_resolver = MonthResolver()
+
+
+def resolve_month(day):
+    """
+    The HijriMonth containing `day` or the nearest one, or None if no months
+    exist. Only the final fetch of the month row touches the database.
+    """
+    month_id = month_resolver.nearest(day)
+    if month_id is None:
+        return None
+    return HijriMonth.objects.filter(pk=month_id).first()
+
+
+FULL_SHAPE = 'full'
+COMPACT_SHAPE = 'compact'
+CALENDAR_SHAPES = (FULL_SHAPE, COMPACT_SHAPE)
+
+
+def build_month_calendar(month):
+    """
+    Build the get_hijri_calendar payload of `month` in every shape. Events are
+    grouped by Hijri day and astronomical events by Gregorian date in a single
+    pass, so each calendar day is a dict lookup.
+    """
+    # Plain dicts so the payload can be stored in the shared cache
+    events_data = [dict(event) for event in HijriEventSerializer(
+        HijriEvent.objects.filter(month=month), many=True).data]
+    astro_events_data = [dict(event) for event in AstronomicalEventSerializer(
+        AstronomicalEvent.objects.filter(month=month), many=True).data]
+
+    events_by_day = defaultdict(list)
+    for event in events_data:
+        events_by_day[event['day']].append(event)
+    astro_events_by_date = defaultdict(list)
+    for event in astro_events_data:
+        astro_events_by_date[event['date']].append(event)
+
+    full_days = []
+    compact_days = []
+    if month.calendar_data and 'gregorian_dates' in month.calendar_data:
+        for date_mapping in month.calendar_data['gregorian_dates']:
+            hijri_day = date_mapping['hijri']
+            gregorian_date = date_mapping['gregorian']
+            day_events = events_by_day.get(hijri_day, [])
+            day_astro_events = astro_events_by_date.get(gregorian_date, [])
+
+            full_days.append({
+                'hijri_day': hijri_day,
+                'gregorian_date': gregorian_date,
+                'events': day_events,
+                'astronomical_events': day_astro_events
+            })
+            compact_days.append({
+                'hijri_day': hijri_day,
+                'gregorian_date': gregorian_date,
+                'event_ids': [event['id'] for event in day_events],
+                'astronomical_event_ids': [event['id'] for event in day_astro_events]
+            })
+
+    month_data = {
+        'id': str(month.id),
+        'name_ar': month.name_ar,
+        'name_en': month.name_en,
+        'number': month.number,
+        'year': month.year,
+        'gregorian_start': month.gregorian_start,
+        'gregorian_end': month.gregorian_end,
+        'moon_sighting_data': month.moon_sighting_data,
+        'source': month.source
+    }
+    common = {
+        'month': month_data,
+        'events': events_data,
+        'astronomical_events': astro_events_data
+    }
+    return {
+        FULL_SHAPE: {**common, 'calendar': full_days},
+        COMPACT_SHAPE: {**common, 'calendar': compact_days},
+    }
+
+
+def _calendar_key(month_id, shape):
+    return f'{month_id}:{shape}'
+
+
+def materialize_month_calendar(month_id):
+    """(Re)build and store every shape of a month's calendar payload"""
+    month = HijriMonth.objects.filter(pk=month_id).first()
+    if month is None:
+        delete_month_calendar(month_id)
+        return None
+
+    payloads = build_month_calendar(month)
+    for shape, payload in payloads.items():
+        cache.set('hijri-calendar', _calendar_key(month_id, shape), payload)
+    return payloads
+
+
+def delete_month_calendar(month_id):
+    for shape in CALENDAR_SHAPES:
+        cache.delete('hijri-calendar', _calendar_key(month_id, shape))
+
+
+def get_month_calendar(month_id, shape=FULL_SHAPE):
+    """
+    The cached calendar payload of a month, materializing it on a miss (first
+    read after a cache flush or eviction). Raises HijriMonth.DoesNotExist for
+    an unknown month.
+    """
+    payload = cache.get('hijri-calendar', _calendar_key(month_id, shape))
+    if payload is None:
+        payloads = materialize_month_calendar(month_id)
+        if payloads is None:
+            raise HijriMonth.DoesNotExist(f'No Hijri month with id {month_id}')
+        payload = payloads[shape]
+    return payload
+
+
+def schedule_materialize(month_id):
+    """Rebuild a month's payload once the current transaction commits"""
+    # Drop the stale payload right away so nothing serves it in the meantime
+    delete_month_calendar(month_id)
+    transaction.on_commit(functools.partial(materialize_month_calendar, month_id))
+
+
+# Fields of the event summaries in the year view
+YEAR_EVENT_FIELDS = ('id', 'day', 'title_ar', 'title_en', 'is_holiday', 'event_type')
+YEAR_ASTRONOMICAL_EVENT_FIELDS = ('id', 'date', 'time', 'title_ar', 'title_en')
+
+
+def build_year_calendar(year):
+    """
+    The year view payload of a Hijri year, or None if it has no months:
+    every month with its day mappings and the summaries of its events.
+    """
+    months = list(
+        HijriMonth.objects.filter(year=year)
+        .annotate(
+            event_count=Count('events', distinct=True),
+            astronomical_event_count=Count('astronomical_events', distinct=True),
+        )
+        .prefetch_related(
+            Prefetch('events', queryset=HijriEvent.objects.only('month', *YEAR_EVENT_FIELDS)),
+            Prefetch('astronomical_events', queryset=AstronomicalEvent.objects.only(
+                'month', *YEAR_ASTRONOMICAL_EVENT_FIELDS).order_by('date', 'time')),
+        )
+        .order_by('number')
+    )
+    if not months:
+        return None
+
+    months_data = []
+    for month in months:
+        events_by_day = defaultdict(list)
+        for event in month.events.all():
+            events_by_day[event.day].append({
+                'id': str(event.id),
+                'title_ar': event.title_ar,
+                'title_en': event.title_en,
+                'is_holiday': event.is_holiday,
+                'event_type': event.event_type,
+            })
+        astro_events_by_date = defaultdict(list)
+        for event in month.astronomical_events.all():
+            astro_events_by_date[event.date.isoformat()].append({
+                'id': str(event.id),
+                'title_ar': event.title_ar,
+                'title_en': event.title_en,
+                'time': event.time.isoformat(timespec='minutes'),
+            })
+
+        days = []
+        for date_mapping in (month.calendar_data or {}).get('gregorian_dates', []):
+            days.append({
+                'hijri_day': date_mapping['hijri'],
+                'gregorian_date': date_mapping['gregorian'],
+                'events': events_by_day.get(date_mapping['hijri'], []),
+                'astronomical_events': astro_events_by_date.get(date_mapping['gregorian'], []),
+            })
+
+        months_data.append({
+            'id': str(month.id),
+            'number': month.number,
+            'name_ar': month.name_ar,
+            'name_en': month.name_en,
+            'gregorian_start': month.gregorian_start,
+            'gregorian_end': month.gregorian_end,
+            'source': month.source,
+            'event_count': month.event_count,
+            'astronomical_event_count': month.astronomical_event_count,
+            'holiday_count': sum(1 for events in events_by_day.values() for event in events if event['is_holiday']),
+            'days': days,
+        })
+    return {'year': year, 'months': months_data}
+
+
+def get_year_calendar(year):
+    """Cached year view payload; raises HijriMonth.DoesNotExist for a year without months"""
+    payload = cache.get('hijri-year', str(year))
+    if payload is None:
+        payload = build_year_calendar(year)
+        if payload is None:
+            raise HijriMonth.DoesNotExist(f'No Hijri months in {year}')
+        cache.set('hijri-year', str(year), payload)
+    return payload
+
+
+def _delete_year_calendars(years):
+    for year in years:
+        cache.delete('hijri-year', str(year))
+
+
+def invalidate_year_calendars(*years):
+    """Drop the cached year views of `years`, now and once the transaction commits"""
+    _delete_year_calendars(years)
+    # Again once committed, in case a reader cached the old rows in between
+    transaction.on_commit(functools.partial(_delete_year_calendars, years))
@@ -0,0 +1,169 @@
+"""
+Gregorian <-> Hijri date conversion.
+
+Conversions use the months of the month resolver's in-memory snapshot
+(sighted and computed HijriMonth rows) and fall back to the tabular
+calendar for months that are not stored, fitted around the stored ones the
+way generate_months() would. The twelve month ranges of each Hijri year
+are assembled once per snapshot and kept in memory, so a conversion is a
+dict lookup plus a bisect over twelve dates, without any query. The
+tables go away with the snapshot whenever a month changes.
+"""
+import threading
+from bisect import bisect_right
+from collections import OrderedDict, namedtuple
+from datetime import date, timedelta
+
+from . import hijri, hijri_tabular
+
+# Source of the months that are not stored
+TABULAR = 'tabular'
+
+# Year tables kept per snapshot (a table is twelve date ranges)
+MAX_YEAR_TABLES = 1024
+
+# The last Hijri year whose months all end by date.max, and its last day;
+# the year after it runs past the dates Python can represent
+LAST_YEAR = hijri_tabular.to_hijri(date.max)[0] - 1
+LAST_DAY = hijri_tabular.month_start(LAST_YEAR + 1, 1) - timedelta(days=1)
+
+HijriDate = namedtuple('HijriDate', ['year', 'month', 'day'])
+
+
+class YearTable:
+    """The month ranges of one Hijri year"""
+
+    def __init__(self, year, months):
+        # months: [(number, start, end, source)] in order
+        self.year = year
+        self.months = {month[0]: month for month in months}
+        self.starts = [month[1] for month in months]
+        self.rows = months
+
+    def containing(self, day):
+        index = bisect_right(self.starts, day) - 1
+        if index >= 0 and self.rows[index][2] >= day:
+            return self.rows[index]
+        return None
+
+
+class Converter:
+    """Conversions against one snapshot of the stored months"""
+
+    def __init__(self, intervals):
+        self.intervals = intervals
+        self._tables = OrderedDict()
+        self._lock = threading.Lock()
+
+    def year_table(self, year):
+        table = self._tables.get(year)
+        if table is not None:
+            return table
+
+        stored = self.intervals.months
+        months = []
+        for number in range(1, 13):
+            if (year, number) in stored:
+                start, end, source = stored[year, number]
+            else:
+                fitted = hijri_tabular.fitted_range(year, number, stored)
+                if fitted is None:
+                    continue
+                (start, end), source = fitted, TABULAR
+            months.append((number, start, end, source))
+        table = YearTable(year, months)
+
+        with self._lock:
+            self._tables[year] = table
+            while len(self._tables) > MAX_YEAR_TABLES:
+                self._tables.popitem(last=False)
+        return table
+
+    def to_hijri(self, day):
+        """(HijriDate, month length, source) of a Gregorian date"""
+        # The tabular year is right or one off near the stored months
+        year = hijri_tabular.to_hijri(day)[0]
+        for candidate in (year, year - 1, year + 1):
+            if not 1 <= candidate <= LAST_YEAR:
+                continue
+            month = self.year_table(candidate).containing(day)
+            if month is not None:
+                number, start, end, source = month
+                return HijriDate(candidate, number, (day - start).days + 1), (end - start).days + 1, source
+        raise ValueError(f'No Hijri month contains {day.isoformat()}')
+
+    def to_gregorian(self, hijri_date):
+        """(Gregorian date, month length, source) of a HijriDate"""
+        year, number, day = hijri_date
+        if not 1 <= year <= LAST_YEAR or not 1 <= number <= 12:
+            raise ValueError(f'Hijri year must be between 1 and {LAST_YEAR} and month between 1 and 12')
+        month = self.year_table(year).months.get(number)
+        if month is None:
+            raise ValueError(f'Hijri month {year}-{number:02d} has no days')
+        _, start, end, source = month
+        length = (end - start).days + 1
+        if not 1 <= day <= length:
+            raise ValueError(f'Hijri month {year}-{number:02d} has {length} days')
+        return start + timedelta(days=day - 1), length, source
+
+
+_converter = None
+
+
+def get_converter():
+    """A Converter for the current snapshot of the month resolver"""
+    global _converter
+    intervals = hijri.month_resolver.intervals()
+    converter = _converter
+    if converter is None or converter.intervals is not intervals:
+        converter = _converter = Converter(intervals)
+    return converter
+
+
+def parse_gregorian(value):
+    try:
+        day = date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError('Gregorian dates must be YYYY-MM-DD')
+    if day.toordinal() < hijri_tabular.EPOCH:
+        raise ValueError('Dates before 1 Muharram 1H (622-07-19) have no Hijri date')
+    if day > LAST_DAY:
+        raise ValueError(f'Dates after {LAST_DAY.isoformat()} (end of {LAST_YEAR}H) are out of range')
+    return day
+
+
+def parse_hijri(value):
+    try:
+        year, month, day = (int(part) for part in value.split('-'))
+    except (AttributeError, ValueError):
+        raise ValueError('Hijri dates must be YYYY-MM-DD')
+    return HijriDate(year, month, day)
+
+
+def payload(gregorian, hijri_date, month_length, source):
+    name_ar, name_en = hijri_tabular.MONTH_NAMES[hijri_date.month]
+    return {
+        'gregorian': gregorian.isoformat(),
+        'hijri': {
+            'date': f'{hijri_date.year:04d}-{hijri_date.month:02d}-{hijri_date.day:02d}',
+            'year': hijri_date.year,
+            'month': {'number': hijri_date.month, 'en': name_en, 'ar': name_ar},
+            'day': hijri_date.day,
+            'month_length': month_length,
+        },
+        'source': source,
+    }
+
+
+def convert_gregorian(converter, value):
+    """Conversion payload of a YYYY-MM-DD Gregorian date; ValueError if invalid"""
+    day = parse_gregorian(value)
+    hijri_date, month_length, source = converter.to_hijri(day)
+    return payload(day, hijri_date, month_length, source)
+
+
+def convert_hijri(converter, value):
+    """Conversion payload of a YYYY-MM-DD Hijri date; ValueError if invalid"""
+    hijri_date = parse_hijri(value)
+    day, month_length, source = converter.to_gregorian(hijri_date)
+    return payload(day, hijri_date, month_length, source)
@@ -0,0 +1,290 @@
+"""
+Declarative Hijri year files.
+
+Every year of the calendar is a data file in settings.HIJRI_DATA_DIR
+(<year>.json, or .yaml when PyYAML is installed) listing its months, each
+with its Gregorian range, moon sighting data, events and astronomical
+events. load_year() validates a file and upserts the whole year in one
+transaction: one INSERT ... ON CONFLICT for the months, one per event
+table, and one DELETE per event table for the events no longer in the
+file, so adding a year needs a data file and no code.
+
+Events have no natural key, so their ids are derived from the month, day
+and Arabic title (astronomical events: date, time and title). Reloading a
+file keeps the ids clients have already seen; editing an event's other
+fields updates it in place. Months of the year that are missing from the
+file are left alone; computed months (api/hijri_tabular.py) that a file
+covers become sighted, and the computed months around them are refitted.
+"""
+import json
+import os
+import uuid
+from datetime import date, time
+
+from django.db import transaction
+
+from . import hijri, hijri_tabular
+from .models import HijriMonth, HijriEvent, AstronomicalEvent
+
+# Namespace of the derived event ids
+EVENT_ID_NAMESPACE = uuid.UUID('6f1c3d52-8f0e-4a55-9a57-3b1f0c8e2d41')
+
+MONTH_FIELDS = ('name_ar', 'name_en', 'gregorian_start', 'gregorian_end', 'moon_sighting_data', 'calendar_data', 'source')
+EVENT_FIELDS = ('title_en', 'description_ar', 'description_en', 'year_of_event', 'is_holiday', 'event_type')
+ASTRONOMICAL_EVENT_FIELDS = ('title_en', 'description_ar', 'description_en')
+
+DATA_FILE_EXTENSIONS = ('.json', '.yaml', '.yml')
+
+
+def read_year_file(path):
+    """Parse a year file; raises ValueError if it cannot be read"""
+    if path.endswith('.json'):
+        parse, parse_errors = json.load, ValueError
+    else:
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError(f'PyYAML is required to read {path}')
+        parse, parse_errors = yaml.safe_load, yaml.YAMLError
+    try:
+        with open(path, encoding='utf-8') as f:
+            return parse(f)
+    except OSError as e:
+        raise ValueError(f'Could not read {path}: {e}')
+    except parse_errors as e:
+        raise ValueError(f'Could not parse {path}: {e}')
+
+
+def year_files(paths):
+    """Year files named by `paths`, expanding directories to the files they hold"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path) if name.endswith(DATA_FILE_EXTENSIONS)
+            ))
+        else:
+            files.append(path)
+    return files
+
+
+class _Validator:
+    """Collects every problem of a year file instead of stopping at the first"""
+
+    def __init__(self):
+        self.errors = []
+
+    def error(self, where, message):
+        self.errors.append(f'{where}: {message}')
+
+    def keys(self, where, value, required, optional):
+        if not isinstance(value, dict):
+            self.error(where, 'must be an object')
+            return False
+        for key in required:
+            if key not in value:
+                self.error(where, f'missing "{key}"')
+        for key in sorted(set(value) - set(required) - set(optional)):
+            self.error(where, f'unknown field "{key}"')
+        return all(key in value for key in required)
+
+    def integer(self, where, value, low, high):
+        if isinstance(value, bool) or not isinstance(value, int):
+            self.error(where, 'must be an integer')
+        elif not low <= value <= high:
+            self.error(where, f'must be between {low} and {high}')
+        return value
+
+    def text(self, where, value, max_length=None, required=True):
+        if value is None and not required:
+            return None
+        if not isinstance(value, str) or (required and not value.strip()):
+            self.error(where, 'must be a non-empty string' if required else 'must be a string')
+        elif max_length and len(value) > max_length:
+            self.error(where, f'must be at most {max_length} characters')
+        return value
+
+    def date(self, where, value):
+        try:
+            return date.fromisoformat(value)
+        except (TypeError, ValueError):
+            self.error(where, 'must be a YYYY-MM-DD date')
+            return None
+
+    def time(self, where, value):
+        try:
+            return time.fromisoformat(value)
+        except (TypeError, ValueError):
+            self.error(where, 'must be an HH:MM time')
+            return None
+
+
+def _event(check, where, raw, year, number, length):
+    if not check.keys(where, raw, ('title_ar', 'day'), EVENT_FIELDS):
+        return None
+    event = HijriEvent(
+        title_ar=check.text(f'{where}.title_ar', raw['title_ar'], 255),
+        title_en=check.text(f'{where}.title_en', raw.get('title_en'), 255, required=False),
+        description_ar=check.text(f'{where}.description_ar', raw.get('description_ar'), required=False),
+        description_en=check.text(f'{where}.description_en', raw.get('description_en'), required=False),
+        day=check.integer(f'{where}.day', raw['day'], 1, length),
+        year_of_event=raw.get('year_of_event'),
+        is_holiday=raw.get('is_holiday', False),
+        event_type=check.text(f'{where}.event_type', raw.get('event_type'), 50, required=False),
+    )
+    if event.year_of_event is not None:
+        check.integer(f'{where}.year_of_event', event.year_of_event, -1000, 10000)
+    if not isinstance(event.is_holiday, bool):
+        check.error(f'{where}.is_holiday', 'must be true or false')
+    event.id = uuid.uuid5(EVENT_ID_NAMESPACE, f'{year}/{number}/{event.day}/{event.title_ar}')
+    return event
+
+
+def _astronomical_event(check, where, raw, year, number):
+    if not check.keys(where, raw, ('title_ar', 'date', 'time'), ('title_en', 'description_ar', 'description_en')):
+        return None
+    event = AstronomicalEvent(
+        title_ar=check.text(f'{where}.title_ar', raw['title_ar'], 255),
+        title_en=check.text(f'{where}.title_en', raw.get('title_en'), 255, required=False),
+        date=check.date(f'{where}.date', raw['date']),
+        time=check.time(f'{where}.time', raw['time']),
+        description_ar=check.text(f'{where}.description_ar', raw.get('description_ar'), required=False),
+        description_en=check.text(f'{where}.description_en', raw.get('description_en'), required=False),
+    )
+    event.id = uuid.uuid5(EVENT_ID_NAMESPACE, f'{year}/{number}/astronomical/{event.date}/{event.time}/{event.title_ar}')
+    return event
+
+
+def _events(check, where, raw_events, build):
+    if not isinstance(raw_events, list):
+        check.error(where, 'must be a list')
+        return []
+    events = []
+    ids = set()
+    for index, raw in enumerate(raw_events):
+        event = build(f'{where}[{index}]', raw)
+        if event is None:
+            continue
+        if event.id in ids:
+            check.error(f'{where}[{index}]', 'duplicates an earlier event of the month')
+        ids.add(event.id)
+        events.append(event)
+    return events
+
+
+def parse_year(data):
+    """
+    Validate a year file. Returns (year, [(month, events, astronomical
+    events)]) with unsaved model instances, raising ValueError listing every
+    problem otherwise.
+    """
+    check = _Validator()
+    if not check.keys('year file', data, ('year', 'months'), ()):
+        raise ValueError('\n'.join(check.errors))
+    year = check.integer('year', data['year'], 1, 9999)
+    if not isinstance(data['months'], list) or not data['months']:
+        check.error('months', 'must be a non-empty list')
+        raise ValueError('\n'.join(check.errors))
+
+    months = []
+    numbers = set()
+    for index, raw in enumerate(data['months']):
+        where = f'months[{index}]'
+        required = ('number', 'name_ar', 'name_en', 'gregorian_start', 'gregorian_end')
+        optional = ('moon_sighting_data', 'calendar_data', 'events', 'astronomical_events')
+        if not check.keys(where, raw, required, optional):
+            continue
+        number = check.integer(f'{where}.number', raw['number'], 1, 12)
+        if number in numbers:
+            check.error(f'{where}.number', f'month {number} appears more than once')
+        numbers.add(number)
+
+        start = check.date(f'{where}.gregorian_start', raw['gregorian_start'])
+        end = check.date(f'{where}.gregorian_end', raw['gregorian_end'])
+        length = 30
+        if start and end:
+            length = (end - start).days + 1
+            if length not in (29, 30):
+                check.error(where, f'a Hijri month has 29 or 30 days, not {length}')
+        if raw.get('moon_sighting_data') is not None and not isinstance(raw['moon_sighting_data'], dict):
+            check.error(f'{where}.moon_sighting_data', 'must be an object')
+        calendar_data = raw.get('calendar_data')
+        if calendar_data is None and start and end:
+            # The usual case: one Gregorian date per day from gregorian_start
+            calendar_data = {'gregorian_dates': hijri_tabular.month_dates(start, length)}
+        elif calendar_data is not None:
+            if not isinstance(calendar_data, dict) or not isinstance(calendar_data.get('gregorian_dates'), list):
+                check.error(f'{where}.calendar_data', 'must be an object with a "gregorian_dates" list')
+
+        month = HijriMonth(
+            number=number, year=year,
+            name_ar=check.text(f'{where}.name_ar', raw['name_ar'], 50),
+            name_en=check.text(f'{where}.name_en', raw['name_en'], 50),
+            gregorian_start=start, gregorian_end=end,
+            moon_sighting_data=raw.get('moon_sighting_data'),
+            calendar_data=calendar_data,
+        )
+
+        events = _events(
+            check, f'{where}.events', raw.get('events', []),
+            lambda event_where, raw_event: _event(check, event_where, raw_event, year, number, length),
+        )
+        astronomical_events = _events(
+            check, f'{where}.astronomical_events', raw.get('astronomical_events', []),
+            lambda event_where, raw_event: _astronomical_event(check, event_where, raw_event, year, number),
+        )
+        months.append((month, events, astronomical_events))
+
+    ranges = sorted((month.gregorian_start, month.gregorian_end, month.number) for month, _, _ in months
+                    if month.gregorian_start and month.gregorian_end)
+    for (_, previous_end, previous), (start, _, number) in zip(ranges, ranges[1:]):
+        if start <= previous_end:
+            check.error('months', f'month {number} overlaps month {previous}')
+
+    if check.errors:
+        raise ValueError('\n'.join(check.errors))
+    return year, months
+
+
+def load_year(data):
+    """
+    Validate and upsert a year file in one transaction. Returns the number
+    of months, events and astronomical events loaded; raises ValueError if
+    the file is invalid.
+    """
+    year, parsed = parse_year(data)
+    with transaction.atomic():
+        HijriMonth.objects.bulk_create(
+            [month for month, _, _ in parsed],
+            update_conflicts=True, unique_fields=['number', 'year'], update_fields=MONTH_FIELDS,
+        )
+        # Months that already existed keep their id, not the one generated above
+        month_ids = dict(HijriMonth.objects.filter(
+            year=year, number__in=[month.number for month, _, _ in parsed]
+        ).values_list('number', 'id'))
+
+        events = []
+        astronomical_events = []
+        for month, month_events, month_astronomical_events in parsed:
+            for event in month_events + month_astronomical_events:
+                event.month_id = month_ids[month.number]
+            events.extend(month_events)
+            astronomical_events.extend(month_astronomical_events)
+
+        for model, rows, fields in (
+            (HijriEvent, events, EVENT_FIELDS),
+            (AstronomicalEvent, astronomical_events, ASTRONOMICAL_EVENT_FIELDS),
+        ):
+            model.objects.filter(month_id__in=month_ids.values()).exclude(pk__in=[row.pk for row in rows]).delete()
+            model.objects.bulk_create(rows, update_conflicts=True, unique_fields=['id'], update_fields=fields)
+
+        hijri_tabular.generate_months(year - 1, year + 1, only_existing=True)
+
+        # bulk_create sends no post_save signals
+        hijri.month_resolver.invalidate()
+        transaction.on_commit(hijri.month_resolver.invalidate)
+        for month_id in month_ids.values():
+            hijri.schedule_materialize(month_id)
+        hijri.invalidate_year_calendars(year)
+
+    return {'months': len(parsed), 'events': len(events), 'astronomical_events': len(astronomical_events)}
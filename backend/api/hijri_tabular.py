@@ -0,0 +1,183 @@
+"""
+Tabular Hijri calendar.
+
+The arithmetical Islamic calendar: odd months have 30 days, even months
+29, and Dhul-Hijjah gets a 30th day in 11 leap years of every 30-year
+cycle (2, 5, 7, 10, 13, 16, 18, 21, 24, 26, 29), counted from the civil
+epoch of 1 Muharram 1H = 16 July 622 (Julian). Its months start within a
+day or two of the sighted ones, so it fills in the years and months that
+have no year file.
+
+generate_months() stores it as computed HijriMonth rows for a range of
+years, so the month resolver and the calendar endpoints work for any date
+without data entry. Sighted months always win: they are never
+overwritten, and the computed months next to one are stretched or
+shortened to end the day before it starts and start the day after it
+ends. Loading a year file refits the computed months around it.
+"""
+import functools
+from datetime import date, timedelta
+
+from django.db import transaction
+
+from . import hijri
+from .models import HijriMonth
+
+# date.toordinal() of 1 Muharram 1H (Julian day number 1948440)
+EPOCH = 227015
+
+MONTH_NAMES = {
+    1: ('محرم الحرام', 'Muharram'),
+    2: ('صفر', 'Safar'),
+    3: ('ربيع الأول', 'Rabi al-Awwal'),
+    4: ('ربيع الآخر', 'Rabi al-Thani'),
+    5: ('جمادى الأولى', 'Jumada al-Ula'),
+    6: ('جمادى الآخرة', 'Jumada al-Thani'),
+    7: ('رجب', 'Rajab'),
+    8: ('شعبان', "Sha'ban"),
+    9: ('رمضان', 'Ramadan'),
+    10: ('شوال', 'Shawwal'),
+    11: ('ذي القعدة', "Dhul-Qa'dah"),
+    12: ('ذي الحجة', 'Dhul-Hijjah'),
+}
+
+COMPUTED_FIELDS = ('name_ar', 'name_en', 'gregorian_start', 'gregorian_end', 'moon_sighting_data', 'calendar_data', 'source')
+
+
+def is_leap(year):
+    return (14 + 11 * year) % 30 < 11
+
+
+def _year_start(year):
+    return EPOCH + (year - 1) * 354 + (3 + 11 * year) // 30
+
+
+def _month_offset(month):
+    # Days before `month` in its year: ceil(29.5 * (month - 1))
+    return (59 * (month - 1) + 1) // 2
+
+
+def month_length(year, month):
+    return 30 if month % 2 or (month == 12 and is_leap(year)) else 29
+
+
+def month_start(year, month):
+    """Gregorian date of the first day of a tabular month"""
+    return date.fromordinal(_year_start(year) + _month_offset(month))
+
+
+def to_gregorian(year, month, day):
+    """Gregorian date of a tabular Hijri date; raises ValueError if it does not exist"""
+    if year < 1 or not 1 <= month <= 12:
+        raise ValueError(f'Invalid Hijri month {year}-{month}')
+    if not 1 <= day <= month_length(year, month):
+        raise ValueError(f'Day must be between 1 and {month_length(year, month)}')
+    return month_start(year, month) + timedelta(days=day - 1)
+
+
+def to_hijri(day):
+    """Tabular (year, month, day) of a Gregorian date from 1 Muharram 1H on"""
+    ordinal = day.toordinal()
+    if ordinal < EPOCH:
+        raise ValueError('Dates before 1 Muharram 1H (622-07-19) have no Hijri date')
+    year = (30 * (ordinal - EPOCH) + 10646) // 10631
+    while _year_start(year + 1) <= ordinal:
+        year += 1
+    while _year_start(year) > ordinal:
+        year -= 1
+    offset = ordinal - _year_start(year)
+    month = min(12, 2 * offset // 59 + 1)
+    while _month_offset(month) > offset:
+        month -= 1
+    return year, month, offset - _month_offset(month) + 1
+
+
+def month_dates(start, length):
+    """calendar_data['gregorian_dates'] of a month of `length` days from `start`"""
+    return [{'hijri': day, 'gregorian': (start + timedelta(days=day - 1)).isoformat()} for day in range(1, length + 1)]
+
+
+def _previous(year, number):
+    return (year, number - 1) if number > 1 else (year - 1, 12)
+
+
+def _next(year, number):
+    return (year, number + 1) if number < 12 else (year + 1, 1)
+
+
+def fitted_range(year, number, sighted):
+    """
+    (start, end) of a tabular month, fitted between its neighbours in
+    `sighted` ({(year, number): (start, end, ...)}), or None if they leave
+    it no days.
+    """
+    start = month_start(year, number)
+    end = month_start(*_next(year, number)) - timedelta(days=1)
+    if _previous(year, number) in sighted:
+        start = sighted[_previous(year, number)][1] + timedelta(days=1)
+    if _next(year, number) in sighted:
+        end = sighted[_next(year, number)][0] - timedelta(days=1)
+    return (start, end) if start <= end else None
+
+
+def computed_month(year, number, sighted):
+    """Unsaved computed HijriMonth for a month, fitted like fitted_range()"""
+    fitted = fitted_range(year, number, sighted)
+    if fitted is None:
+        return None
+
+    start, end = fitted
+    name_ar, name_en = MONTH_NAMES[number]
+    return HijriMonth(
+        name_ar=name_ar, name_en=name_en, number=number, year=year,
+        gregorian_start=start, gregorian_end=end,
+        calendar_data={'gregorian_dates': month_dates(start, (end - start).days + 1)},
+        source=HijriMonth.COMPUTED,
+    )
+
+
+def _drop_calendars(month_ids):
+    for month_id in month_ids:
+        hijri.delete_month_calendar(month_id)
+
+
+def generate_months(first_year, last_year, only_existing=False):
+    """
+    Upsert computed months for every month of first_year..last_year that
+    has no sighted row, in one transaction. With `only_existing`, only
+    refit the computed months already stored. Returns how many were stored.
+    """
+    with transaction.atomic():
+        sighted = {}
+        computed = set()
+        for year, number, source, start, end in HijriMonth.objects.filter(
+            year__range=(first_year - 1, last_year + 1)
+        ).order_by().values_list('year', 'number', 'source', 'gregorian_start', 'gregorian_end'):
+            if source == HijriMonth.SIGHTED:
+                sighted[year, number] = (start, end)
+            else:
+                computed.add((year, number))
+
+        months = []
+        for year in range(first_year, last_year + 1):
+            for number in range(1, 13):
+                if (year, number) in sighted or (only_existing and (year, number) not in computed):
+                    continue
+                month = computed_month(year, number, sighted)
+                if month is not None:
+                    months.append(month)
+        if not months:
+            return 0
+
+        HijriMonth.objects.bulk_create(
+            months, update_conflicts=True, unique_fields=['number', 'year'], update_fields=COMPUTED_FIELDS,
+        )
+        # bulk_create sends no post_save signals
+        month_ids = list(HijriMonth.objects.filter(
+            source=HijriMonth.COMPUTED, year__range=(first_year, last_year)
+        ).values_list('id', flat=True))
+        hijri.month_resolver.invalidate()
+        transaction.on_commit(hijri.month_resolver.invalidate)
+        transaction.on_commit(functools.partial(_drop_calendars, month_ids))
+        hijri.invalidate_year_calendars(*{month.year for month in months})
+    return len(months)
@@ -0,0 +1,148 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count
+from api.models import Khatmah, Participant, JuzAssignment, SurahAssignment, HijriMonth, HijriEvent, AstronomicalEvent
+from datetime import date, time, timedelta
+import time as timer
+import uuid
+
+# Indexes added in 0008_hot_query_indexes, dropped for the "before" run
+BENCHMARKED_MODELS = [HijriMonth, HijriEvent, AstronomicalEvent, JuzAssignment, SurahAssignment]
+
+
+class RollbackBenchmark(Exception):
+    """Raised to undo the seeded rows and index changes"""
+
+
+class Command(BaseCommand):
+    help = ('Seeds synthetic khatmahs and Hijri months inside a transaction, then prints EXPLAIN plans '
+            'and timings of the hot queries with and without the indexes from 0008_hot_query_indexes. '
+            'Everything is rolled back at the end.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--khatmahs', type=int, default=100000, help='Number of khatmahs to seed')
+        parser.add_argument('--months', type=int, default=12000, help='Number of Hijri months to seed')
+        parser.add_argument('--repeat', type=int, default=200, help='Executions per query')
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        self.options = options
+        try:
+            with transaction.atomic():
+                self.seed()
+                queries = self.hot_queries()
+
+                self.stdout.write(self.style.MIGRATE_HEADING('\n=== Without indexes ==='))
+                self.set_indexes(enabled=False)
+                before = self.run_queries(queries)
+
+                self.stdout.write(self.style.MIGRATE_HEADING('\n=== With indexes ==='))
+                self.set_indexes(enabled=True)
+                after = self.run_queries(queries)
+
+                self.stdout.write(self.style.MIGRATE_HEADING('\n=== Summary (ms per query) ==='))
+                for label in queries:
+                    speedup = before[label] / after[label] if after[label] else float('inf')
+                    self.stdout.write(f'{label:<40} {before[label]:>10.3f} {after[label]:>10.3f}  x{speedup:.1f}')
+                raise RollbackBenchmark()
+        except RollbackBenchmark:
+            self.stdout.write(self.style.SUCCESS('\nBenchmark data rolled back'))
+
+    def seed(self):
+        batch_size = self.options['batch_size']
+        khatmah_count = self.options['khatmahs']
+        started = timer.perf_counter()
+
+        # Each khatmah gets two readers holding two juz and two surahs, half of them completed
+        for offset in range(0, khatmah_count, batch_size):
+            khatmahs = [Khatmah(name=f'Benchmark {i}') for i in range(offset, min(offset + batch_size, khatmah_count))]
+            Khatmah.objects.bulk_create(khatmahs)
+            participants = [
+                Participant(id=uuid.uuid4(), name=f'Reader {n}', khatmah=k) for k in khatmahs for n in range(2)
+            ]
+            Participant.objects.bulk_create(participants)
+            # Reader r of a khatmah holds juz/surah 2r+1 and 2r+2; the first of each pair is completed
+            slots = [(p, index % 2 * 2 + n) for index, p in enumerate(participants) for n in range(2)]
+            JuzAssignment.objects.bulk_create([
+                JuzAssignment(juz_number=slot + 1, participant=p, khatmah=p.khatmah, completed=slot % 2 == 0)
+                for p, slot in slots
+            ])
+            SurahAssignment.objects.bulk_create([
+                SurahAssignment(surah_number=slot + 1, participant=p, khatmah=p.khatmah, completed=slot % 2 == 0)
+                for p, slot in slots
+            ])
+
+        # Consecutive 29/30 day months going back from 2024, each with a few events
+        names = ['Muharram', 'Safar', "Rabi' al-Awwal", "Rabi' al-Thani", 'Jumada al-Ula', 'Jumada al-Thani',
+                 'Rajab', "Sha'ban", 'Ramadan', 'Shawwal', "Dhu al-Qi'dah", 'Dhu al-Hijjah']
+        months = []
+        start = date(2024, 7, 7) - timedelta(days=30 * self.options['months'])
+        for index in range(self.options['months']):
+            length = 30 if index % 2 == 0 else 29
+            months.append(HijriMonth(
+                name_ar=names[index % 12], name_en=names[index % 12], number=index % 12 + 1,
+                year=1446 - self.options['months'] // 12 + index // 12,
+                gregorian_start=start, gregorian_end=start + timedelta(days=length - 1),
+            ))
+            start += timedelta(days=length)
+        for offset in range(0, len(months), batch_size):
+            batch = months[offset:offset + batch_size]
+            HijriMonth.objects.bulk_create(batch)
+            HijriEvent.objects.bulk_create([
+                HijriEvent(title_ar='حدث', day=day, month=month) for month in batch for day in (1, 10, 15, 27)
+            ])
+            AstronomicalEvent.objects.bulk_create([
+                AstronomicalEvent(title_ar='محاق', date=month.gregorian_start, time=time(20, 0), month=month)
+                for month in batch
+            ])
+
+        self.stdout.write(f'Seeded {khatmah_count} khatmahs and {len(months)} months '
+                          f'in {timer.perf_counter() - started:.1f}s')
+        self.analyze()
+
+    def hot_queries(self):
+        khatmah_id = Khatmah.objects.order_by('created_at').values_list('id', flat=True)[
+            self.options['khatmahs'] // 2
+        ]
+        month = HijriMonth.objects.order_by('gregorian_start')[self.options['months'] // 2]
+        day = month.gregorian_start + timedelta(days=10)
+        return {
+            'month containing date': HijriMonth.objects.filter(gregorian_start__lte=day, gregorian_end__gte=day),
+            'month by name__iexact and year': HijriMonth.objects.filter(name_en__iexact='ramadan', year=month.year),
+            'completed juz of khatmah': JuzAssignment.objects.filter(khatmah_id=khatmah_id, completed=True)
+                .values('khatmah').annotate(total=Count('pk')),
+            'completed surahs of khatmah': SurahAssignment.objects.filter(khatmah_id=khatmah_id, completed=True)
+                .values('khatmah').annotate(total=Count('pk')),
+            'events of month day': HijriEvent.objects.filter(month=month, day=10),
+            'astronomical events of month date': AstronomicalEvent.objects.filter(month=month, date=month.gregorian_start),
+        }
+
+    def run_queries(self, queries):
+        timings = {}
+        for label, queryset in queries.items():
+            self.stdout.write(self.style.HTTP_INFO(f'\n-- {label}'))
+            self.stdout.write(queryset.explain())
+
+            started = timer.perf_counter()
+            for _ in range(self.options['repeat']):
+                list(queryset.all())
+            timings[label] = (timer.perf_counter() - started) * 1000 / self.options['repeat']
+            self.stdout.write(f'{timings[label]:.3f} ms per query')
+        return timings
+
+    def set_indexes(self, enabled):
+        # Only the editor's SQL generation is used: entering it as a context
+        # manager is not allowed inside a transaction on SQLite
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model in BENCHMARKED_MODELS:
+                for index in model._meta.indexes:
+                    if enabled:
+                        cursor.execute(str(index.create_sql(model, editor)))
+                    else:
+                        cursor.execute(str(index.remove_sql(model, editor)))
+        self.analyze()
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
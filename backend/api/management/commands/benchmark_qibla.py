@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from api.views import get_qibla_direction, get_qibla_directions_batch
+from unittest import mock
+import json
+import random
+import time
+
+
+class Command(BaseCommand):
+    help = 'Compares POST /api/qibla/batch/ against looping over the single-location Qibla view'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--points', type=int, default=10000, help='Number of random locations')
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        points = [(round(rng.uniform(-60, 70), 6), round(rng.uniform(-180, 180), 6)) for _ in range(options['points'])]
+        factory = RequestFactory()
+
+        # Throttling would reject most of the scalar requests; it is not what is being measured
+        with mock.patch.object(get_qibla_direction.cls, 'throttle_classes', []), \
+                mock.patch.object(get_qibla_directions_batch.cls, 'throttle_classes', []):
+            started = time.perf_counter()
+            scalar = []
+            for lat, lng in points:
+                response = get_qibla_direction(factory.get(f'/api/qibla/{lat}/{lng}/'), str(lat), str(lng))
+                scalar.append(json.loads(response.content)['direction'])
+            scalar_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            request = factory.post('/api/qibla/batch/', {'coordinates': points}, content_type='application/json')
+            response = get_qibla_directions_batch(request)
+            batch = [result['direction'] for result in response.data['results']]
+            batch_seconds = time.perf_counter() - started
+
+        mismatches = sum(1 for a, b in zip(scalar, batch) if abs(a - b) > 0.011)
+        self.stdout.write(f'{len(points)} locations')
+        self.stdout.write(f'scalar view loop: {scalar_seconds * 1000:10.1f} ms ({len(points) / scalar_seconds:,.0f} points/s)')
+        self.stdout.write(f'batch endpoint:   {batch_seconds * 1000:10.1f} ms ({len(points) / batch_seconds:,.0f} points/s)')
+        self.stdout.write(f'speedup: x{scalar_seconds / batch_seconds:.1f}, mismatched bearings: {mismatches}')
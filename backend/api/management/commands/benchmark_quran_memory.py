@@ -0,0 +1,103 @@
+from django.core.management.base import BaseCommand, CommandError
+from api import quran
+from api.quran_pack import PackedText
+import json
+import multiprocessing
+import os
+import zlib
+
+
+def _memory():
+    """(Rss, Pss) of this process in KiB; Pss splits shared pages between the processes mapping them"""
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            key, _, rest = line.partition(':')
+            if key in ('Rss', 'Pss'):
+                values[key] = int(rest.split()[0])
+    return values['Rss'], values['Pss']
+
+
+def _worker(mode, paths, start, done, results):
+    before = _memory()
+    if mode == 'dict':
+        # Every edition as a dict of per-ayah strings
+        editions = []
+        for path in paths:
+            packed = PackedText(path)
+            editions.append({number: packed[number - 1] for number in range(1, len(packed) + 1)})
+            packed.close()
+        checksum = sum(zlib.crc32(text.encode('utf-8')) for edition in editions for text in edition.values())
+    else:
+        # Every edition mapped; reading every ayah (without copying) makes the whole text resident
+        editions = [PackedText(path) for path in paths]
+        checksum = sum(
+            zlib.crc32(edition.view(index, index + 1)) for edition in editions for index in range(len(edition))
+        )
+    start.wait()
+    after = _memory()
+    results.put((after[0] - before[0], after[1] - before[1], checksum))
+    # Stay alive until every worker has measured, so shared pages are shared
+    done.wait()
+
+
+class Command(BaseCommand):
+    help = ('Compares the memory each worker process uses to hold imported Quran editions as dicts of '
+            'per-ayah strings against sharing their memory-mapped packed text (Linux only)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('editions', nargs='*', help='Editions to load (defaults to every imported edition)')
+        parser.add_argument('--workers', type=int, default=4, help='Worker processes loading the editions at once')
+
+    def handle(self, *args, **options):
+        if not os.path.exists('/proc/self/smaps_rollup'):
+            raise CommandError('Reading process memory needs /proc/self/smaps_rollup (Linux)')
+
+        directory = os.path.dirname(quran.edition_path(quran.DEFAULT_EDITION))
+        editions = options['editions']
+        if not editions and os.path.isdir(directory):
+            editions = sorted(
+                name[:-len('.json')] for name in os.listdir(directory)
+                if name.endswith('.json') and not name.endswith('.search.json')
+            )
+        paths = []
+        for edition in editions:
+            try:
+                with open(quran.edition_path(edition), encoding='utf-8') as f:
+                    text_file = json.load(f).get('text_file')
+            except OSError:
+                raise CommandError(f'Edition {edition} has not been imported')
+            if not text_file:
+                raise CommandError(f'Edition {edition} was imported before packed text; import it again')
+            paths.append(os.path.join(directory, text_file))
+        if not paths:
+            raise CommandError('No imported editions; run import_quran first')
+
+        size = sum(os.path.getsize(path) for path in paths)
+        self.stdout.write(
+            f'{len(paths)} editions ({", ".join(editions)}), {size / 1024:,.0f} KiB packed, '
+            f'{options["workers"]} workers'
+        )
+        # Fresh interpreters, so no worker starts with the parent's memory
+        context = multiprocessing.get_context('spawn')
+        for mode, label in (('dict', 'dict of strings'), ('mmap', 'mmap packed')):
+            start = context.Barrier(options['workers'])
+            done = context.Barrier(options['workers'] + 1)
+            results = context.Queue()
+            workers = [
+                context.Process(target=_worker, args=(mode, paths, start, done, results))
+                for _ in range(options['workers'])
+            ]
+            for worker in workers:
+                worker.start()
+            measured = [results.get() for _ in workers]
+            done.wait()
+            for worker in workers:
+                worker.join()
+
+            rss = sum(m[0] for m in measured) / len(measured)
+            pss = sum(m[1] for m in measured) / len(measured)
+            self.stdout.write(
+                f'{label + ":":17} {rss / 1024:8.1f} MiB RSS, {pss / 1024:8.1f} MiB PSS per worker, '
+                f'{pss * len(measured) / 1024:8.1f} MiB PSS in total'
+            )
@@ -0,0 +1,71 @@
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from api import upstream
+from api.upstream_stub import StubQuranUpstream
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import requests
+import time
+
+
+class Command(BaseCommand):
+    help = ('Compares a fresh connection per Quran API fetch (the former requests.get path) against the '
+            'pooled async client, both against a local stub upstream with a fixed latency and connection setup delay')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Number of upstream fetches')
+        parser.add_argument('--concurrency', type=int, default=20, help='Concurrent fetches (threads, or pool size)')
+        parser.add_argument('--latency', type=float, default=0.05, help='Seconds the stub waits before every response')
+        parser.add_argument('--handshake', type=float, default=0.1,
+                            help='Seconds the stub waits on every new connection (TCP and TLS round trips)')
+
+    def handle(self, *args, **options):
+        count = options['requests']
+        concurrency = options['concurrency']
+        paths = [f'surah/{n % 114 + 1}/quran-uthmani' for n in range(count)]
+
+        stub = StubQuranUpstream(latency=options['latency'], handshake=options['handshake'])
+        with stub, \
+                override_settings(QURAN_API_BASE_URL=stub.base_url, UPSTREAM_MAX_CONNECTIONS=concurrency):
+            def fetch(path):
+                return requests.get(upstream.quran_api_url(path), headers=upstream.QURAN_API_HEADERS, timeout=10).status_code
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(concurrency) as executor:
+                threaded = list(executor.map(fetch, paths))
+            threaded_seconds = time.perf_counter() - started
+            threaded_connections = stub.connection_count
+
+            async def fetch_all():
+                # As many fetches in flight as there are threads above, like
+                # `concurrency` simultaneous requests to the text views
+                slots = asyncio.Semaphore(concurrency)
+
+                async def fetch_async(path):
+                    async with slots:
+                        return (await upstream.get(path)).status_code
+
+                try:
+                    return await asyncio.gather(*map(fetch_async, paths))
+                finally:
+                    await upstream.close_client()
+
+            started = time.perf_counter()
+            pooled = asyncio.run(fetch_all())
+            pooled_seconds = time.perf_counter() - started
+            pooled_connections = stub.connection_count - threaded_connections
+
+        failures = sum(1 for status in threaded + pooled if status != 200)
+        self.stdout.write(
+            f'{count} fetches, concurrency {concurrency}, {options["latency"] * 1000:.0f} ms latency, '
+            f'{options["handshake"] * 1000:.0f} ms connection setup'
+        )
+        self.stdout.write(
+            f'connection per fetch: {threaded_seconds * 1000:10.1f} ms ({count / threaded_seconds:,.0f} req/s, '
+            f'{threaded_connections} connections)'
+        )
+        self.stdout.write(
+            f'pooled async client:  {pooled_seconds * 1000:10.1f} ms ({count / pooled_seconds:,.0f} req/s, '
+            f'{pooled_connections} connections)'
+        )
+        self.stdout.write(f'speedup: x{threaded_seconds / pooled_seconds:.1f}, failed fetches: {failures}')
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+from api import hijri_tabular
+
+
+class Command(BaseCommand):
+    help = 'Fills the Hijri months without a year file with the tabular calendar, fitted around the sighted months'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from-year', type=int, default=1400, help='First Hijri year (default 1400H, 1979)')
+        parser.add_argument('--to-year', type=int, default=1500, help='Last Hijri year (default 1500H, 2077)')
+
+    def handle(self, *args, **options):
+        first_year, last_year = options['from_year'], options['to_year']
+        if first_year < 1 or last_year < first_year:
+            raise CommandError('--from-year must be at least 1 and not after --to-year')
+
+        count = hijri_tabular.generate_months(first_year, last_year)
+        self.stdout.write(self.style.SUCCESS(f'Stored {count} computed months for {first_year}H-{last_year}H'))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from api import quran, quran_search
+import json
+
+class Command(BaseCommand):
+    help = 'Imports a full Quran edition (alquran.cloud JSON format) into the local Quran text store'
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='Path to a JSON dump of https://api.alquran.cloud/v1/quran/<edition>')
+        parser.add_argument('--edition', help='Edition identifier to store it under (defaults to the one in the dump)')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['source'], encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Could not read {options["source"]}: {e}')
+
+        # Accept both the raw API response and its `data` object
+        data = payload.get('data', payload)
+
+        try:
+            packed = quran.pack_edition(data)
+        except (KeyError, TypeError, ValueError) as e:
+            raise CommandError(f'Invalid Quran dump: {e}')
+
+        edition = options['edition'] or packed['edition'] or quran.DEFAULT_EDITION
+        packed['edition'] = edition
+
+        # The search index goes first: a worker reloading the new text reads the new index
+        quran_search.write_index(packed, quran_search.index_path(edition))
+        path = quran.store_edition(packed)
+        quran.reset_editions()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {len(packed["ayahs"])} ayahs of {edition} into {path}'
+        ))
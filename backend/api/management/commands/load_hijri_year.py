@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from api import hijri_data
+
+
+class Command(BaseCommand):
+    help = 'Validates Hijri year files (JSON or YAML) and upserts their months and events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*',
+                            help='Year files or directories of them (defaults to settings.HIJRI_DATA_DIR)')
+        parser.add_argument('--dry-run', action='store_true', help='Only validate the files')
+
+    def handle(self, *args, **options):
+        files = hijri_data.year_files(options['paths'] or [settings.HIJRI_DATA_DIR])
+        if not files:
+            raise CommandError('No Hijri year files found')
+
+        # Validate everything first so a bad file does not leave the others half loaded
+        years = []
+        for path in files:
+            try:
+                data = hijri_data.read_year_file(path)
+                hijri_data.parse_year(data)
+            except ValueError as e:
+                raise CommandError(f'Invalid Hijri year file {path}:\n{e}')
+            years.append((path, data))
+
+        for path, data in years:
+            if options['dry_run']:
+                self.stdout.write(f'{path} is valid')
+                continue
+            counts = hijri_data.load_year(data)
+            self.stdout.write(self.style.SUCCESS(
+                f'Loaded {counts["months"]} months, {counts["events"]} events and '
+                f'{counts["astronomical_events"]} astronomical events of {data["year"]}H from {path}'
+            ))
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:38
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_khatmah_image'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='astronomicalevent',
+            index=models.Index(fields=['month', 'date'], name='astroevent_month_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hijrievent',
+            index=models.Index(fields=['month', 'day'], name='hijrievent_month_day_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hijrimonth',
+            index=models.Index(fields=['gregorian_start', 'gregorian_end'], name='hijrimonth_greg_range_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hijrimonth',
+            index=models.Index(django.db.models.functions.text.Upper('name_en'), models.F('year'), name='hijrimonth_upper_name_en_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hijrimonth',
+            index=models.Index(django.db.models.functions.text.Upper('name_ar'), models.F('year'), name='hijrimonth_upper_name_ar_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='juzassignment',
+            index=models.Index(condition=models.Q(('completed', True)), fields=['khatmah'], name='juzassign_completed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='surahassignment',
+            index=models.Index(condition=models.Q(('completed', True)), fields=['khatmah'], name='surahassign_completed_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='khatmah',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='khatmah',
+            name='version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='khatmah',
+            index=models.Index(fields=['updated_at'], name='khatmah_updated_at_idx'),
+        ),
+    ]
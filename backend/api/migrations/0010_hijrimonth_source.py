@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 16:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_khatmah_version_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hijrimonth',
+            name='source',
+            field=models.CharField(choices=[('sighted', 'Sighted'), ('computed', 'Computed')], default='sighted', max_length=10),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Upper
 import uuid
 from django.core.validators import FileExtensionValidator
 
@@ -28,6 +30,16 @@ class Khatmah(models.Model):
     khatmah_type = models.CharField(max_length=10, choices=KHATMAH_TYPES, default=JUZ_TYPE)
     creator = models.ForeignKey('Participant', on_delete=models.SET_NULL, null=True, blank=True, related_name='created_khatmahs')
     creator_token = models.UUIDField(default=uuid.uuid4, editable=False, null=True, blank=True)
+    # Bumped together whenever the khatmah, its participants or its
+    # assignments change (see api/progress.py); they back the ETags
+    version = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            # MAX(updated_at) of the list ETag (KhatmahViewSet.list_validators)
+            models.Index(fields=['updated_at'], name='khatmah_updated_at_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -51,6 +63,10 @@ class JuzAssignment(models.Model):
     
     class Meta:
         unique_together = ('juz_number', 'khatmah')
+        indexes = [
+            # Completed-juz counts per khatmah only ever look at completed rows
+            models.Index(fields=['khatmah'], condition=Q(completed=True), name='juzassign_completed_idx'),
+        ]
     
     def __str__(self):
         return f"Juz {self.juz_number} assigned to {self.participant.name} in {self.khatmah.name}"
@@ -65,12 +81,22 @@ class SurahAssignment(models.Model):
     
     class Meta:
         unique_together = ('surah_number', 'khatmah')
+        indexes = [
+            models.Index(fields=['khatmah'], condition=Q(completed=True), name='surahassign_completed_idx'),
+        ]
     
     def __str__(self):
         return f"Surah {self.surah_number} assigned to {self.participant.name} in {self.khatmah.name}"
 
 # Hijri Calendar Models
 class HijriMonth(models.Model):
+    SIGHTED = 'sighted'
+    COMPUTED = 'computed'
+    SOURCES = [
+        (SIGHTED, 'Sighted'),
+        (COMPUTED, 'Computed'),
+    ]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name_ar = models.CharField(max_length=50)  # Arabic name
     name_en = models.CharField(max_length=50)  # English name
@@ -80,10 +106,18 @@ class HijriMonth(models.Model):
     gregorian_end = models.DateField()  # Gregorian date when this Hijri month ends
     moon_sighting_data = models.JSONField(null=True, blank=True)  # Data about moon sighting
     calendar_data = models.JSONField(null=True, blank=True)  # Calendar mapping between Hijri and Gregorian
+    # Sighted months come from the year files; computed ones from the tabular calendar (api/hijri_tabular.py)
+    source = models.CharField(max_length=10, choices=SOURCES, default=SIGHTED)
     
     class Meta:
         unique_together = ('number', 'year')
         ordering = ['year', 'number']
+        indexes = [
+            models.Index(fields=['gregorian_start', 'gregorian_end'], name='hijrimonth_greg_range_idx'),
+            # Match the UPPER() comparison Django emits for name__iexact lookups
+            models.Index(Upper('name_en'), 'year', name='hijrimonth_upper_name_en_idx'),
+            models.Index(Upper('name_ar'), 'year', name='hijrimonth_upper_name_ar_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name_ar} ({self.name_en}) - {self.year}H"
@@ -102,6 +136,9 @@ class HijriEvent(models.Model):
     
     class Meta:
         ordering = ['month__number', 'day']
+        indexes = [
+            models.Index(fields=['month', 'day'], name='hijrievent_month_day_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title_ar} - {self.day} {self.month.name_ar}"
@@ -116,5 +153,10 @@ class AstronomicalEvent(models.Model):
     description_ar = models.TextField(null=True, blank=True)  # Arabic description
     description_en = models.TextField(null=True, blank=True)  # English description
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['month', 'date'], name='astroevent_month_date_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.title_ar} - {self.date}"
@@ -0,0 +1,95 @@
+"""
+Compact khatmah progress.
+
+The progress grid of a khatmah (which juz or surahs are assigned, which are
+completed) is served as two bitmaps instead of the full KhatmahSerializer
+payload. Bit n - 1 stands for juz/surah n and each bitmap is sent as a hex
+string, since 114 bits do not fit a JavaScript number.
+
+bump_version() increments Khatmah.version and refreshes updated_at on every
+change to a khatmah's participants or assignments (from the signal
+receivers, and from the claim path whose bulk inserts send no signals). It
+also drops the cached progress payload, so a cached payload is always the
+one for the current version. The same pair backs the khatmah ETags. Saving
+the khatmah itself (which may change its type) drops the payload too.
+"""
+import functools
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import assignments, cache
+from .models import Khatmah
+
+
+def encode_bitmap(numbers):
+    """Hex string with bit n - 1 set for every n in `numbers`"""
+    mask = 0
+    for number in numbers:
+        mask |= 1 << (number - 1)
+    return format(mask, 'x')
+
+
+def decode_bitmap(bitmap):
+    """Sorted numbers whose bits are set in a hex bitmap"""
+    mask = int(bitmap, 16)
+    return [index + 1 for index in range(mask.bit_length()) if mask >> index & 1]
+
+
+def build_progress(khatmah_id):
+    """
+    The progress payload of a khatmah, or None if it does not exist. Costs
+    the khatmah's type/version lookup and one values_list query.
+    """
+    row = Khatmah.objects.filter(pk=khatmah_id).values_list('khatmah_type', 'version').first()
+    if row is None:
+        return None
+    kind, version = row
+
+    model, field, total = assignments.CLAIM_KINDS[kind]
+    assigned = []
+    completed = []
+    for number, is_completed in model.objects.filter(khatmah_id=khatmah_id).values_list(field, 'completed'):
+        assigned.append(number)
+        if is_completed:
+            completed.append(number)
+
+    return {
+        'id': str(khatmah_id),
+        'type': kind,
+        'version': version,
+        'total': total,
+        'assigned_count': len(assigned),
+        'completed_count': len(completed),
+        'assigned': encode_bitmap(assigned),
+        'completed': encode_bitmap(completed),
+    }
+
+
+def get_progress(khatmah_id):
+    """Cached progress payload; raises Khatmah.DoesNotExist for an unknown khatmah"""
+    payload = cache.get('khatmah-progress', str(khatmah_id))
+    if payload is None:
+        payload = build_progress(khatmah_id)
+        if payload is None:
+            raise Khatmah.DoesNotExist(f'No khatmah with id {khatmah_id}')
+        cache.set('khatmah-progress', str(khatmah_id), payload)
+    return payload
+
+
+def invalidate_progress(khatmah_id):
+    cache.delete('khatmah-progress', str(khatmah_id))
+
+
+def drop_progress(khatmah_id):
+    """Drop the cached progress payload now and again once committed"""
+    invalidate_progress(khatmah_id)
+    # Dropped again in case a reader cached the old rows in between
+    transaction.on_commit(functools.partial(invalidate_progress, khatmah_id))
+
+
+def bump_version(khatmah_id):
+    """Record a change to the khatmah's participants or assignments"""
+    Khatmah.objects.filter(pk=khatmah_id).update(version=F('version') + 1, updated_at=timezone.now())
+    drop_progress(khatmah_id)
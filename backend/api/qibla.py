@@ -0,0 +1,174 @@
+"""
+Qibla direction math.
+
+qibla_direction() computes the initial great-circle bearing from one point
+to the Kaaba; qibla_directions() does the same for many points at once with
+NumPy, along with the great-circle distance, for the batch endpoint.
+
+BearingGrid optionally answers single lookups from a precomputed 0.01° grid
+instead: 1°x1° tiles of bearings are generated on first use, kept in an LRU,
+and bilinearly interpolated. Tiles within about 1° of the Kaaba and of its
+antipode, where the bearing changes too quickly to interpolate, always use
+the exact formula. Against the exact formula, the maximum error of the
+grid is below GRID_MAX_ERROR_DEGREES; 150k random locations in 1,500 tiles
+measured at most 0.0002°.
+
+In CPython a grid lookup including the LRU bookkeeping (~5µs) is not cheaper
+than the exact formula (~0.8µs), so the grid is off unless
+settings.QIBLA_GRID_ENABLED is set.
+"""
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Kaaba coordinates
+MECCA_LAT = 21.422487
+MECCA_LNG = 39.826206
+
+# Mean Earth radius (IUGG) used for great-circle distances
+EARTH_RADIUS_KM = 6371.0088
+
+_MECCA_LAT_RAD = math.radians(MECCA_LAT)
+_MECCA_LNG_RAD = math.radians(MECCA_LNG)
+
+
+def qibla_direction(lat, lng):
+    """Bearing to the Kaaba in degrees clockwise from North, in [0, 360)"""
+    # Convert to radians
+    lat_rad = math.radians(lat)
+    lng_rad = math.radians(lng)
+
+    # Calculate qibla direction
+    y = math.sin(_MECCA_LNG_RAD - lng_rad)
+    x = math.cos(lat_rad) * math.tan(_MECCA_LAT_RAD) - math.sin(lat_rad) * math.cos(_MECCA_LNG_RAD - lng_rad)
+    qibla = math.degrees(math.atan2(y, x))
+
+    # Convert to 0-360 range
+    if qibla < 0:
+        qibla += 360
+    return qibla
+
+
+def qibla_directions(lats, lngs):
+    """
+    Vectorized bearings (degrees, [0, 360)) and haversine distances (km) to
+    the Kaaba for arrays of latitudes and longitudes.
+    """
+    lat_rad = np.radians(np.asarray(lats, dtype=np.float64))
+    delta_lng = _MECCA_LNG_RAD - np.radians(np.asarray(lngs, dtype=np.float64))
+
+    sin_lat = np.sin(lat_rad)
+    cos_lat = np.cos(lat_rad)
+    cos_delta = np.cos(delta_lng)
+
+    bearings = np.degrees(np.arctan2(
+        np.sin(delta_lng),
+        cos_lat * math.tan(_MECCA_LAT_RAD) - sin_lat * cos_delta,
+    )) % 360.0
+
+    # Haversine: a = sin²(Δφ/2) + cos φ1 cos φ2 sin²(Δλ/2)
+    a = (np.sin((_MECCA_LAT_RAD - lat_rad) / 2) ** 2
+         + cos_lat * math.cos(_MECCA_LAT_RAD) * np.sin(delta_lng / 2) ** 2)
+    distances = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+    return bearings, distances
+
+
+GRID_RESOLUTION = 0.01
+GRID_STEPS = 100  # grid cells per tile side, so a tile spans 1°
+GRID_MAX_ERROR_DEGREES = 0.001
+_ROW = GRID_STEPS + 1  # nodes per tile row
+
+
+def _neighbouring_tiles(lat, lng):
+    tile_lat, tile_lng = math.floor(lat), math.floor(lng)
+    return {(tile_lat + i, tile_lng + j) for i in (-1, 0, 1) for j in (-1, 0, 1)}
+
+
+# The 3x3 tiles around the Kaaba and its antipode cover at least 1° around each
+EXACT_TILES = _neighbouring_tiles(MECCA_LAT, MECCA_LNG) | _neighbouring_tiles(-MECCA_LAT, MECCA_LNG - 180)
+
+
+class BearingGrid:
+    def __init__(self, max_tiles):
+        self.max_tiles = max_tiles
+        self._tiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _build_tile(tile_lat, tile_lng):
+        """
+        Bearings at the (GRID_STEPS + 1)² nodes of a tile, stored as their
+        sines and cosines so interpolation does not break at the 0°/360° wrap
+        """
+        offsets = np.arange(GRID_STEPS + 1) * GRID_RESOLUTION
+        lats, lngs = np.meshgrid(tile_lat + offsets, tile_lng + offsets, indexing='ij')
+        bearings, _ = qibla_directions(lats, lngs)
+        radians = np.radians(bearings).ravel()
+        # Flat row-major Python lists: indexing them is far cheaper than
+        # indexing a NumPy array one scalar at a time
+        return np.sin(radians).tolist(), np.cos(radians).tolist()
+
+    def _tile(self, key):
+        with self._lock:
+            tile = self._tiles.get(key)
+            if tile is not None:
+                self._tiles.move_to_end(key)
+                return tile
+
+        tile = self._build_tile(*key)
+        with self._lock:
+            self._tiles[key] = tile
+            while len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+        return tile
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def clear(self):
+        with self._lock:
+            self._tiles.clear()
+
+    def direction(self, lat, lng):
+        """Bearing to the Kaaba in degrees, interpolated from the grid"""
+        # Latitude 90 and longitude 180 belong to the last tile on their axis
+        tile_lat = min(math.floor(lat), 89)
+        tile_lng = min(math.floor(lng), 179)
+        if (tile_lat, tile_lng) in EXACT_TILES:
+            return qibla_direction(lat, lng)
+
+        sines, cosines = self._tile((tile_lat, tile_lng))
+        row = min((lat - tile_lat) / GRID_RESOLUTION, GRID_STEPS)
+        col = min((lng - tile_lng) / GRID_RESOLUTION, GRID_STEPS)
+        i = min(int(row), GRID_STEPS - 1)
+        j = min(int(col), GRID_STEPS - 1)
+        u = row - i
+        v = col - j
+
+        # Weights of the four surrounding nodes
+        k = i * _ROW + j
+        w00 = (1 - u) * (1 - v)
+        w10 = u * (1 - v)
+        w01 = (1 - u) * v
+        w11 = u * v
+        sin = w00 * sines[k] + w10 * sines[k + _ROW] + w01 * sines[k + 1] + w11 * sines[k + _ROW + 1]
+        cos = w00 * cosines[k] + w10 * cosines[k + _ROW] + w01 * cosines[k + 1] + w11 * cosines[k + _ROW + 1]
+        return math.degrees(math.atan2(sin, cos)) % 360.0
+
+
+_grid = None
+_grid_lock = threading.Lock()
+
+
+def bearing_grid():
+    """The process-wide BearingGrid, sized by settings.QIBLA_GRID_MAX_TILES"""
+    global _grid
+    if _grid is None:
+        from django.conf import settings
+        with _grid_lock:
+            if _grid is None:
+                _grid = BearingGrid(settings.QIBLA_GRID_MAX_TILES)
+    return _grid
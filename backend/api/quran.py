@@ -0,0 +1,559 @@
+"""
+Local Quran text store.
+
+The `import_quran` management command converts a full-Quran dump in the
+alquran.cloud format into one compact JSON file of surah and ayah metadata
+per edition under settings.QURAN_DATA_DIR, and packs the ayah text into a
+memory-mapped file next to it (api/quran_pack.py) that all worker processes
+share. Each edition is loaded once per process and indexed by surah, juz,
+page and the other divisions so the text endpoints never have to call the
+upstream API.
+Since the text only changes when an edition is re-imported, complete
+response bodies are rendered once and reused together with their ETag, both
+in process and through the shared cache so other workers do not render them
+again. A process reloads an edition when its file changes, so a re-import
+reaches every worker; clients keep the bodies for a day and then
+revalidate, so it reaches them without a new URL.
+"""
+import functools
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+
+from . import cache
+from .quran_pack import PackedText, write_packed
+
+DEFAULT_EDITION = 'quran-uthmani'
+
+SURAH_COUNT = 114
+JUZ_COUNT = 30
+
+# Column order of the rows stored in an edition file
+SURAH_FIELDS = ('number', 'name', 'englishName', 'englishNameTranslation', 'revelationType', 'numberOfAyahs')
+AYAH_FIELDS = ('number', 'surah', 'numberInSurah', 'juz', 'manzil', 'page', 'ruku', 'hizbQuarter', 'sajda', 'text')
+
+
+# Edition identifiers come from request parameters and name files
+EDITION_IDENTIFIER = re.compile(r'[A-Za-z0-9][A-Za-z0-9._-]*')
+
+
+class QuranDataUnavailable(Exception):
+    """Raised when an edition has not been imported into the local store"""
+
+
+class EditionUnavailable(QuranDataUnavailable):
+    """Raised when an edition asked for alongside the text (?editions=) cannot be used"""
+
+
+def edition_path(edition):
+    return os.path.join(settings.QURAN_DATA_DIR, f'{edition}.json')
+
+
+def packed_text_name(edition, texts):
+    """File name of the packed text of an edition, unique to its content"""
+    digest = hashlib.sha256('\n'.join(texts).encode('utf-8')).hexdigest()[:12]
+    return f'{edition}.{digest}.bin'
+
+
+def pack_edition(data):
+    """
+    Convert the `data` object of an alquran.cloud full-Quran response into
+    compact rows, the text being the last column of every ayah row (see
+    store_edition()). Raises ValueError if the dump is incomplete or out of
+    order.
+    """
+    surahs = data.get('surahs') or []
+    if len(surahs) != SURAH_COUNT:
+        raise ValueError(f'Expected {SURAH_COUNT} surahs, found {len(surahs)}')
+
+    surah_rows = []
+    ayah_rows = []
+    for expected_surah, surah in enumerate(surahs, start=1):
+        if surah['number'] != expected_surah:
+            raise ValueError(f'Surah {surah["number"]} is out of order (expected {expected_surah})')
+        ayahs = surah['ayahs']
+        surah_rows.append([
+            surah['number'], surah['name'], surah['englishName'], surah['englishNameTranslation'],
+            surah['revelationType'], len(ayahs),
+        ])
+        for ayah in ayahs:
+            if ayah['number'] != len(ayah_rows) + 1:
+                raise ValueError(f'Ayah {ayah["number"]} is out of order (expected {len(ayah_rows) + 1})')
+            ayah_rows.append([
+                ayah['number'], surah['number'], ayah['numberInSurah'], ayah['juz'], ayah['manzil'],
+                ayah['page'], ayah['ruku'], ayah['hizbQuarter'], ayah['sajda'], ayah['text'],
+            ])
+
+    edition = data.get('edition') or {}
+    return {
+        'edition': edition.get('identifier'),
+        'surahs': surah_rows,
+        'ayahs': ayah_rows,
+    }
+
+
+def _division_numbers(row):
+    """The division numbers of an ayah row; a hizb is four quarters (rub)"""
+    return {
+        'surah': row[1], 'juz': row[3], 'manzil': row[4], 'page': row[5],
+        'hizb': (row[7] + 3) // 4, 'rub': row[7],
+    }
+
+
+DIVISIONS = ('surah', 'juz', 'manzil', 'page', 'hizb', 'rub')
+
+
+class QuranText:
+    """
+    One imported edition held in memory. Ayahs are stored in mushaf order, so
+    every surah, juz, manzil, page, hizb and rub is a contiguous slice of
+    the ayah rows; their boundaries are worked out once, on load. The rows
+    hold the ayah metadata (AYAH_FIELDS without the text); `texts` is the
+    PackedText of the edition, or a list for files imported before the text
+    was packed. `revision` identifies the edition file it was loaded from.
+    """
+
+    def __init__(self, packed, texts=None, revision=None):
+        self.edition = packed['edition']
+        self.revision = revision
+        self.surahs = [dict(zip(SURAH_FIELDS, row)) for row in packed['surahs']]
+        self.ayahs = packed['ayahs']
+        if texts is None:
+            texts = [row[-1] for row in self.ayahs]
+            self.ayahs = [row[:-1] for row in self.ayahs]
+        self.texts = texts
+
+        # division -> {number: [start, end) row range}
+        self.ranges = {division: {} for division in DIVISIONS}
+        for index, row in enumerate(self.ayahs):
+            for division, number in _division_numbers(row).items():
+                start, _ = self.ranges[division].get(number, (index, index))
+                self.ranges[division][number] = (start, index + 1)
+        self.surah_ranges = self.ranges['surah']
+        self.juz_ranges = self.ranges['juz']
+        self.memory_size = self._memory_size()
+        # Set by quran_search.get_index(), so it is dropped along with the text
+        self.search_index = None
+
+    def _memory_size(self):
+        """
+        Approximate bytes this edition keeps resident: its rows and its
+        text. Packed text counts as its whole mapping, an upper bound: only
+        the pages read are resident, and workers share them. Its search
+        index and rendered bodies are added as they are built.
+        """
+        size = sys.getsizeof(self.ayahs) + sum(sys.getsizeof(row) for row in self.ayahs)
+        if isinstance(self.texts, PackedText):
+            return size + self.texts.size
+        return size + sum(sys.getsizeof(text) for text in self.texts)
+
+    @classmethod
+    def load(cls, path):
+        # Taken before reading: if the file is replaced meanwhile, the next
+        # lookup sees a newer revision and loads it again
+        revision = os.stat(path).st_mtime_ns
+        with open(path, encoding='utf-8') as f:
+            packed = json.load(f)
+        texts = None
+        if 'text_file' in packed:
+            texts = PackedText(os.path.join(os.path.dirname(path), packed['text_file']))
+        return cls(packed, texts, revision)
+
+    def surah_info(self, surah_number):
+        return self.surahs[surah_number - 1]
+
+    def ayah_text(self, index):
+        return self.texts[index]
+
+    def text_slices(self, start, end):
+        """
+        The UTF-8 text of each ayah of rows [start, end): memoryviews into
+        the packed file, without copying
+        """
+        if isinstance(self.texts, PackedText):
+            return self.texts.slices(start, end)
+        return [memoryview(text.encode('utf-8')) for text in self.texts[start:end]]
+
+    def _ayah(self, index, with_surah):
+        ayah = dict(zip(AYAH_FIELDS, self.ayahs[index]))
+        ayah['text'] = self.texts[index]
+        surah_number = ayah.pop('surah')
+        if with_surah:
+            ayah['surah'] = self.surah_info(surah_number)
+        return ayah
+
+    def ayah_row(self, ref):
+        """
+        Row index of an ayah given as its number in the mushaf ("262") or as
+        surah:ayah ("2:255"); raises ValueError if there is no such ayah
+        """
+        surah, _, ayah = str(ref).partition(':')
+        try:
+            if not ayah:
+                row = int(surah) - 1
+                if 0 <= row < len(self.ayahs):
+                    return row
+            else:
+                start, end = self.surah_ranges[int(surah)]
+                if 1 <= int(ayah) <= end - start:
+                    return start + int(ayah) - 1
+        except (KeyError, ValueError):
+            pass
+        raise ValueError(f'No ayah {ref}')
+
+    def verse_key(self, row):
+        return f'{self.ayahs[row][1]}:{self.ayahs[row][2]}'
+
+    def slice_ayahs(self, start, end):
+        """Ayahs of rows [start, end), each carrying its surah"""
+        return [self._ayah(index, with_surah=True) for index in range(start, end)]
+
+    def division_ayahs(self, division, number):
+        """Ayahs of a division, each carrying its surah; KeyError if it does not exist"""
+        return self.slice_ayahs(*self.ranges[division][number])
+
+    def juz_ayahs(self, juz_number):
+        """Ayahs of a juz, each carrying its surah like the upstream /juz/ endpoint"""
+        return self.division_ayahs('juz', juz_number)
+
+    def surah_ayahs(self, surah_number):
+        """Ayahs of a surah without the per-ayah surah object, like the upstream /surah/ endpoint"""
+        start, end = self.surah_ranges[surah_number]
+        return [self._ayah(index, with_surah=False) for index in range(start, end)]
+
+
+def _write_json(data, path):
+    # Write to a temporary file and swap it in so readers never see a partial file
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def store_edition(packed):
+    """
+    Write an edition in the pack_edition() format to QURAN_DATA_DIR: its
+    packed text and then the JSON file of its metadata naming the packed
+    text. Replacing the JSON file switches readers to the new edition in one
+    step; processes still holding the previous text keep their mapping of
+    the file, which is unlinked but not gone. Returns the JSON file's path.
+    """
+    edition = packed['edition']
+    path = edition_path(edition)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+
+    texts = [row[-1] for row in packed['ayahs']]
+    text_file = packed_text_name(edition, texts)
+    write_packed(texts, os.path.join(directory, text_file))
+    _write_json({
+        'edition': edition,
+        'text_file': text_file,
+        'surahs': packed['surahs'],
+        'ayahs': [row[:-1] for row in packed['ayahs']],
+    }, path)
+
+    # Packed text of earlier imports
+    stale = re.compile(re.escape(edition) + r'\.[0-9a-f]{12}\.bin')
+    for name in os.listdir(directory):
+        if name != text_file and stale.fullmatch(name):
+            os.remove(os.path.join(directory, name))
+    return path
+
+
+# Loaded editions, least recently used first, and the memory they hold
+_editions = OrderedDict()
+_editions_memory = 0
+_editions_lock = threading.Lock()
+
+
+def _file_revision(edition):
+    """Revision of the edition file on disk (its mtime), or None if there is none"""
+    try:
+        return os.stat(edition_path(edition)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def get_edition(edition=DEFAULT_EDITION):
+    """
+    Return the loaded edition, reading it from disk on first use in this
+    process and again once its file has been replaced (a re-import, possibly
+    by another process). Editions, with their search indexes and rendered
+    bodies, are kept within settings.QURAN_EDITIONS_MEMORY_MB by dropping
+    the least recently used ones, so rarely requested translations do not
+    stay resident.
+    """
+    if not EDITION_IDENTIFIER.fullmatch(edition):
+        raise QuranDataUnavailable(f'{edition!r} is not an edition identifier')
+    text = _editions.get(edition)
+    if text is not None and text.revision == _file_revision(edition):
+        try:
+            _editions.move_to_end(edition)
+        except KeyError:
+            pass  # dropped by another thread meanwhile; this request keeps its copy
+        return text
+
+    with _editions_lock:
+        text = _editions.get(edition)
+        revision = _file_revision(edition)
+        if text is None or text.revision != revision:
+            if text is not None:
+                _drop(edition)
+            if revision is None:
+                raise QuranDataUnavailable(f'Edition {edition} has not been imported')
+            text = _editions[edition] = QuranText.load(edition_path(edition))
+            _charge(text, 0, loaded=True)
+    return text
+
+
+def _budget():
+    return settings.QURAN_EDITIONS_MEMORY_MB * 1024 * 1024
+
+
+def _charge(text, size, loaded=False):
+    """
+    Count `size` more bytes held for `text` (all of it if it was just
+    `loaded`), then drop the least recently used editions while over
+    budget, always keeping one. Called with _editions_lock held, which
+    also guards every change to `_rendered`.
+    """
+    global _editions_memory
+    text.memory_size += size
+    if _editions.get(text.edition) is not text:
+        return  # Already dropped; its memory goes with it
+    _editions_memory += text.memory_size if loaded else size
+    while _editions_memory > _budget() and len(_editions) > 1:
+        _drop(next(iter(_editions)))
+
+
+def _drop(edition):
+    """Forget a loaded edition and its rendered bodies; with _editions_lock held"""
+    global _editions_memory
+    dropped = _editions.pop(edition)
+    _editions_memory -= dropped.memory_size
+    for key in [key for key in _rendered if key[2] == edition]:
+        del _rendered[key]
+
+
+def account_memory(text, size):
+    """Count `size` bytes built for a loaded edition (its search index) against the budget"""
+    with _editions_lock:
+        _charge(text, size)
+
+
+def _keep_rendered(key, rendered):
+    """
+    Keep a rendered body in this process, counted against the memory of its
+    edition. Bodies of a revision this process no longer holds (dropped or
+    reloaded meanwhile) and bodies that could not fit are not kept.
+    """
+    size = len(rendered.body)
+    with _editions_lock:
+        text = _editions.get(key[2])
+        if (text is not None and text.revision == key[3] and key not in _rendered
+                and text.memory_size + size <= _budget()):
+            _rendered[key] = rendered
+            _charge(text, size)
+
+
+def loaded_editions():
+    """Identifiers of the editions loaded in this process, least recently used first"""
+    return list(_editions)
+
+
+def reset_editions():
+    """Drop loaded editions so the next lookup re-reads them (after an import)"""
+    global _editions_memory
+    with _editions_lock:
+        _editions.clear()
+        _editions_memory = 0
+        _rendered.clear()
+
+
+def parse_editions(value):
+    """
+    Edition identifiers of a comma separated ?editions= parameter, without
+    duplicates. Raises ValueError with a message for the client if one is
+    malformed or there are more than QURAN_MAX_EDITIONS_PER_REQUEST.
+    """
+    editions = []
+    for edition in (part.strip() for part in value.split(',')):
+        if not edition or edition in editions:
+            continue
+        if not EDITION_IDENTIFIER.fullmatch(edition):
+            raise ValueError(f'{edition!r} is not an edition identifier')
+        editions.append(edition)
+    if len(editions) > settings.QURAN_MAX_EDITIONS_PER_REQUEST:
+        raise ValueError(f'At most {settings.QURAN_MAX_EDITIONS_PER_REQUEST} editions per request')
+    return editions
+
+
+def format_juz_text(ayahs):
+    parts = []
+    current_surah = None
+    for ayah in ayahs:
+        surah_name = ayah['surah']['name']
+
+        # Add surah header when changing to a new surah
+        if current_surah != surah_name:
+            current_surah = surah_name
+            parts.append(f"\n## {surah_name}\n\n")
+
+        parts.append(f"{ayah['text']} ({ayah['numberInSurah']})\n\n")
+    return ''.join(parts)
+
+
+def format_surah_text(surah_name, ayahs):
+    parts = [f"## {surah_name}\n\n"]
+    parts.extend(f"{ayah['text']} ({ayah['numberInSurah']})\n\n" for ayah in ayahs)
+    return ''.join(parts)
+
+
+# A fully serialized JSON response body and its strong ETag
+RenderedText = namedtuple('RenderedText', ['body', 'etag'])
+
+# (endpoint, number, edition, revision) -> RenderedText of the loaded
+# editions, where revision is QuranText.revision of the text it was rendered
+# from. Entries go away when an edition is dropped from memory or reloaded.
+# Written under _editions_lock.
+_rendered = {}
+
+
+def _render(payload):
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return RenderedText(body, '"%s"' % hashlib.sha256(body).hexdigest()[:32])
+
+
+def _juz_payload(juz_number, edition):
+    ayahs = get_edition(edition).juz_ayahs(juz_number)
+    return {
+        'juz_number': juz_number,
+        'text': format_juz_text(ayahs),
+        'ayahs': ayahs,
+    }
+
+
+def _surah_payload(surah_number, edition):
+    text = get_edition(edition)
+    ayahs = text.surah_ayahs(surah_number)
+    surah_name = text.surah_info(surah_number)['name']
+    return {
+        'surah_number': surah_number,
+        'surah_name': surah_name,
+        'text': format_surah_text(surah_name, ayahs),
+        'ayahs': ayahs,
+    }
+
+
+def _division_payload(division, number, edition):
+    text = get_edition(edition)
+    start, end = text.ranges[division][number]
+    return range_payload(text, start, end, **{f'{division}_number': number})
+
+
+def _ayah_payload(number, edition):
+    text = get_edition(edition)
+    return {'verse_key': text.verse_key(number - 1), **text.slice_ayahs(number - 1, number)[0]}
+
+
+_payloads = {
+    'juz': _juz_payload,
+    'surah': _surah_payload,
+    'ayah': _ayah_payload,
+    **{division: functools.partial(_division_payload, division) for division in ('page', 'hizb', 'rub', 'manzil')},
+}
+
+
+def range_payload(text, start, end, **fields):
+    """
+    Response of the ayahs of rows [start, end) of a loaded edition, with the
+    verse keys of its first and last ayah
+    """
+    ayahs = text.slice_ayahs(start, end)
+    return {
+        **fields,
+        'first': text.verse_key(start),
+        'last': text.verse_key(end - 1),
+        'count': len(ayahs),
+        'text': format_juz_text(ayahs),
+        'ayahs': ayahs,
+    }
+
+
+def add_translations(payload, text, editions):
+    """
+    Give every ayah of a response built from the loaded edition `text` a
+    `translations` object holding its text in each of `editions`. Raises
+    EditionUnavailable if one of them has not been imported or does not
+    number its ayahs like `text`.
+    """
+    if not editions:
+        return payload
+    ayahs = payload['ayahs'] if 'ayahs' in payload else [payload]
+    translations = []
+    for edition in editions:
+        try:
+            translation = get_edition(edition)
+        except QuranDataUnavailable:
+            raise EditionUnavailable(f'Edition {edition} has not been imported')
+        if len(translation.ayahs) != len(text.ayahs):
+            raise EditionUnavailable(f'Edition {edition} does not have the ayahs of {text.edition}')
+        translations.append((edition, translation))
+    for ayah in ayahs:
+        ayah['translations'] = {
+            edition: translation.ayah_text(ayah['number'] - 1) for edition, translation in translations
+        }
+    payload['editions'] = list(editions)
+    return payload
+
+
+def _translation_revision(edition):
+    try:
+        return get_edition(edition).revision
+    except QuranDataUnavailable:
+        raise EditionUnavailable(f'Edition {edition} has not been imported')
+
+
+def render_range(text, start, end, editions=(), **fields):
+    """Serialized range_payload() with the translations of `editions`"""
+    return _render(add_translations(range_payload(text, start, end, **fields), text, editions))
+
+
+def render_text(endpoint, number, edition=DEFAULT_EDITION, editions=()):
+    """
+    Return the serialized response of a text endpoint ('juz', 'surah',
+    'ayah' or a division: 'page', 'hizb', 'rub', 'manzil'), building it on
+    first request. With `editions`, every ayah also carries its text in each
+    of those editions (add_translations()); these bodies are only kept in
+    the shared cache, as there are too many combinations to hold them all in
+    every process. The shared cache keeps every body for CACHE_TTL. Raises
+    QuranDataUnavailable if the edition has not been imported
+    (EditionUnavailable for one of `editions`), KeyError if there is no such
+    division.
+    """
+    editions = tuple(editions)
+    revision = get_edition(edition).revision
+    key = (endpoint, number, edition, revision)
+    rendered = None if editions else _rendered.get(key)
+    if rendered is None:
+        # The revisions of the loaded editions are part of the shared key so
+        # a re-import is never answered from bodies of the previous files
+        revisions = '+'.join(
+            [f'{edition}:{revision}']
+            + [f'{translation}:{_translation_revision(translation)}' for translation in editions]
+        )
+        rendered = cache.get_or_set(
+            'quran-text',
+            f'{revisions}:{endpoint}:{number}',
+            lambda: _render(add_translations(_payloads[endpoint](number, edition), get_edition(edition), editions)),
+        )
+        if not editions:
+            _keep_rendered(key, rendered)
+    return rendered
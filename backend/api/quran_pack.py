@@ -0,0 +1,105 @@
+"""
+Packed, memory-mapped ayah text.
+
+`import_quran` writes the text of an edition to {edition}.{digest}.bin
+(digest: the start of the SHA-256 of the text), next to the edition's JSON
+file, which then only keeps the ayah metadata and names the .bin file:
+
+    b'QTX1'                  magic
+    count                    uint32, little endian
+    offsets[count + 1]       uint32, little endian, into the blob area
+    UTF-8 text of every ayah, back to back, in mushaf order
+
+PackedText maps the file read-only. Every worker process that opens the same
+file shares its pages through the OS page cache instead of holding its own
+copy of the text as Python strings, and only the parts that are read become
+resident. Ayah ranges are returned as zero-copy memoryview slices of the
+mapping; an ayah's text is decoded only when a str is asked for. The
+editions budget still counts the whole mapping (`size`), so what it
+reports per worker is an upper bound on the resident, shared pages.
+
+This module has no Django dependency so that benchmark workers can load
+it on their own.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b'QTX1'
+_HEADER = struct.Struct('<4sI')
+
+
+def write_packed(texts, path):
+    """Write a sequence of ayah texts to `path` atomically"""
+    blobs = [text.encode('utf-8') for text in texts]
+    offsets = array('I', [0])
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, len(blobs)))
+        f.write(offsets.tobytes())
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+
+
+class PackedText:
+    """
+    The ayah texts of a packed file. Indexing returns the str of one ayah;
+    view() and slices() return memoryviews into the mapping.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        magic, count = _HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a packed Quran text file')
+
+        start = _HEADER.size
+        end = start + 4 * (count + 1)
+        if sys.byteorder == 'little':
+            self.offsets = self._buffer[start:end].cast('I')
+        else:
+            self.offsets = array('I', self._buffer[start:end])
+            self.offsets.byteswap()
+        self._blobs = self._buffer[end:]
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def size(self):
+        """Bytes of the mapped file"""
+        return len(self._buffer)
+
+    def __getitem__(self, index):
+        if not -self._count <= index < self._count:
+            raise IndexError('ayah index out of range')
+        index %= self._count
+        return str(self._blobs[self.offsets[index]:self.offsets[index + 1]], 'utf-8')
+
+    def view(self, start, end):
+        """The UTF-8 text of ayahs [start, end), back to back, without copying"""
+        return self._blobs[self.offsets[start]:self.offsets[end]]
+
+    def slices(self, start, end):
+        """The UTF-8 text of each ayah of [start, end), without copying"""
+        offsets = self.offsets
+        return [self._blobs[offsets[index]:offsets[index + 1]] for index in range(start, end)]
+
+    def close(self):
+        """Unmap the file; only valid once no slice handed out is in use"""
+        if isinstance(self.offsets, memoryview):
+            self.offsets.release()
+        self._blobs.release()
+        self._buffer.release()
+        self._mmap.close()
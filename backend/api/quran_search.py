@@ -0,0 +1,405 @@
+"""
+Full-text search over the local Quran text store.
+
+`import_quran` writes an inverted index next to every edition file
+({edition}.search.json): for each normalized word form, the ayahs it occurs
+in and its positions there. The index is read once per process, alongside
+the edition it belongs to, and queries are answered from memory.
+
+Arabic words are normalized before indexing and querying: tashkeel, Quranic
+annotation marks and tatweel are stripped, the alef forms (أ إ آ ٱ) fold to
+ا, ى to ي and ة to ه, so a query typed without diacritics finds the Uthmani
+text. A dagger alef is indexed both as ا and as nothing, which covers the
+two ways it is usually spelled (الكتاب for ٱلْكِتَٰبُ, الرحمن for ٱلرَّحْمَٰنِ).
+Other scripts are case folded.
+
+A query is a list of words, "quoted phrases" and prefixes (word*); an ayah
+matches when it contains all of them. Matches are ranked with BM25 and ties
+keep mushaf order.
+
+The same word forms, with their number of occurrences, and the surah names
+make the completion table of the type-ahead endpoint (Suggester).
+"""
+import heapq
+import json
+import math
+import os
+import re
+import struct
+import sys
+import threading
+from bisect import bisect_left
+from collections import namedtuple
+
+from . import quran
+
+# Diacritics (harakat, shadda, sukun, ...), Quranic annotation and pause marks, tatweel
+_MARKS = re.compile('[\u0610-\u061a\u064b-\u065f\u06d6-\u06ed\u0640]')
+_FOLDS = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا', 'ٲ': 'ا', 'ٳ': 'ا',
+    'ى': 'ي', 'ی': 'ي',
+    'ة': 'ه',
+    'ک': 'ك',
+})
+_NON_WORD = re.compile(r'[\W_]')
+DAGGER_ALEF = '\u0670'
+
+# Shortest prefix accepted in a query, to keep prefix expansion bounded
+MIN_PREFIX_LENGTH = 2
+
+# Results per page of GET /api/quran/search/
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Completions returned by GET /api/quran/suggest/
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 50
+# Word completions of prefixes up to this length are ranked once, up front
+PRERANKED_PREFIX_LENGTH = 2
+
+# Bits of a word position in the combined (row, position) integers of phrase matching
+POSITION_BITS = 16
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_QUERY = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def normalize(word):
+    """The indexed form of one word ('' for marks and punctuation)"""
+    word = _MARKS.sub('', word.replace(DAGGER_ALEF, 'ا')).translate(_FOLDS)
+    return _NON_WORD.sub('', word).casefold()
+
+
+def word_forms(word):
+    """Every indexed form of one word: normally one, two for a dagger alef"""
+    form = normalize(word)
+    if not form:
+        return ()
+    if DAGGER_ALEF in word:
+        bare = normalize(word.replace(DAGGER_ALEF, ''))
+        if bare and bare != form:
+            return (form, bare)
+    return (form,)
+
+
+def normalize_words(text):
+    """A normalized phrase: the normalized words of `text` joined by spaces"""
+    return ' '.join(filter(None, (normalize(word) for word in re.split(r'[\s-]+', text))))
+
+
+def name_keys(name):
+    """
+    Normalized keys a name completes from: the whole name and each of its
+    later words on, with and without the article (البقرة from سورة البقرة,
+    baqara from Al-Baqara)
+    """
+    words = normalize_words(name).split()
+    keys = set()
+    for start in range(len(words)):
+        key = ' '.join(words[start:])
+        keys.add(key)
+        for article in ('ال', 'al '):
+            if key.startswith(article) and len(key) > len(article):
+                keys.add(key[len(article):])
+    return keys
+
+
+def tokenize(text):
+    """
+    (word index, forms) of the words of an ayah that have an indexed form.
+    Word indexes count every whitespace-separated word, so clients can
+    highlight text.split(' '); positions in the index count only the
+    words returned here, so a phrase spans pause marks.
+    """
+    tokens = []
+    for word_index, word in enumerate(text.split()):
+        forms = word_forms(word)
+        if forms:
+            tokens.append((word_index, forms))
+    return tokens
+
+
+def build_index(edition, texts):
+    """
+    The serializable index of the ayah texts of an edition:
+    {'edition', 'ayahs', 'lengths', 'terms': {form: [rows, positions]}}, rows
+    being ascending indexes into the edition's ayahs and positions the list
+    of positions of the form in each of them.
+    """
+    terms = {}
+    lengths = []
+    for row, text in enumerate(texts):
+        tokens = tokenize(text)
+        lengths.append(len(tokens))
+        for position, (_, forms) in enumerate(tokens):
+            for form in forms:
+                rows, positions = terms.setdefault(form, [[], []])
+                if rows and rows[-1] == row:
+                    positions[-1].append(position)
+                else:
+                    rows.append(row)
+                    positions.append([position])
+    return {'edition': edition, 'ayahs': len(lengths), 'lengths': lengths, 'terms': terms}
+
+
+def index_path(edition):
+    return os.path.join(os.path.dirname(quran.edition_path(edition)), f'{edition}.search.json')
+
+
+# A parsed query clause: ('word' | 'prefix' | 'phrase', normalized forms)
+Clause = namedtuple('Clause', ['kind', 'forms'])
+
+SearchResult = namedtuple('SearchResult', ['row', 'score'])
+
+
+def parse_query(query):
+    """Clauses of a query string; raises ValueError if it has nothing to search for"""
+    clauses = []
+    for phrase, word in _QUERY.findall(query):
+        if phrase:
+            forms = [normalize(part) for part in phrase.split()]
+            forms = [form for form in forms if form]
+            if len(forms) > 1:
+                clauses.append(Clause('phrase', tuple(forms)))
+            elif forms:
+                clauses.append(Clause('word', tuple(forms)))
+        elif word.endswith('*'):
+            form = normalize(word.rstrip('*'))
+            if len(form) < MIN_PREFIX_LENGTH:
+                raise ValueError(f'Prefixes need at least {MIN_PREFIX_LENGTH} letters')
+            clauses.append(Clause('prefix', (form,)))
+        else:
+            form = normalize(word)
+            if form:
+                clauses.append(Clause('word', (form,)))
+    if not clauses:
+        raise ValueError('The query has no words to search for')
+    return clauses
+
+
+class SearchIndex:
+    """The inverted index of one loaded edition"""
+
+    def __init__(self, text, index):
+        self.text = text
+        self.postings = index['terms']
+        self.forms = sorted(self.postings)
+        # The length part of BM25's denominator, per ayah
+        lengths = index['lengths']
+        average_length = sum(lengths) / max(len(lengths), 1)
+        self.length_norms = [K1 * (1 - B + B * length / average_length) for length in lengths]
+        self.suggester = Suggester(self.postings, text.surahs)
+        self.memory_size = self._memory_size()
+
+    def _memory_size(self):
+        """Approximate bytes of the postings and the tables built from them"""
+        # Every posting is a pointer in a list to its own (parsed JSON) int
+        pointer = struct.calcsize('P')
+        posting = pointer + sys.getsizeof(1 << 30)
+        empty = sys.getsizeof([])
+        size = sys.getsizeof(self.postings) + sys.getsizeof(self.forms) + posting * len(self.length_norms)
+        for form, (rows, positions) in self.postings.items():
+            occurrences = sum(map(len, positions))
+            size += sys.getsizeof(form) + 3 * empty + len(rows) * (posting + pointer + empty) + occurrences * posting
+        suggester = self.suggester
+        size += sys.getsizeof(suggester.word_keys) + sys.getsizeof(suggester.word_counts)
+        return size + sum(sys.getsizeof(indexes) for indexes in suggester.preranked.values())
+
+    def _matches(self, clause):
+        """{row: positions} of the ayahs matching one clause"""
+        if clause.kind == 'word':
+            rows, positions = self.postings.get(clause.forms[0], ((), ()))
+            return dict(zip(rows, positions))
+
+        if clause.kind == 'prefix':
+            prefix = clause.forms[0]
+            matches = {}
+            for form in self.forms[bisect_left(self.forms, prefix):]:
+                if not form.startswith(prefix):
+                    break
+                for row, positions in zip(*self.postings[form]):
+                    if row in matches:
+                        # Two forms of a row can share positions (dagger alef)
+                        matches[row] = sorted(set(matches[row]).union(positions))
+                    else:
+                        matches[row] = positions
+            return matches
+
+        # Phrase: the positions of every word, shifted back by its offset in
+        # the phrase, meet at the positions where the phrase starts. A row
+        # and a position make one integer so that the sets intersect in C.
+        starts = None
+        for offset, form in enumerate(clause.forms):
+            rows, positions = self.postings.get(form, ((), ()))
+            shifted = {
+                (row << POSITION_BITS) + position - offset
+                for row, row_positions in zip(rows, positions) for position in row_positions
+            }
+            starts = shifted if starts is None else starts & shifted
+            if not starts:
+                return {}
+        matches = {}
+        length = len(clause.forms)
+        mask = (1 << POSITION_BITS) - 1
+        for start in sorted(starts):
+            row, position = start >> POSITION_BITS, start & mask
+            matches.setdefault(row, []).extend(range(position, position + length))
+        return {row: sorted(set(positions)) for row, positions in matches.items()}
+
+    def search(self, query):
+        """
+        SearchResults of the ayahs matching every clause of a query, best
+        first. Raises ValueError for a query without words.
+        """
+        clauses = parse_query(query)
+        matches = sorted((self._matches(clause) for clause in clauses), key=len)
+        rows = set(matches[0])
+        for clause_matches in matches[1:]:
+            rows.intersection_update(clause_matches)
+
+        # BM25, a clause counting as one term; only positions of the page
+        # actually returned are looked at again (SearchResults.highlights)
+        total = len(self.length_norms)
+        length_norms = self.length_norms
+        scores = dict.fromkeys(rows, 0.0)
+        for clause_matches in matches:
+            idf = math.log(1 + (total - len(clause_matches) + 0.5) / (len(clause_matches) + 0.5))
+            for row in rows:
+                frequency = len(clause_matches[row])
+                scores[row] += idf * frequency * (K1 + 1) / (frequency + length_norms[row])
+        # Best score first, mushaf order among equals (the sort is stable)
+        ranked = sorted(sorted(rows), key=scores.__getitem__, reverse=True)
+        return SearchResults(self, ranked, scores, matches)
+
+
+class SearchResults:
+    """
+    The ranked rows of a search. Indexing or slicing it builds SearchResults
+    for just the rows asked for, so a large result set costs no more than
+    the page that is returned.
+    """
+
+    def __init__(self, index, ranked, scores, matches):
+        self.index = index
+        self.ranked = ranked
+        self.scores = scores
+        self.matches = matches
+
+    def __len__(self):
+        return len(self.ranked)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [SearchResult(row, round(self.scores[row], 4)) for row in self.ranked[key]]
+        row = self.ranked[key]
+        return SearchResult(row, round(self.scores[row], 4))
+
+    def highlights(self, result):
+        """Indexes in text.split(' ') of the words of a result that matched"""
+        positions = set().union(*(clause_matches[result.row] for clause_matches in self.matches))
+        tokens = tokenize(self.index.text.ayah_text(result.row))
+        return [tokens[position][0] for position in sorted(positions)]
+
+
+class Suggester:
+    """
+    Completions of a normalized prefix: word forms of the edition, most
+    frequent first, and surah names. Both are sorted arrays searched with
+    bisect; the prefixes of one or two letters, whose ranges span
+    thousands of forms, have their completions ranked when the table is
+    built. Nothing changes after that, so concurrent reads need no lock.
+    """
+
+    def __init__(self, postings, surahs):
+        words = sorted(
+            (form, sum(len(row_positions) for row_positions in positions))
+            for form, (rows, positions) in postings.items()
+        )
+        self.word_keys = [form for form, _ in words]
+        self.word_counts = [count for _, count in words]
+
+        groups = {}
+        for index, form in enumerate(self.word_keys):
+            for length in range(1, min(len(form), PRERANKED_PREFIX_LENGTH) + 1):
+                groups.setdefault(form[:length], []).append(index)
+        self.preranked = {
+            prefix: heapq.nsmallest(MAX_SUGGESTIONS, indexes, key=self._rank)
+            for prefix, indexes in groups.items()
+        }
+
+        names = sorted(
+            (key, surah['number'])
+            for surah in surahs for name in (surah['name'], surah['englishName']) for key in name_keys(name)
+        )
+        self.name_keys = [key for key, _ in names]
+        self.name_surahs = [number for _, number in names]
+
+    def _rank(self, index):
+        # Most frequent first, alphabetical among equals
+        return -self.word_counts[index], index
+
+    @staticmethod
+    def _range(keys, prefix):
+        return bisect_left(keys, prefix), bisect_left(keys, prefix + '\U0010ffff')
+
+    def words(self, prefix, limit=DEFAULT_SUGGESTIONS):
+        """[(form, occurrences)] of the word forms starting with a normalized prefix"""
+        if not prefix:
+            return []
+        ranked = self.preranked.get(prefix)
+        if ranked is None:
+            ranked = heapq.nsmallest(limit, range(*self._range(self.word_keys, prefix)), key=self._rank)
+        return [(self.word_keys[index], self.word_counts[index]) for index in ranked[:limit]]
+
+    def surahs(self, prefix, limit=DEFAULT_SUGGESTIONS):
+        """Numbers of the surahs, in order, with a name completing a normalized prefix"""
+        if not prefix:
+            return []
+        start, end = self._range(self.name_keys, prefix)
+        return sorted(set(self.name_surahs[start:end]))[:limit]
+
+
+def write_index(packed, path):
+    """Build the index of an edition in the pack_edition() format and write it atomically to `path`"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        index = build_index(packed['edition'], (row[-1] for row in packed['ayahs']))
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def _load_index(text):
+    try:
+        with open(index_path(text.edition), encoding='utf-8') as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        index = None
+    if index is None or index['ayahs'] != len(text.ayahs):
+        # Imported before indexes were written, or out of step with the text
+        index = build_index(text.edition, (text.ayah_text(row) for row in range(len(text.ayahs))))
+    return SearchIndex(text, index)
+
+
+_indexes_lock = threading.Lock()
+
+
+def get_index(edition=quran.DEFAULT_EDITION):
+    """
+    The search index of a loaded edition, read on first use in this
+    process. It lives on the edition, so it is replaced whenever the
+    edition is reloaded and dropped when the edition is.
+    Raises QuranDataUnavailable if the edition has not been imported.
+    """
+    text = quran.get_edition(edition)
+    index = text.search_index
+    if index is None:
+        with _indexes_lock:
+            index = text.search_index
+            if index is None:
+                index = text.search_index = _load_index(text)
+                quran.account_memory(text, index.memory_size)
+    return index
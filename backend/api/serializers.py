@@ -43,11 +43,13 @@ class KhatmahSerializer(serializers.ModelSerializer):
                  'completed_juz_count', 'completed_surah_count', 'creator_token']
         read_only_fields = ['id', 'created_at', 'creator_id', 'creator_token']
     
+    # Count over .all() so the collections already prefetched for the nested
+    # assignments fields are reused instead of issuing filtered COUNT queries
     def get_completed_juz_count(self, obj):
-        return obj.assignments.filter(completed=True).count()
+        return sum(1 for assignment in obj.assignments.all() if assignment.completed)
     
     def get_completed_surah_count(self, obj):
-        return obj.surah_assignments.filter(completed=True).count()
+        return sum(1 for assignment in obj.surah_assignments.all() if assignment.completed)
     
     def get_image_url(self, obj):
         if obj.image:
@@ -92,19 +94,28 @@ class KhatmahListSerializer(serializers.ModelSerializer):
                  'khatmah_type', 'participant_count', 'completed_count', 'participants',
                  'completed_juz_count', 'completed_surah_count']
     
+    # The counts below read the annotations added by KhatmahViewSet.get_queryset
+    # for the list action, falling back to a COUNT query when serializing an
+    # instance that was not loaded through that queryset
     def get_participant_count(self, obj):
+        if hasattr(obj, 'participant_count'):
+            return obj.participant_count
         return obj.participants.count()
     
     def get_completed_count(self, obj):
         if obj.khatmah_type == Khatmah.JUZ_TYPE:
-            return obj.assignments.filter(completed=True).count()
+            return self.get_completed_juz_count(obj)
         else:  # Surah type
-            return obj.surah_assignments.filter(completed=True).count()
+            return self.get_completed_surah_count(obj)
     
     def get_completed_juz_count(self, obj):
+        if hasattr(obj, 'completed_juz_count'):
+            return obj.completed_juz_count
         return obj.assignments.filter(completed=True).count()
     
     def get_completed_surah_count(self, obj):
+        if hasattr(obj, 'completed_surah_count'):
+            return obj.completed_surah_count
         return obj.surah_assignments.filter(completed=True).count()
     
     def get_image_url(self, obj):
@@ -146,7 +157,7 @@ class HijriMonthDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = HijriMonth
         fields = ['id', 'name_ar', 'name_en', 'number', 'year', 'gregorian_start', 'gregorian_end', 
-                 'moon_sighting_data', 'calendar_data', 'events', 'astronomical_events']
+                 'moon_sighting_data', 'calendar_data', 'source', 'events', 'astronomical_events']
         read_only_fields = ['id']
 
 class HijriMonthListSerializer(serializers.ModelSerializer):
@@ -154,8 +165,11 @@ class HijriMonthListSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = HijriMonth
-        fields = ['id', 'name_ar', 'name_en', 'number', 'year', 'gregorian_start', 'gregorian_end', 'event_count']
+        fields = ['id', 'name_ar', 'name_en', 'number', 'year', 'gregorian_start', 'gregorian_end', 'source', 'event_count']
         read_only_fields = ['id']
     
     def get_event_count(self, obj):
-        return obj.events.count() 
\ No newline at end of file
+        # Annotated by HijriMonthViewSet.list
+        if hasattr(obj, 'event_count'):
+            return obj.event_count
+        return obj.events.count()
\ No newline at end of file
@@ -0,0 +1,40 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import hijri, progress
+from .models import Khatmah, Participant, JuzAssignment, SurahAssignment, HijriMonth, HijriEvent, AstronomicalEvent
+
+
+@receiver(post_save, sender=HijriMonth)
+def materialize_saved_month(sender, instance, **kwargs):
+    hijri.month_resolver.invalidate()
+    hijri.schedule_materialize(instance.id)
+    hijri.invalidate_year_calendars(instance.year)
+
+
+@receiver(post_delete, sender=HijriMonth)
+def drop_deleted_month(sender, instance, **kwargs):
+    hijri.month_resolver.invalidate()
+    hijri.delete_month_calendar(instance.id)
+    hijri.invalidate_year_calendars(instance.year)
+
+
+@receiver([post_save, post_delete], sender=HijriEvent)
+@receiver([post_save, post_delete], sender=AstronomicalEvent)
+def materialize_event_month(sender, instance, **kwargs):
+    hijri.schedule_materialize(instance.month_id)
+    hijri.invalidate_year_calendars(instance.month.year)
+
+
+@receiver([post_save, post_delete], sender=Participant)
+@receiver([post_save, post_delete], sender=JuzAssignment)
+@receiver([post_save, post_delete], sender=SurahAssignment)
+def bump_khatmah_version(sender, instance, **kwargs):
+    progress.bump_version(instance.khatmah_id)
+
+
+@receiver(post_save, sender=Khatmah)
+def drop_khatmah_progress(sender, instance, created, **kwargs):
+    # The progress payload depends on the khatmah's type
+    if not created:
+        progress.drop_progress(instance.id)
@@ -1,3 +1,1477 @@
-from django.test import TestCase
+import asyncio
+import io
+import json
+import mmap
+import os
+import shutil
+import tempfile
+import threading
+from datetime import date, datetime, time, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework.throttling import AnonRateThrottle
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import assignments, cache as api_cache, events, hijri, hijri_convert, hijri_data, hijri_tabular, progress, qibla, quran, quran_pack, quran_search, upstream, upstream_stub
+from .models import (
+    Khatmah, Participant, JuzAssignment, SurahAssignment, HijriMonth, HijriEvent, AstronomicalEvent
+)
+
+
+def create_khatmah(name='Khatmah', participants=3, khatmah_type=Khatmah.JUZ_TYPE, completed=1):
+    """Create a khatmah with `participants` readers, each holding one assignment"""
+    khatmah = Khatmah.objects.create(name=name, khatmah_type=khatmah_type)
+    for i in range(participants):
+        participant = Participant.objects.create(name=f'Reader {i}', khatmah=khatmah)
+        JuzAssignment.objects.create(
+            juz_number=i + 1, participant=participant, khatmah=khatmah, completed=i < completed
+        )
+        SurahAssignment.objects.create(
+            surah_number=i + 1, participant=participant, khatmah=khatmah, completed=i < completed
+        )
+    return khatmah
+
+
+def create_month(number=1, year=1446, start=date(2024, 7, 7), days=30, name_en='Muharram'):
+    """Create a Hijri month whose calendar_data maps every day to a Gregorian date"""
+    return HijriMonth.objects.create(
+        name_ar=f'شهر {number}',
+        name_en=name_en,
+        number=number,
+        year=year,
+        gregorian_start=start,
+        gregorian_end=start + timedelta(days=days - 1),
+        calendar_data={'gregorian_dates': [
+            {'hijri': day, 'gregorian': (start + timedelta(days=day - 1)).isoformat()}
+            for day in range(1, days + 1)
+        ]},
+    )
+
+
+def make_quran_dump(edition='quran-uthmani', ayahs_per_surah=3):
+    return upstream_stub.synthetic_dump(edition, ayahs_per_surah)
+
+
+class QuranStoreTestMixin:
+    """Imports the synthetic dump into a temporary QURAN_DATA_DIR"""
+
+    editions = ('quran-uthmani',)
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir)
+        settings_override = override_settings(QURAN_DATA_DIR=self.data_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(quran.reset_editions)
+
+        for edition in self.editions:
+            source = os.path.join(self.data_dir, f'{edition}-source.json')
+            with open(source, 'w', encoding='utf-8') as f:
+                json.dump(self.make_dump(edition), f, ensure_ascii=False)
+            call_command('import_quran', source, stdout=io.StringIO())
+        self.client = APIClient()
+
+    def make_dump(self, edition):
+        return make_quran_dump(edition)
+
+
+class KhatmahListQueryTests(TestCase):
+    def setUp(self):
+        # Throttle history lives in the cache; start every test with a clean slate
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('khatmah-list')
+
+    def test_list_reports_counts_from_annotations(self):
+        khatmah = create_khatmah(participants=4, khatmah_type=Khatmah.SURAH_TYPE, completed=2)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        item = response.data['results'][0]
+        self.assertEqual(item['id'], str(khatmah.id))
+        self.assertEqual(item['participant_count'], 4)
+        self.assertEqual(item['completed_juz_count'], 2)
+        self.assertEqual(item['completed_surah_count'], 2)
+        self.assertEqual(item['completed_count'], 2)
+        self.assertEqual(len(item['participants']), 4)
+        self.assertEqual(set(item['participants'][0]), {'id', 'name'})
+
+    def test_list_query_count_is_independent_of_page_size(self):
+        for i in range(20):
+            create_khatmah(name=f'Khatmah {i}', participants=3)
+
+        # ETag aggregate, pagination COUNT, the annotated page query and the
+        # participants prefetch
+        with self.assertNumQueries(4):
+            small = self.client.get(self.url, {'page_size': 2})
+        with self.assertNumQueries(4):
+            large = self.client.get(self.url, {'page_size': 20})
+
+        self.assertEqual(len(small.data['results']), 2)
+        self.assertEqual(len(large.data['results']), 20)
+
+
+class KhatmahDetailQueryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_retrieve_query_count_is_independent_of_participants(self):
+        small = create_khatmah(name='Small', participants=2)
+        large = create_khatmah(name='Large', participants=30, completed=10)
+
+        # Version columns for the ETag, khatmah with creator, participants,
+        # their juz and surah assignments, and the top-level juz and surah
+        # assignments
+        with self.assertNumQueries(7):
+            self.client.get(reverse('khatmah-detail', args=[small.id]))
+        with self.assertNumQueries(7):
+            response = self.client.get(reverse('khatmah-detail', args=[large.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['participants']), 30)
+        self.assertEqual(len(response.data['assignments']), 30)
+        self.assertEqual(response.data['completed_juz_count'], 10)
+        self.assertEqual(response.data['completed_surah_count'], 10)
+        self.assertEqual(response.data['assignments'][0]['participant_name'][:7], 'Reader ')
+
+    def test_remove_participant_returns_refreshed_khatmah(self):
+        khatmah = create_khatmah(participants=3)
+        removed = khatmah.participants.order_by('name').first()
+
+        response = self.client.post(
+            reverse('khatmah-remove-participant', args=[khatmah.id]),
+            {'participant_id': str(removed.id), 'creator_token': str(khatmah.creator_token)},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['participants']), 2)
+        self.assertEqual(len(response.data['assignments']), 2)
+        self.assertNotIn(str(removed.id), [p['id'] for p in response.data['participants']])
+
+
+class KhatmahConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.khatmah = create_khatmah(participants=2)
+        self.url = reverse('khatmah-detail', args=[self.khatmah.id])
+
+    def assert_revalidates(self, url, **params):
+        first = self.client.get(url, params)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('Last-Modified', first)
+
+        # Only the version lookup runs before the 304
+        with self.assertNumQueries(1):
+            repeat = self.client.get(url, params, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(repeat['ETag'], first['ETag'])
+        return first['ETag']
+
+    def test_detail_etag_changes_with_every_khatmah_change(self):
+        etag = self.assert_revalidates(self.url)
+        assignment = JuzAssignment.objects.filter(khatmah=self.khatmah).first()
+        reader = Participant.objects.filter(khatmah=self.khatmah).exclude(pk=self.khatmah.creator_id).first()
+        changes = [
+            lambda: self.client.post(reverse('khatmah-join', args=[self.khatmah.id]), {'name': 'Guest'}),
+            lambda: self.client.post(reverse('khatmah-claim', args=[self.khatmah.id]),
+                                     {'participant': str(reader.id), 'number': 20}, format='json'),
+            lambda: self.client.post(reverse('juzassignment-toggle-complete', args=[assignment.id])),
+            lambda: self.client.post(reverse('khatmah-remove-participant', args=[self.khatmah.id]),
+                                     {'participant_id': str(reader.id),
+                                      'creator_token': str(self.khatmah.creator_token)}, format='json'),
+        ]
+        for change in changes:
+            self.assertLess(change().status_code, 300)
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response['ETag'], etag)
+            etag = response['ETag']
+
+    def test_owner_and_public_views_have_distinct_etags(self):
+        public = self.assert_revalidates(self.url)
+        owner = self.assert_revalidates(self.url, creator_token=str(self.khatmah.creator_token))
+
+        self.assertNotEqual(public, owner)
+
+    def test_list_revalidates_until_a_khatmah_changes(self):
+        url = reverse('khatmah-list')
+        etag = self.assert_revalidates(url, page_size=5)
+
+        Participant.objects.create(name='Late reader', khatmah=self.khatmah)
+
+        self.assertEqual(self.client.get(url, {'page_size': 5}, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_if_modified_since(self):
+        first = self.client.get(self.url)
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+
+        self.assertEqual(response.status_code, 304)
+
+
+class ClaimTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.khatmah = Khatmah.objects.create(name='Ramadan')
+        self.reader = Participant.objects.create(name='Reader', khatmah=self.khatmah)
+        self.other = Participant.objects.create(name='Other', khatmah=self.khatmah)
+        self.url = reverse('khatmah-claim', args=[self.khatmah.id])
+
+    def test_claim_reports_won_and_taken_numbers(self):
+        JuzAssignment.objects.create(juz_number=2, participant=self.other, khatmah=self.khatmah)
+
+        response = self.client.post(
+            self.url, {'participant': str(self.reader.id), 'numbers': [1, 2, 3, 3]}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['claimed'], [1, 3])
+        self.assertEqual(response.data['taken'], [2])
+        self.assertEqual([a['juz_number'] for a in response.data['assignments']], [1, 3])
+        self.assertEqual(
+            set(self.reader.assignments.values_list('juz_number', flat=True)), {1, 3}
+        )
+
+    def test_claim_of_surahs_in_a_single_transaction(self):
+        # Savepoint, participant lookup, the insert, reading back the inserted
+        # keys, the progress version bump and the savepoint release
+        with self.assertNumQueries(6):
+            won, taken = assignments.claim(
+                self.khatmah.id, self.reader.id, Khatmah.SURAH_TYPE, list(range(1, 115))
+            )
+        self.assertEqual((len(won), taken), (114, []))
+
+    def test_invalid_claims_are_rejected(self):
+        stranger = Participant.objects.create(name='Stranger', khatmah=Khatmah.objects.create(name='Other'))
+        for body in ({'participant': str(self.reader.id), 'numbers': [31]},
+                     {'participant': str(self.reader.id)},
+                     {'participant': str(self.reader.id), 'number': 1, 'type': 'page'},
+                     {'participant': 'not-a-uuid', 'number': 1},
+                     {'participant': str(stranger.id), 'number': 1}):
+            response = self.client.post(self.url, body, format='json')
+            self.assertEqual(response.status_code, 400, body)
+
+    def test_create_rejects_an_assigned_juz(self):
+        url = reverse('juzassignment-list')
+        body = {'khatmah': str(self.khatmah.id), 'participant': str(self.reader.id), 'juz_number': 5}
+
+        first = self.client.post(url, body, format='json')
+        second = self.client.post(url, {**body, 'participant': str(self.other.id)}, format='json')
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(first.data['participant_name'], 'Reader')
+        self.assertEqual(second.status_code, 400)
+        self.assertEqual(second.data['error'], 'Juz 5 is already assigned in this khatmah')
+
+
+class KhatmahProgressTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.khatmah = Khatmah.objects.create(name='Ramadan')
+        self.reader = Participant.objects.create(name='Reader', khatmah=self.khatmah)
+        self.url = reverse('khatmah-progress', args=[self.khatmah.id])
+
+    def test_bitmaps_round_trip(self):
+        self.assertEqual(progress.encode_bitmap([]), '0')
+        self.assertEqual(progress.decode_bitmap(progress.encode_bitmap([1, 30, 114])), [1, 30, 114])
+
+    def test_progress_is_cached_until_the_next_assignment_change(self):
+        assignments.claim(self.khatmah.id, self.reader.id, Khatmah.JUZ_TYPE, [1, 2, 30])
+        assignment = JuzAssignment.objects.get(khatmah=self.khatmah, juz_number=2)
+
+        first = self.client.get(self.url).json()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).json(), first)
+        self.assertEqual(progress.decode_bitmap(first['assigned']), [1, 2, 30])
+        self.assertEqual(first['completed'], '0')
+        self.assertEqual((first['total'], first['assigned_count']), (30, 3))
+
+        self.client.post(reverse('juzassignment-toggle-complete', args=[assignment.id]))
+        second = self.client.get(self.url).json()
+
+        self.assertGreater(second['version'], first['version'])
+        self.assertEqual(progress.decode_bitmap(second['completed']), [2])
+
+        self.reader.delete()
+        third = self.client.get(self.url).json()
+        self.assertEqual((third['assigned'], third['assigned_count']), ('0', 0))
+
+    def test_changing_the_khatmah_type_drops_cached_progress(self):
+        self.assertEqual(self.client.get(self.url).json()['total'], 30)
+
+        self.khatmah.khatmah_type = Khatmah.SURAH_TYPE
+        self.khatmah.save()
+
+        data = self.client.get(self.url).json()
+        self.assertEqual((data['type'], data['total']), (Khatmah.SURAH_TYPE, 114))
+
+    def test_unknown_khatmah(self):
+        response = self.client.get(reverse('khatmah-progress', args=['00000000-0000-0000-0000-000000000000']))
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(KHATMAH_EVENTS_KEEPALIVE=1)
+class KhatmahEventTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.khatmah = Khatmah.objects.create(name='Ramadan')
+        self.reader = Participant.objects.create(name='Reader', khatmah=self.khatmah)
+        self.channel = str(self.khatmah.id)
+        broker_patch = mock.patch.object(events, '_broker', events.InProcessBroker(buffer_size=3))
+        self.broker = broker_patch.start()
+        self.addCleanup(broker_patch.stop)
+
+    def test_replay_resumes_after_last_event_id(self):
+        for n in range(1, 5):
+            self.broker.publish(self.channel, events.CLAIM, {'numbers': [n]})
+
+        self.assertEqual([e.id for e in self.broker.replay(self.channel, 2)], [3, 4])
+        self.assertEqual(self.broker.replay(self.channel, 4), [])
+        # Event 1 has left the three-event ring buffer
+        self.assertIsNone(self.broker.replay(self.channel, 0))
+        # Ids from before a restart
+        self.assertIsNone(self.broker.replay(self.channel, 9))
+
+    def test_views_publish_committed_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('khatmah-join', args=[self.khatmah.id]), {'name': 'Guest'}, format='json')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('khatmah-claim', args=[self.khatmah.id]),
+                             {'participant': str(self.reader.id), 'numbers': [4, 5]}, format='json')
+        assignment = JuzAssignment.objects.get(juz_number=4)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('juzassignment-toggle-complete', args=[assignment.id]))
+
+        published = self.broker.replay(self.channel, 0)
+        self.assertEqual([e.type for e in published], [events.JOIN, events.CLAIM, events.TOGGLE_COMPLETE])
+        self.assertEqual(published[0].data['participant']['name'], 'Guest')
+        self.assertEqual(published[1].data['numbers'], [4, 5])
+        self.assertEqual((published[2].data['number'], published[2].data['completed']), (4, True))
+
+    async def test_stream_replays_missed_events_then_live_ones(self):
+        self.broker.publish(self.channel, events.JOIN, {'participant': {'name': 'A'}})
+        self.broker.publish(self.channel, events.JOIN, {'participant': {'name': 'B'}})
+
+        epoch = self.broker.epoch
+        response = await self.async_client.get(
+            reverse('khatmah-events', args=[self.khatmah.id]), headers={'Last-Event-ID': f'{epoch}-1'}
+        )
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = aiter(response.streaming_content)
+
+        self.assertEqual(await anext(body), b'retry: 3000\n\n')
+        self.assertEqual(
+            await anext(body), f'id: {epoch}-2\nevent: join\ndata: {{"participant": {{"name": "B"}}}}\n\n'.encode()
+        )
+        self.broker.publish(self.channel, events.REMOVE_PARTICIPANT, {'participant': 'x'})
+        self.assertEqual(
+            await anext(body), f'id: {epoch}-3\nevent: remove_participant\ndata: {{"participant": "x"}}\n\n'.encode()
+        )
+        await body.aclose()
+
+    async def test_stream_resets_clients_that_missed_too_much(self):
+        response = await self.async_client.get(
+            reverse('khatmah-events', args=[self.khatmah.id]), {'last_event_id': f'{self.broker.epoch}-7'}
+        )
+        body = aiter(response.streaming_content)
+
+        await anext(body)
+        self.assertTrue((await anext(body)).startswith(b'event: reset\n'))
+        await body.aclose()
+
+    async def test_stream_resets_ids_from_another_process(self):
+        self.broker.publish(self.channel, events.JOIN, {'participant': {'name': 'A'}})
+        self.broker.publish(self.channel, events.JOIN, {'participant': {'name': 'B'}})
+
+        # A client of the previous process, whose counter had reached 1
+        for last_event_id in ('0123abcd-1', '1'):
+            response = await self.async_client.get(
+                reverse('khatmah-events', args=[self.khatmah.id]), headers={'Last-Event-ID': last_event_id}
+            )
+            body = aiter(response.streaming_content)
+
+            await anext(body)
+            self.assertTrue((await anext(body)).startswith(b'event: reset\n'))
+            await body.aclose()
+
+    def test_stream_needs_asgi(self):
+        response = self.client.get(reverse('khatmah-events', args=[self.khatmah.id]))
+
+        self.assertEqual(response.status_code, 501)
+
+    async def test_unknown_khatmah(self):
+        response = await self.async_client.get(
+            reverse('khatmah-events', args=['00000000-0000-0000-0000-000000000000'])
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class ConcurrentClaimTests(TransactionTestCase):
+    """Needs a database that accepts concurrent writers (PostgreSQL)"""
+
+    def test_parallel_claims_of_the_same_juz_have_one_winner(self):
+        khatmah = Khatmah.objects.create(name='Launch')
+        readers = [Participant.objects.create(name=f'Reader {i}', khatmah=khatmah) for i in range(8)]
+        barrier = threading.Barrier(len(readers))
+        results = {}
+        errors = []
+
+        def claim(reader):
+            try:
+                barrier.wait()
+                results[reader.id] = assignments.claim(khatmah.id, reader.id, Khatmah.JUZ_TYPE, [1, 2])
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=claim, args=(reader,)) for reader in readers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        won = [assignment.juz_number for won, _ in results.values() for assignment in won]
+        self.assertEqual(sorted(won), [1, 2])
+        self.assertEqual(JuzAssignment.objects.filter(khatmah=khatmah).count(), 2)
+
+
+@mock.patch('api.upstream.get', side_effect=AssertionError('upstream must not be called'))
+class LocalQuranTextTests(QuranStoreTestMixin, TestCase):
+    def test_juz_text_is_served_from_local_store(self, upstream):
+        response = self.client.get(reverse('juz-text', args=[1]))
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['juz_number'], 1)
+        ayahs = data['ayahs']
+        self.assertEqual(len(ayahs), 12)
+        self.assertEqual(ayahs[0]['number'], 1)
+        self.assertEqual(ayahs[0]['surah']['englishName'], 'Surah 1')
+        self.assertEqual(ayahs[-1]['surah']['number'], 4)
+        self.assertEqual(data['text'].count('## '), 4)
+        self.assertIn('quran-uthmani 1:1 (1)', data['text'])
+
+    def test_surah_text_is_served_from_local_store(self, upstream):
+        response = self.client.get(reverse('surah-text', args=[114]))
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['surah_name'], 'سورة 114')
+        self.assertEqual([a['numberInSurah'] for a in data['ayahs']], [1, 2, 3])
+        self.assertNotIn('surah', data['ayahs'][0])
+        self.assertTrue(data['text'].startswith('## سورة 114'))
+
+    def test_text_responses_are_revalidated_with_their_etag(self, upstream):
+        response = self.client.get(reverse('juz-text', args=[2]))
+
+        self.assertEqual(response.status_code, 200)
+        # A re-import changes the body at the same URL, so it is never immutable
+        self.assertEqual(response['Cache-Control'], 'public, max-age=86400')
+        self.assertTrue(response['ETag'].startswith('"'))
+
+    def test_matching_if_none_match_returns_not_modified(self, upstream):
+        url = reverse('surah-text', args=[2])
+        etag = self.client.get(url)['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_rendered_body_is_reused_across_requests(self, upstream):
+        first = quran.render_text('juz', 3)
+
+        with mock.patch.object(quran, 'format_juz_text', side_effect=AssertionError('re-rendered')):
+            response = self.client.get(reverse('juz-text', args=[3]))
+
+        self.assertIs(quran.render_text('juz', 3), first)
+        self.assertEqual(response.content, first.body)
+
+    def test_page_and_hizb_are_sliced_from_boundary_tables(self, upstream):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('quran-page', args=[2]))
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['page_number'], 2)
+        self.assertEqual((data['first'], data['last'], data['count']), ('2:3', '4:1', 5))
+        self.assertEqual(data['ayahs'][0]['surah']['number'], 2)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=86400')
+
+        data = self.client.get(reverse('quran-hizb', args=[1])).json()
+        self.assertEqual((data['first'], data['last'], data['count']), ('1:1', '4:3', 12))
+        data = self.client.get(reverse('quran-rub', args=[2])).json()
+        self.assertEqual((data['first'], data['last']), ('2:1', '2:3'))
+        self.assertEqual(self.client.get(reverse('quran-page', args=[999])).status_code, 404)
+
+    def test_ayah_by_number_or_verse_key(self, upstream):
+        response = self.client.get(reverse('quran-ayah', args=['2:3']))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['number'], 6)
+        self.assertEqual(response.json()['verse_key'], '2:3')
+        self.assertEqual(self.client.get(reverse('quran-ayah', args=['6'])).content, response.content)
+        for ref in ('2:4', '0', '343', 'x'):
+            self.assertEqual(self.client.get(reverse('quran-ayah', args=[ref])).status_code, 404, ref)
+
+    def test_ayah_range(self, upstream):
+        url = reverse('quran-ayahs')
+
+        data = self.client.get(url, {'from': '1:3', 'to': '2:2'}).json()
+        self.assertEqual([a['number'] for a in data['ayahs']], [3, 4, 5])
+        self.assertEqual((data['first'], data['last']), ('1:3', '2:2'))
+        self.assertEqual(data['text'].count('## '), 2)
+
+        self.assertEqual(self.client.get(url, {'from': '2:2', 'to': '1:3'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'from': '1:3'}).status_code, 400)
+        with override_settings(QURAN_RANGE_MAX_AYAHS=2):
+            self.assertEqual(self.client.get(url, {'from': '1:3', 'to': '2:2'}).status_code, 400)
+
+    def test_text_is_packed_into_a_shared_mapping(self, upstream):
+        text = quran.get_edition()
+
+        self.assertIsInstance(text.texts, quran_pack.PackedText)
+        with open(quran.edition_path(quran.DEFAULT_EDITION), encoding='utf-8') as f:
+            self.assertNotIn('quran-uthmani 1:1', f.read())
+        self.assertEqual(text.ayah_text(3), 'quran-uthmani 2:1')
+
+        slices = text.text_slices(3, 5)
+        self.assertEqual([bytes(s) for s in slices], [b'quran-uthmani 2:1', b'quran-uthmani 2:2'])
+        self.assertIsInstance(slices[0].obj, mmap.mmap)
+        self.assertEqual(bytes(text.texts.view(3, 5)), b'quran-uthmani 2:1quran-uthmani 2:2')
+
+    def test_reimport_replaces_packed_text(self, upstream):
+        old_text = quran.get_edition()
+        dump = make_quran_dump()
+        dump['data']['surahs'][0]['ayahs'][0]['text'] = 'بِسْمِ ٱللَّهِ'
+        source = os.path.join(self.data_dir, 'edited.json')
+        with open(source, 'w', encoding='utf-8') as f:
+            json.dump(dump, f, ensure_ascii=False)
+
+        call_command('import_quran', source, stdout=io.StringIO())
+
+        self.assertEqual(quran.get_edition().ayah_text(0), 'بِسْمِ ٱللَّهِ')
+        self.assertEqual(len([name for name in os.listdir(self.data_dir) if name.endswith('.bin')]), 1)
+        # Still mapped by whoever holds the previous edition
+        self.assertEqual(old_text.ayah_text(0), 'quran-uthmani 1:1')
+
+    def test_reimport_by_another_process_is_picked_up(self, upstream):
+        url = reverse('surah-text', args=[1])
+        before = self.client.get(url)
+        dump = make_quran_dump()
+        dump['data']['surahs'][0]['ayahs'][0]['text'] = 'بِسْمِ ٱللَّهِ'
+
+        # Another process imports without resetting this one's editions
+        path = quran.store_edition(quran.pack_edition(dump['data']))
+        revision = quran.get_edition().revision
+        os.utime(path, ns=(revision + 10**9, revision + 10**9))
+        after = self.client.get(url)
+
+        self.assertEqual(after.json()['ayahs'][0]['text'], 'بِسْمِ ٱللَّهِ')
+        self.assertNotEqual(after['ETag'], before['ETag'])
+        self.assertEqual(quran.get_edition().revision, revision + 10**9)
+        self.assertEqual([key[3] for key in quran._rendered], [revision + 10**9])
+
+    def test_editions_imported_with_inline_text_still_load(self, upstream):
+        packed = quran.pack_edition(make_quran_dump()['data'])
+        packed['edition'] = quran.DEFAULT_EDITION
+        with open(quran.edition_path(quran.DEFAULT_EDITION), 'w', encoding='utf-8') as f:
+            json.dump(packed, f, ensure_ascii=False)
+        quran.reset_editions()
+
+        response = self.client.get(reverse('surah-text', args=[2]))
+
+        self.assertEqual(response.json()['ayahs'][0]['text'], 'quran-uthmani 2:1')
+        self.assertIsInstance(quran.get_edition().texts, list)
+
+    @override_settings(QURAN_UPSTREAM_FALLBACK=False)
+    def test_missing_edition_without_fallback_is_unavailable(self, upstream):
+        os.remove(quran.edition_path(quran.DEFAULT_EDITION))
+        quran.reset_editions()
+
+        response = self.client.get(reverse('juz-text', args=[1]))
+
+        self.assertEqual(response.status_code, 503)
+
+    def test_import_rejects_incomplete_dump(self, upstream):
+        dump = make_quran_dump()
+        del dump['data']['surahs'][-1]
+        source = os.path.join(self.data_dir, 'broken.json')
+        with open(source, 'w', encoding='utf-8') as f:
+            json.dump(dump, f)
+
+        with self.assertRaisesMessage(Exception, 'Expected 114 surahs'):
+            call_command('import_quran', source)
+
+
+@mock.patch('api.upstream.get', side_effect=AssertionError('upstream must not be called'))
+class QuranTranslationTests(QuranStoreTestMixin, TestCase):
+    editions = ('quran-uthmani', 'en.sahih', 'fr.hamidullah')
+
+    def test_editions_are_merged_into_each_ayah(self, upstream):
+        response = self.client.get(reverse('surah-text', args=[2]), {'editions': 'en.sahih,fr.hamidullah,en.sahih'})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['editions'], ['en.sahih', 'fr.hamidullah'])
+        self.assertEqual(data['ayahs'][0]['text'], 'quran-uthmani 2:1')
+        self.assertEqual(data['ayahs'][0]['translations'], {
+            'en.sahih': 'en.sahih 2:1', 'fr.hamidullah': 'fr.hamidullah 2:1',
+        })
+
+        data = self.client.get(reverse('quran-page', args=[2]), {'editions': 'fr.hamidullah'}).json()
+        self.assertEqual(data['ayahs'][-1]['translations'], {'fr.hamidullah': 'fr.hamidullah 4:1'})
+        data = self.client.get(reverse('juz-text', args=[1]), {'editions': 'en.sahih'}).json()
+        self.assertEqual(data['ayahs'][0]['translations'], {'en.sahih': 'en.sahih 1:1'})
+        # Without ?editions= the body is the one rendered for the text alone
+        self.assertEqual(self.client.get(reverse('surah-text', args=[2])).content, quran.render_text('surah', 2).body)
+
+    def test_unknown_or_malformed_editions(self, upstream):
+        url = reverse('juz-text', args=[1])
+
+        self.assertEqual(self.client.get(url, {'editions': 'de.missing'}).status_code, 404)
+        self.assertEqual(self.client.get(reverse('quran-hizb', args=[1]), {'editions': 'de.missing'}).status_code, 404)
+        self.assertEqual(self.client.get(url, {'editions': '../en.sahih'}).status_code, 400)
+        with override_settings(QURAN_MAX_EDITIONS_PER_REQUEST=1):
+            self.assertEqual(self.client.get(url, {'editions': 'en.sahih,fr.hamidullah'}).status_code, 400)
+
+    def test_editions_load_lazily_and_least_recently_used_are_dropped(self, upstream):
+        quran.reset_editions()
+        quran.render_text('surah', 1)
+        self.assertEqual(quran.loaded_editions(), ['quran-uthmani'])
+
+        size = quran.get_edition('en.sahih').memory_size
+        quran.reset_editions()
+        # Room for two editions of this size
+        with override_settings(QURAN_EDITIONS_MEMORY_MB=(2.5 * size) / (1024 * 1024)):
+            self.client.get(reverse('surah-text', args=[1]), {'editions': 'en.sahih'})
+            self.assertCountEqual(quran.loaded_editions(), ['quran-uthmani', 'en.sahih'])
+
+            response = self.client.get(reverse('surah-text', args=[1]), {'editions': 'fr.hamidullah'})
+
+            self.assertCountEqual(quran.loaded_editions(), ['quran-uthmani', 'fr.hamidullah'])
+            self.assertEqual(response.json()['ayahs'][0]['translations'], {'fr.hamidullah': 'fr.hamidullah 1:1'})
+
+    def test_rendered_bodies_and_search_index_count_against_the_budget(self, upstream):
+        body = quran.render_text('juz', 1).body
+        quran.reset_editions()
+        text = quran.get_edition()
+        size = text.memory_size
+        quran_search.get_index()
+        self.assertGreater(text.memory_size, size)
+
+        # Room for the edition and one juz body
+        with override_settings(QURAN_EDITIONS_MEMORY_MB=(text.memory_size + len(body)) / (1024 * 1024)):
+            quran.render_text('juz', 1)
+            second = quran.render_text('juz', 2)
+
+        self.assertEqual([key[:3] for key in quran._rendered], [('juz', 1, 'quran-uthmani')])
+        self.assertEqual(text.memory_size, size + quran_search.get_index().memory_size + len(body))
+        self.assertEqual(self.client.get(reverse('juz-text', args=[2])).content, second.body)
+
+
+class QuranSearchTests(QuranStoreTestMixin, TestCase):
+    # (surah, ayah) -> Uthmani text; every other ayah keeps its synthetic text
+    texts = {
+        (1, 1): 'بِسْمِ ٱللَّهِ ٱلرَّحْمَٰنِ ٱلرَّحِيمِ',
+        (1, 2): 'ٱلْحَمْدُ لِلَّهِ رَبِّ ٱلْعَٰلَمِينَ',
+        (1, 3): 'ٱلرَّحْمَٰنِ ٱلرَّحِيمِ',
+        (2, 2): 'ذَٰلِكَ ٱلْكِتَٰبُ لَا رَيْبَ ۛ فِيهِ ۛ هُدًى لِّلْمُتَّقِينَ',
+        (2, 3): 'ٱلَّذِينَ يُؤْمِنُونَ بِٱلْغَيْبِ وَيُقِيمُونَ ٱلصَّلَوٰةَ',
+    }
+
+    def make_dump(self, edition):
+        dump = make_quran_dump(edition)
+        dump['data']['surahs'][1].update(name='سُورَةُ ٱلْبَقَرَةِ', englishName='Al-Baqara')
+        for surah in dump['data']['surahs']:
+            for ayah in surah['ayahs']:
+                ayah['text'] = self.texts.get((surah['number'], ayah['numberInSurah']), ayah['text'])
+        return dump
+
+    def search(self, q, **params):
+        return self.client.get(reverse('quran-search'), {'q': q, **params})
+
+    def test_normalization_strips_tashkeel_and_folds_letters(self):
+        self.assertEqual(quran_search.normalize('ٱلْحَمْدُ'), 'الحمد')
+        self.assertEqual(quran_search.normalize('إِيمَانٌ'), 'ايمان')
+        self.assertEqual(quran_search.normalize('ٱلصَّلَوٰةَ'), 'الصلواه')
+        self.assertEqual(quran_search.normalize('عَلَىٰ'), 'عليا')
+        self.assertEqual(quran_search.normalize('ۛ'), '')
+        self.assertEqual(quran_search.word_forms('ٱلرَّحْمَٰنِ'), ('الرحمان', 'الرحمن'))
+
+    def test_search_ignores_diacritics_and_ranks_results(self):
+        response = self.search('الرحمن')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['count'], 2)
+        # The shorter ayah ranks first
+        self.assertEqual([r['verse_key'] for r in data['results']], ['1:3', '1:1'])
+        self.assertEqual(data['results'][0]['highlights'], [0])
+        self.assertEqual(data['results'][1]['highlights'], [2])
+        self.assertEqual(data['results'][1]['surah']['number'], 1)
+
+        self.assertEqual(self.search('الكتاب').json()['results'][0]['verse_key'], '2:2')
+
+    def test_every_word_must_match(self):
+        self.assertEqual([r['verse_key'] for r in self.search('الرحمن بسم').json()['results']], ['1:1'])
+        self.assertEqual(self.search('الرحمن الحمد').json()['count'], 0)
+
+    def test_phrase_keeps_word_order_across_pause_marks(self):
+        self.assertEqual(self.search('"الرحيم الرحمن"').json()['count'], 0)
+        self.assertEqual(self.search('"الرحمن الرحيم"').json()['count'], 2)
+
+        results = self.search('"ريب فيه هدى"').json()['results']
+        self.assertEqual([r['verse_key'] for r in results], ['2:2'])
+        # Word indexes of text.split(' '), skipping the pause marks
+        self.assertEqual(results[0]['highlights'], [3, 5, 7])
+
+    def test_prefix_query(self):
+        results = self.search('الرح*').json()['results']
+
+        self.assertEqual(sorted(r['verse_key'] for r in results), ['1:1', '1:3'])
+        self.assertEqual(self.search('ا*').status_code, 400)
+
+    def test_paging_and_bad_queries(self):
+        response = self.search('الرحيم', page=2, size=1)
+        self.assertEqual(response.json()['count'], 2)
+        self.assertEqual([r['verse_key'] for r in response.json()['results']], ['1:1'])
+
+        self.assertEqual(self.search('ۛ ').status_code, 400)
+        self.assertEqual(self.search('الرحيم', size=0).status_code, 400)
+        self.assertEqual(self.search('الرحيم', edition='../quran-uthmani').status_code, 404)
+
+    def test_suggest_completes_words_by_frequency(self):
+        response = self.client.get(reverse('quran-suggest'), {'q': 'بسم الر'})
+
+        self.assertEqual(response.status_code, 200)
+        words = response.json()['words']
+        # الرحمن and الرحيم occur twice, الرحمان (the dagger alef spelling) too
+        self.assertEqual([w['text'] for w in words], ['الرحمان', 'الرحمن', 'الرحيم'])
+        self.assertEqual(words[0]['count'], 2)
+
+        words = self.client.get(reverse('quran-suggest'), {'q': 'ا', 'limit': 2}).json()['words']
+        self.assertEqual(len(words), 2)
+        self.assertEqual(quran_search.get_index().suggester.words('ا', 2), [(w['text'], w['count']) for w in words])
+
+    def test_suggest_completes_surah_names(self):
+        def surahs(q):
+            return [s['number'] for s in self.client.get(reverse('quran-suggest'), {'q': q}).json()['surahs']]
+
+        self.assertEqual(surahs('البق'), [2])
+        self.assertEqual(surahs('بقر'), [2])
+        self.assertEqual(surahs('al-baq'), [2])
+        self.assertEqual(surahs('Baq'), [2])
+        self.assertEqual(surahs('surah 11'), [11, 110, 111, 112, 113, 114])
+        self.assertEqual(surahs(''), [])
+
+    def test_index_is_written_at_import_and_rebuilt_if_missing(self):
+        path = quran_search.index_path(quran.DEFAULT_EDITION)
+        self.assertTrue(os.path.exists(path))
+        index = quran_search.get_index()
+        self.assertIs(quran_search.get_index(), index)
+
+        os.remove(path)
+        quran.reset_editions()
+        rebuilt = quran_search.get_index()
+
+        self.assertIsNot(rebuilt, index)
+        self.assertEqual(rebuilt.postings, index.postings)
+
+
+class UpstreamFallbackTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.stub = upstream_stub.StubQuranUpstream().start()
+        cls.addClassCleanup(cls.stub.stop)
+
+    def setUp(self):
+        cache.clear()
+        self.stub.request_count = self.stub.connection_count = 0
+        # An empty store, so every text request goes upstream
+        self.data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir)
+        settings_override = override_settings(QURAN_DATA_DIR=self.data_dir, QURAN_API_BASE_URL=self.stub.base_url)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(quran.reset_editions)
+
+    async def test_fallback_reuses_one_pooled_client(self):
+        juz = await self.async_client.get(reverse('juz-text', args=[2]))
+        client = upstream.get_client()
+        surah = await self.async_client.get(reverse('surah-text', args=[5]))
+
+        self.assertIs(upstream.get_client(), client)
+        await upstream.close_client()
+        self.assertEqual(self.stub.request_count, 2)
+        self.assertEqual(self.stub.connection_count, 1)
+        self.assertEqual(juz.status_code, 200)
+        self.assertEqual(juz.json()['ayahs'][0]['surah']['number'], 5)
+        self.assertEqual(surah.json()['surah_name'], 'سورة 5')
+        self.assertTrue(surah.json()['text'].startswith('## سورة 5'))
+
+    def test_each_wsgi_request_closes_its_client(self):
+        clients = []
+        get_client = upstream.get_client
+
+        def recording_get_client():
+            clients.append(get_client())
+            return clients[-1]
+
+        with mock.patch.object(upstream, 'get_client', recording_get_client):
+            for number in (2, 3):
+                self.assertEqual(self.client.get(reverse('juz-text', args=[number])).status_code, 200)
+
+        self.assertEqual(len(set(clients)), 2)
+        self.assertTrue(all(client.is_closed for client in clients))
+
+    def test_unreachable_upstream_is_a_bad_gateway(self):
+        with override_settings(QURAN_API_BASE_URL='http://127.0.0.1:9/v1'):
+            response = self.client.get(reverse('juz-text', args=[1]))
+
+        self.assertEqual(response.status_code, 502)
+
+    def test_text_views_keep_drf_method_and_throttle_checks(self):
+        url = reverse('surah-text', args=[1])
+        self.assertEqual(self.client.post(url).status_code, 405)
+
+        with mock.patch.object(AnonRateThrottle, 'THROTTLE_RATES', {'anon': '1/day', 'user': '1/day'}):
+            self.assertEqual(self.client.get(url).status_code, 200)
+            throttled = self.client.get(url)
+
+        self.assertEqual(throttled.status_code, 429)
+        self.assertIn('Retry-After', throttled)
+
+    def test_text_views_throttle_signed_in_users_at_the_user_rate(self):
+        url = reverse('surah-text', args=[1])
+        token = AccessToken.for_user(User.objects.create_user('reader'))
+
+        with mock.patch.object(AnonRateThrottle, 'THROTTLE_RATES', {'anon': '1/day', 'user': '1/day'}):
+            responses = [self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}') for _ in range(2)]
+            invalid = self.client.get(url, HTTP_AUTHORIZATION='Bearer invalid')
+
+        self.assertEqual([response.status_code for response in responses], [200, 200])
+        self.assertEqual(invalid.status_code, 401)
+
+    async def test_concurrent_identical_fetches_share_one_request(self):
+        results = await asyncio.gather(*(upstream.fetch_data('juz/3/quran-uthmani') for _ in range(10)))
+        cached = await upstream.fetch_data('juz/3/quran-uthmani')
+        await upstream.close_client()
+
+        self.assertEqual(self.stub.request_count, 1)
+        self.assertTrue(all(result == cached for result in results))
+        self.assertEqual(cached['number'], 3)
+
+    async def test_stale_answer_is_served_while_refreshed(self):
+        await upstream.fetch_data('surah/7/quran-uthmani')
+        with override_settings(UPSTREAM_FRESH_TTL=0):
+            stale = await upstream.fetch_data('surah/7/quran-uthmani')
+            self.assertEqual(self.stub.request_count, 1)
+            await asyncio.gather(*upstream._flights[asyncio.get_running_loop()].values())
+        await upstream.close_client()
+
+        self.assertEqual(stale['number'], 7)
+        self.assertEqual(self.stub.request_count, 2)
+
+    async def test_stale_answer_is_refreshed_inline_without_a_long_lived_loop(self):
+        url = upstream.quran_api_url('surah/7/quran-uthmani')
+        api_cache.set('quran-upstream', url, (0, {'number': 7, 'from': 'old'}))
+
+        fresh = await upstream.fetch_data('surah/7/quran-uthmani', background_refresh=False)
+        await upstream.close_client()
+
+        self.assertNotIn('from', fresh)
+        self.assertEqual(self.stub.request_count, 1)
+
+    async def test_failed_refresh_keeps_the_stale_answer_and_is_logged(self):
+        url = upstream.quran_api_url('juz/99/quran-uthmani')
+        api_cache.set('quran-upstream', url, (0, {'number': 99}))
+
+        with self.assertLogs('api.upstream', 'WARNING') as logs:
+            stale = await upstream.fetch_data('juz/99/quran-uthmani')
+            await asyncio.gather(*upstream._flights[asyncio.get_running_loop()].values(), return_exceptions=True)
+            await asyncio.sleep(0)
+            self.assertEqual(await upstream.fetch_data('juz/99/quran-uthmani', background_refresh=False), stale)
+        await upstream.close_client()
+
+        self.assertEqual(stale, {'number': 99})
+        self.assertEqual(len(logs.output), 2)
+        self.assertIn('juz/99', logs.output[0])
+
+    async def test_failures_are_shared_but_not_cached(self):
+        for _ in range(2):
+            results = await asyncio.gather(
+                *(upstream.fetch_data('juz/99/quran-uthmani') for _ in range(3)), return_exceptions=True
+            )
+            self.assertTrue(all(isinstance(result, upstream.UpstreamError) for result in results))
+        await upstream.close_client()
+
+        self.assertEqual(self.stub.request_count, 2)
+        self.assertIn('404', results[0].error)
+
+    @override_settings(UPSTREAM_CACHE_LOCK=True)
+    async def test_cache_lock_waits_for_the_worker_holding_it(self):
+        url = upstream.quran_api_url('surah/9/quran-uthmani')
+        api_cache.add('quran-upstream-lock', url, True)
+
+        async def other_worker():
+            await asyncio.sleep(0.1)
+            api_cache.set('quran-upstream', url, (datetime.now().timestamp(), {'number': 9, 'from': 'peer'}))
+            api_cache.delete('quran-upstream-lock', url)
+
+        data, _ = await asyncio.gather(upstream.fetch_data('surah/9/quran-uthmani'), other_worker())
+
+        self.assertEqual(data['from'], 'peer')
+        self.assertEqual(self.stub.request_count, 0)
+
+
+class HijriCalendarCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        api_cache.reset_stats()
+        self.client = APIClient()
+        self.month = create_month()
+        HijriEvent.objects.create(title_ar='رأس السنة', day=1, month=self.month, is_holiday=True)
+        AstronomicalEvent.objects.create(
+            title_ar='محاق', date=date(2024, 7, 8), time=time(21, 1), month=self.month
+        )
+        self.url = reverse('hijri-calendar')
+        self.params = {'month_number': 1, 'year': 1446}
+
+    def test_calendar_payload_is_served_from_cache(self):
+        first = self.client.get(self.url, self.params)
+
+        # Only the month lookup remains once the payload is cached
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url, self.params)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(len(second.json()['calendar'][0]['events']), 1)
+        self.assertEqual(len(second.json()['calendar'][1]['astronomical_events']), 1)
+
+    def test_event_changes_invalidate_cached_calendar(self):
+        self.client.get(self.url, self.params)
+
+        HijriEvent.objects.create(title_ar='عاشوراء', day=10, month=self.month)
+        response = self.client.get(self.url, self.params)
+
+        self.assertEqual(len(response.json()['events']), 2)
+        self.assertEqual(len(response.json()['calendar'][9]['events']), 1)
+
+    def test_cache_stats_report_hits_and_misses(self):
+        self.client.get(self.url, self.params)
+        self.client.get(self.url, self.params)
+        self.assertEqual(self.client.get(reverse('cache-stats')).status_code, 401)
+
+        self.client.force_authenticate(User.objects.create_user('staff', is_staff=True))
+        response = self.client.get(reverse('cache-stats'))
+
+        self.assertEqual(response.status_code, 200)
+        counters = response.data['namespaces']['hijri-calendar']
+        self.assertEqual((counters['hits'], counters['misses']), (1, 1))
+        self.assertEqual(counters['hit_rate'], 0.5)
+
+
+class QiblaDirectionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        api_cache.reset_stats()
+
+    def test_exact_direction_is_computed_without_the_cache(self):
+        url = reverse('qibla-direction', args=['51.5074', '-0.1278'])
+
+        first = self.client.get(url).json()
+        second = self.client.get(url).json()
+
+        self.assertEqual(first, second)
+        self.assertAlmostEqual(first['direction'], 118.99, places=1)
+        self.assertNotIn('qibla', api_cache.stats()['namespaces'])
+
+
+class QiblaGridTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.grid = qibla.BearingGrid(max_tiles=4)
+
+    def test_interpolated_bearings_stay_within_documented_error(self):
+        points = [(51.5074, -0.1278), (-33.8688, 151.2093), (40.7128, -74.006), (3.139, 101.6869),
+                  (64.1466, -21.9426), (-54.8019, -68.303), (0.0, 0.0), (89.99, 179.99)]
+        for lat, lng in points:
+            error = abs(self.grid.direction(lat, lng) - qibla.qibla_direction(lat, lng))
+            self.assertLess(min(error, 360 - error), qibla.GRID_MAX_ERROR_DEGREES, (lat, lng))
+
+    def test_tiles_near_the_kaaba_use_the_exact_formula(self):
+        for lat, lng in [(21.5, 39.9), (22.9, 40.99), (-21.4, -140.1)]:
+            self.assertEqual(self.grid.direction(lat, lng), qibla.qibla_direction(lat, lng))
+        self.assertEqual(len(self.grid), 0)
+
+    def test_tiles_are_evicted_least_recently_used_first(self):
+        for lng in range(5):
+            self.grid.direction(10.5, lng + 0.5)
+        self.assertEqual(len(self.grid), 4)
+        self.assertNotIn((10, 0), self.grid._tiles)
+        self.assertIn((10, 4), self.grid._tiles)
+
+    @override_settings(QIBLA_GRID_ENABLED=True)
+    def test_endpoint_uses_grid_unless_exact_is_requested(self):
+        url = reverse('qibla-direction', args=['51.5074', '-0.1278'])
+
+        grid = self.client.get(url).json()
+        exact = self.client.get(url, {'exact': 'true'}).json()
+
+        self.assertEqual(grid['method'], 'grid')
+        self.assertEqual(exact['method'], 'exact')
+        self.assertAlmostEqual(grid['direction'], exact['direction'], places=1)
+
+    def test_out_of_range_coordinates_are_rejected(self):
+        response = self.client.get(reverse('qibla-direction', args=['91', '0']))
+        self.assertEqual(response.status_code, 400)
+
+
+class MonthResolverTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        # Two months with a gap from 2024-08-06 to 2024-08-16 between them
+        self.muharram = create_month(number=1, start=date(2024, 7, 7), days=30)
+        self.rabi = create_month(number=3, start=date(2024, 8, 17), days=29, name_en="Rabi' al-Awwal")
+
+    def test_containing_month(self):
+        self.assertEqual(hijri.month_resolver.containing(date(2024, 7, 7)), self.muharram.id)
+        self.assertEqual(hijri.month_resolver.containing(date(2024, 8, 5)), self.muharram.id)
+        self.assertEqual(hijri.month_resolver.containing(date(2024, 8, 20)), self.rabi.id)
+        self.assertIsNone(hijri.month_resolver.containing(date(2024, 8, 10)))
+
+    def test_nearest_month_outside_known_ranges(self):
+        nearest = hijri.month_resolver.nearest
+        self.assertEqual(nearest(date(2024, 8, 7)), self.muharram.id)
+        self.assertEqual(nearest(date(2024, 8, 14)), self.rabi.id)
+        # Equidistant from both months: the past month wins
+        self.assertEqual(nearest(date(2024, 8, 11)), self.muharram.id)
+        self.assertEqual(nearest(date(2020, 1, 1)), self.muharram.id)
+        self.assertEqual(nearest(date(2030, 1, 1)), self.rabi.id)
+
+    def test_lookups_do_not_query_the_database_once_loaded(self):
+        hijri.month_resolver.nearest(date(2024, 7, 10))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(hijri.month_resolver.nearest(date(2024, 8, 20)), self.rabi.id)
+
+    def test_saving_a_month_reloads_intervals(self):
+        hijri.month_resolver.nearest(date(2024, 7, 10))
+
+        safar = create_month(number=2, start=date(2024, 8, 6), days=11, name_en='Safar')
+
+        self.assertEqual(hijri.month_resolver.containing(date(2024, 8, 10)), safar.id)
+
+    def test_calendar_by_gregorian_date_uses_resolver(self):
+        params = {'gregorian_date': '2024-08-20'}
+        first = self.client.get(reverse('hijri-calendar'), params)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('hijri-calendar'), params)
+
+        self.assertEqual(first.json()['month']['id'], str(self.rabi.id))
+        self.assertEqual(second.json(), first.json())
+
+    def test_current_month_falls_back_to_nearest(self):
+        response = self.client.get(reverse('hijrimonth-current'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['id'], str(self.rabi.id))
+
+
+class HijriCalendarShapeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('hijri-calendar')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.month = create_month()
+            self.ashura = HijriEvent.objects.create(title_ar='عاشوراء', day=10, month=self.month)
+            HijriEvent.objects.create(title_ar='حدث', day=10, month=self.month)
+            AstronomicalEvent.objects.create(
+                title_ar='محاق', date=date(2024, 7, 8), time=time(21, 1), month=self.month
+            )
+        # Load the month intervals so only the payload read is measured
+        hijri.month_resolver.nearest(date(2024, 7, 16))
+
+    def test_materialized_payload_is_read_without_queries(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'gregorian_date': '2024-07-16'})
+
+        day = response.json()['calendar'][9]
+        self.assertEqual(day['hijri_day'], 10)
+        self.assertEqual(len(day['events']), 2)
+        self.assertEqual(len(response.json()['events']), 2)
+
+    def test_compact_shape_references_events_by_id(self):
+        response = self.client.get(self.url, {'gregorian_date': '2024-07-16', 'shape': 'compact'})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data['events']), 2)
+        self.assertIn(str(self.ashura.id), data['calendar'][9]['event_ids'])
+        self.assertNotIn('events', data['calendar'][9])
+        self.assertEqual(len(data['calendar'][1]['astronomical_event_ids']), 1)
+        self.assertEqual(data['calendar'][0]['event_ids'], [])
+
+    def test_unknown_shape_is_rejected(self):
+        response = self.client.get(self.url, {'shape': 'tiny'})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_event_change_rematerializes_payload(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ashura.delete()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'gregorian_date': '2024-07-16'})
+        self.assertEqual(len(response.json()['calendar'][9]['events']), 1)
+
+
+def make_year_file(year=1447, start=date(2025, 6, 27)):
+    """A two-month year file with one event and one astronomical event"""
+    return {
+        'year': year,
+        'months': [
+            {
+                'number': 1, 'name_ar': 'محرم', 'name_en': 'Muharram',
+                'gregorian_start': start.isoformat(), 'gregorian_end': (start + timedelta(days=29)).isoformat(),
+                'events': [
+                    {'title_ar': 'رأس السنة', 'day': 1, 'is_holiday': True},
+                    {'title_ar': 'عاشوراء', 'day': 10},
+                ],
+                'astronomical_events': [
+                    {'title_ar': 'محاق', 'date': (start + timedelta(days=1)).isoformat(), 'time': '21:01'},
+                ],
+            },
+            {
+                'number': 2, 'name_ar': 'صفر', 'name_en': 'Safar',
+                'gregorian_start': (start + timedelta(days=30)).isoformat(),
+                'gregorian_end': (start + timedelta(days=58)).isoformat(),
+            },
+        ],
+    }
+
+
+class HijriYearLoadTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir)
+
+    def load(self, data, *args):
+        path = os.path.join(self.data_dir, f"{data['year']}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        call_command('load_hijri_year', path, *args, stdout=io.StringIO())
+
+    def test_shipped_year_files_load(self):
+        call_command('load_hijri_year', stdout=io.StringIO())
+
+        self.assertEqual(HijriMonth.objects.filter(year=1446).count(), 12)
+        ramadan = HijriMonth.objects.get(year=1446, number=9)
+        self.assertEqual(ramadan.gregorian_start, date(2025, 3, 2))
+        self.assertEqual(len(ramadan.calendar_data['gregorian_dates']), 29)
+        self.assertTrue(HijriEvent.objects.filter(month__year=1446).exists())
+
+    def test_load_is_a_handful_of_queries(self):
+        data = make_year_file()
+        data['months'][1]['events'] = [{'title_ar': f'حدث {day}', 'day': day} for day in range(1, 30)]
+
+        # Month upsert and id read-back, per event table the stale-row lookup
+        # and one upsert, and the lookup of computed months to refit; the
+        # rest are savepoints
+        with self.assertNumQueries(11):
+            hijri_data.load_year(data)
+
+        self.assertEqual(HijriEvent.objects.count(), 31)
+
+    def test_reload_updates_in_place_and_drops_removed_events(self):
+        self.load(make_year_file())
+        ids = set(HijriEvent.objects.values_list('id', flat=True))
+        month_id = HijriMonth.objects.get(year=1447, number=1).id
+
+        data = make_year_file()
+        data['months'][0]['name_en'] = 'Muharram al-Haram'
+        data['months'][0]['events'][0]['is_holiday'] = False
+        del data['months'][0]['events'][1]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.load(data)
+
+        month = HijriMonth.objects.get(year=1447, number=1)
+        self.assertEqual((month.id, month.name_en), (month_id, 'Muharram al-Haram'))
+        event = HijriEvent.objects.get()
+        self.assertIn(event.id, ids)
+        self.assertFalse(event.is_holiday)
+        # The materialized calendar and the month resolver follow the load
+        payload = hijri.get_month_calendar(month.id)
+        self.assertEqual(payload['month']['name_en'], 'Muharram al-Haram')
+        self.assertEqual(len(payload['events']), 1)
+        self.assertEqual(hijri.month_resolver.containing(date(2025, 7, 30)), HijriMonth.objects.get(number=2).id)
+
+    def test_invalid_file_is_rejected_with_every_problem(self):
+        data = make_year_file()
+        data['months'][0]['events'][0]['day'] = 31
+        data['months'][1]['gregorian_end'] = '2025-09-30'
+        data['months'][1]['colour'] = 'green'
+
+        with self.assertRaises(CommandError) as raised:
+            self.load(data)
+
+        message = str(raised.exception)
+        self.assertIn('months[0].events[0].day: must be between 1 and 30', message)
+        self.assertIn('months[1]: a Hijri month has 29 or 30 days', message)
+        self.assertIn('months[1]: unknown field "colour"', message)
+        self.assertFalse(HijriMonth.objects.exists())
+
+    def test_dry_run_only_validates(self):
+        self.load(make_year_file(), '--dry-run')
+
+        self.assertFalse(HijriMonth.objects.exists())
+
+
+class HijriTabularTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def assert_contiguous(self):
+        ranges = list(HijriMonth.objects.order_by('gregorian_start').values_list('gregorian_start', 'gregorian_end'))
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(start, end + timedelta(days=1))
+
+    def test_conversion(self):
+        self.assertEqual(hijri_tabular.to_gregorian(1, 1, 1), date(622, 7, 19))
+        self.assertEqual(hijri_tabular.to_hijri(date(2024, 3, 11)), (1445, 9, 1))
+        self.assertEqual(hijri_tabular.to_hijri(date(2025, 6, 26)), (1446, 12, 29))
+        self.assertEqual([hijri_tabular.month_length(1446, 12), hijri_tabular.month_length(1447, 12)], [29, 30])
+        for ordinal in range(date(2020, 1, 1).toordinal(), date(2030, 1, 1).toordinal()):
+            day = date.fromordinal(ordinal)
+            self.assertEqual(hijri_tabular.to_gregorian(*hijri_tabular.to_hijri(day)), day)
+        with self.assertRaises(ValueError):
+            hijri_tabular.to_gregorian(1447, 2, 30)
+
+    def test_computed_months_fit_around_sighted_ones(self):
+        # Sighted a day after the tabular 1 Muharram 1446 (2024-07-08)
+        sighted = create_month(number=1, year=1446, start=date(2024, 7, 9), days=30)
+
+        call_command('generate_hijri_calendar', '--from-year', '1445', '--to-year', '1447', stdout=io.StringIO())
+
+        self.assertEqual(HijriMonth.objects.filter(source=HijriMonth.COMPUTED).count(), 35)
+        self.assertEqual(HijriMonth.objects.get(pk=sighted.pk).gregorian_start, date(2024, 7, 9))
+        self.assertEqual(HijriMonth.objects.get(year=1445, number=12).gregorian_end, date(2024, 7, 8))
+        self.assertEqual(HijriMonth.objects.get(year=1446, number=2).gregorian_start, date(2024, 8, 8))
+        self.assert_contiguous()
+        rajab = HijriMonth.objects.get(year=1446, number=7)
+        self.assertEqual(hijri.month_resolver.containing(date(2025, 1, 15)), rajab.id)
+        self.assertEqual(len(rajab.calendar_data['gregorian_dates']), 30)
+
+    def test_loading_a_year_file_replaces_and_refits_computed_months(self):
+        hijri_tabular.generate_months(1446, 1448)
+        muharram_id = HijriMonth.objects.get(year=1447, number=1).id
+
+        # Sighted a day before the tabular 1 Muharram 1447 (2025-06-27)
+        hijri_data.load_year(make_year_file(1447, start=date(2025, 6, 26)))
+
+        muharram = HijriMonth.objects.get(year=1447, number=1)
+        self.assertEqual((muharram.id, muharram.source), (muharram_id, HijriMonth.SIGHTED))
+        self.assertEqual(HijriMonth.objects.get(year=1446, number=12).gregorian_end, date(2025, 6, 25))
+        self.assertEqual(HijriMonth.objects.get(year=1447, number=3).gregorian_start, date(2025, 8, 24))
+        self.assert_contiguous()
+
+        response = APIClient().get(reverse('hijri-calendar'), {'gregorian_date': '2025-09-01'})
+        self.assertEqual(response.json()['month']['source'], HijriMonth.COMPUTED)
+        self.assertEqual(response.json()['month']['number'], 3)
+
+
+class HijriYearViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        hijri_data.load_year(make_year_file(1447))
+        self.url = reverse('hijri-year', args=[1447])
+
+    def test_year_view_is_three_queries_then_cached(self):
+        # The annotated months query and the two event prefetches
+        with self.assertNumQueries(3):
+            first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.json(), first.json())
+        muharram, safar = first.json()['months']
+        self.assertEqual((len(muharram['days']), len(safar['days'])), (30, 29))
+        self.assertEqual((muharram['event_count'], muharram['astronomical_event_count'], muharram['holiday_count']), (2, 1, 1))
+        self.assertEqual(muharram['days'][0]['events'][0]['title_ar'], 'رأس السنة')
+        self.assertEqual(muharram['days'][1]['astronomical_events'][0]['time'], '21:01')
+        self.assertEqual(muharram['days'][9]['gregorian_date'], '2025-07-06')
+
+    def test_changes_to_the_year_invalidate_it(self):
+        self.client.get(self.url)
+        safar = HijriMonth.objects.get(year=1447, number=2)
+
+        HijriEvent.objects.create(title_ar='حدث', day=5, month=safar)
+        self.assertEqual(self.client.get(self.url).json()['months'][1]['event_count'], 1)
+
+        safar.name_en = 'Safar al-Muzaffar'
+        safar.save()
+        self.assertEqual(self.client.get(self.url).json()['months'][1]['name_en'], 'Safar al-Muzaffar')
+
+    def test_unknown_year(self):
+        self.assertEqual(self.client.get(reverse('hijri-year', args=[1300])).status_code, 404)
+
+    def test_month_list_counts_events_in_one_query(self):
+        # Page count and the annotated page, whatever the number of months
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('hijrimonth-list'))
+
+        self.assertEqual([month['event_count'] for month in response.json()['results']], [2, 0])
+
+
+class ConvertDateTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('convert-date')
+        # Sighted a day after the tabular 1 Muharram 1446 (2024-07-08)
+        create_month(number=1, year=1446, start=date(2024, 7, 9), days=30)
+
+    def test_gregorian_to_hijri(self):
+        response = self.client.get(self.url, {'gregorian': '2024-07-10'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['hijri']['date'], '1446-01-02')
+        self.assertEqual(response.data['hijri']['month']['en'], 'Muharram')
+        self.assertEqual(response.data['source'], HijriMonth.SIGHTED)
+
+        # The tabular Dhul-Hijjah 1445 is stretched to end before the sighted month
+        response = self.client.get(self.url, {'gregorian': '2024-07-08'})
+        self.assertEqual(response.data['hijri']['date'], '1445-12-31')
+        self.assertEqual(response.data['source'], hijri_convert.TABULAR)
+
+    def test_hijri_to_gregorian(self):
+        response = self.client.get(self.url, {'hijri': '1446-01-30'})
+        self.assertEqual(response.data['gregorian'], '2024-08-07')
+
+        response = self.client.get(self.url, {'hijri': '1500-01-01'})
+        self.assertEqual(response.data['gregorian'], hijri_tabular.to_gregorian(1500, 1, 1).isoformat())
+
+        self.assertEqual(self.client.get(self.url, {'hijri': '1446-02-30'}).status_code, 400)
+
+    def test_conversions_do_not_query_once_loaded(self):
+        self.client.get(self.url, {'gregorian': '2024-07-10'})
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'gregorian': '2030-01-01'})
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_conversions_follow_month_changes(self):
+        self.client.get(self.url, {'gregorian': '2024-08-10'})
+
+        create_month(number=2, year=1446, start=date(2024, 8, 8), days=29, name_en='Safar')
+        response = self.client.get(self.url, {'gregorian': '2024-08-10'})
+
+        self.assertEqual(response.data['hijri']['date'], '1446-02-03')
+        self.assertEqual(response.data['source'], HijriMonth.SIGHTED)
+
+    def test_batch_keeps_input_order(self):
+        response = self.client.post(self.url, {
+            'gregorian': ['2024-07-10', '2025-03-01'],
+            'hijri': ['1446-01-01'],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual([result['hijri']['date'] for result in response.data['gregorian']], ['1446-01-02', '1446-09-01'])
+        self.assertEqual(response.data['hijri'][0]['gregorian'], '2024-07-09')
+
+    def test_invalid_requests(self):
+        for params in ({}, {'gregorian': '2024-07-10', 'hijri': '1446-01-01'},
+                       {'gregorian': '10/07/2024'}, {'gregorian': '0600-01-01'}, {'hijri': '1446-13-01'},
+                       {'gregorian': '9999-12-31'}, {'hijri': '9666-01-01'}, {'hijri': '99999999-01-01'}):
+            self.assertEqual(self.client.get(self.url, params).status_code, 400, params)
+
+        # The last convertible day, at the end of the last Hijri year that fits
+        response = self.client.get(self.url, {'gregorian': hijri_convert.LAST_DAY.isoformat()})
+        self.assertEqual(response.data['hijri']['day'], hijri_tabular.month_length(hijri_convert.LAST_YEAR, 12))
+        response = self.client.get(self.url, {'hijri': f'{hijri_convert.LAST_YEAR}-12-01'})
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.post(self.url, {'gregorian': ['2024-07-10', 'soon']}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.data['error'].startswith('gregorian[1]:'))
+
+
+class QiblaBatchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('qibla-batch')
+        self.points = [(51.5074, -0.1278), (-33.8688, 151.2093), (40.7128, -74.006), (21.3891, 39.8579)]
+
+    def test_json_batch_matches_scalar_formula_in_input_order(self):
+        response = self.client.post(self.url, {'coordinates': self.points}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 4)
+        for (lat, lng), result in zip(self.points, response.data['results']):
+            self.assertEqual((result['latitude'], result['longitude']), (lat, lng))
+            self.assertAlmostEqual(result['direction'], qibla.qibla_direction(lat, lng), places=2)
+        # London to Mecca is roughly 4,790 km
+        self.assertAlmostEqual(response.data['results'][0]['distance_km'], 4790, delta=10)
+
+    def test_json_objects_are_accepted(self):
+        body = [{'latitude': lat, 'longitude': lng} for lat, lng in self.points]
+
+        response = self.client.post(self.url, body, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 4)
+
+    def test_csv_batch(self):
+        body = 'lat,lng\n' + '\n'.join(f'{lat},{lng}' for lat, lng in self.points)
+
+        response = self.client.post(self.url, body, content_type='text/csv')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['latitude'] for r in response.data['results']], [p[0] for p in self.points])
+
+    def test_invalid_batches_are_rejected(self):
+        for body in ([], [[91, 0]], [['a', 'b']], {'coordinates': 'x'}, ['12'], [[1, 2, 3]], [[True, 1]]):
+            response = self.client.post(self.url, body, format='json')
+            self.assertEqual(response.status_code, 400, body)
+
+    @override_settings(QIBLA_BATCH_MAX_POINTS=3)
+    def test_batch_size_is_limited(self):
+        response = self.client.post(self.url, {'coordinates': self.points}, format='json')
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,200 @@
+"""
+Pooled async HTTP client for the Quran API (api.alquran.cloud).
+
+Every event loop gets one httpx.AsyncClient whose keep-alive connections are
+reused across requests, so an upstream fetch no longer pays a TCP and TLS
+handshake. Concurrency is bounded by the pool size
+(settings.UPSTREAM_MAX_CONNECTIONS): extra fetches wait for a free
+connection up to the pool timeout. Under the ASGI application there is one
+long-lived loop per worker and therefore one pool; under WSGI every request
+runs in a fresh loop and gets no reuse.
+
+fetch_data() puts a cache and a single-flight layer in front of it, keyed
+by upstream URL. Concurrent misses for the same URL within a loop wait on
+one fetch; with settings.UPSTREAM_CACHE_LOCK, a lock in the shared cache
+extends that to every worker, the ones that lose the lock waiting for the
+winner's answer to appear in the cache. Answers older than
+UPSTREAM_FRESH_TTL are still served while one background fetch refreshes
+them (stale-while-revalidate). That needs a loop that outlives the request;
+under WSGI the refresh is awaited inline instead, since the request's loop
+is closed, cancelling leftover tasks, as soon as the view returns. Failures
+are shared by the waiters of a fetch but never cached.
+"""
+import asyncio
+import functools
+import logging
+import time
+import weakref
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from . import cache
+
+logger = logging.getLogger(__name__)
+
+QURAN_API_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/json',
+}
+
+# event loop -> AsyncClient; connections cannot be shared between loops
+_clients = weakref.WeakKeyDictionary()
+# event loop -> {url: task of the fetch in flight}
+_flights = weakref.WeakKeyDictionary()
+
+# How often a worker that lost the cross-process lock looks for the answer
+LOCK_POLL_INTERVAL = 0.05
+
+
+class UpstreamError(Exception):
+    """The Quran API could not be reached or gave an unusable answer"""
+
+    def __init__(self, error, **details):
+        super().__init__(error)
+        self.error = error
+        self.details = details
+
+    def payload(self):
+        return {'error': self.error, **self.details}
+
+
+def get_client():
+    """The shared AsyncClient of the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        timeout = settings.UPSTREAM_TIMEOUT
+        client = _clients[loop] = httpx.AsyncClient(
+            headers=QURAN_API_HEADERS,
+            timeout=httpx.Timeout(timeout, connect=min(timeout, 5.0)),
+            limits=httpx.Limits(
+                max_connections=settings.UPSTREAM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.UPSTREAM_MAX_CONNECTIONS,
+            ),
+        )
+    return client
+
+
+async def close_client():
+    """Close the running loop's client (at shutdown, or at the end of a test)"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def quran_api_url(path):
+    return f"{settings.QURAN_API_BASE_URL.rstrip('/')}/{path}"
+
+
+async def get(path):
+    """GET `path` of the Quran API; raises httpx.HTTPError on network failures"""
+    return await get_client().get(quran_api_url(path))
+
+
+def _parse(response):
+    """The `data` of a Quran API response, or UpstreamError"""
+    if response.status_code != 200:
+        raise UpstreamError(
+            f'Failed to fetch {response.url.path} from Quran API: {response.status_code}',
+            details=response.text[:200],
+        )
+    try:
+        data = response.json()
+    except ValueError as e:
+        raise UpstreamError('Invalid JSON response from Quran API', details=str(e), response=response.text[:200])
+    if not isinstance(data, dict) or data.get('code') != 200 or 'data' not in data:
+        raise UpstreamError('Invalid response format from Quran API', response=data)
+    return data['data']
+
+
+async def _cache_call(func, *args):
+    # Cache backends block (redis, file); keep them off the event loop
+    return await sync_to_async(func, thread_sensitive=False)(*args)
+
+
+async def _fetch(url):
+    try:
+        response = await get_client().get(url)
+    except httpx.HTTPError as e:
+        raise UpstreamError(f'Network error when connecting to Quran API: {str(e)}')
+    return _parse(response)
+
+
+async def _wait_for_peer(url, newer_than):
+    """
+    Poll the cache for the answer another worker is fetching. Returns the
+    cached (fetched_at, data) once it is newer than `newer_than`, or None if
+    the other worker gave up the lock without storing one.
+    """
+    while True:
+        await asyncio.sleep(LOCK_POLL_INTERVAL)
+        entry = await _cache_call(cache.get, 'quran-upstream', url)
+        if entry is not None and entry[0] > newer_than:
+            return entry
+        if await _cache_call(cache.get, 'quran-upstream-lock', url) is None:
+            return None
+
+
+async def _fetch_and_store(url, newer_than):
+    locked = False
+    if settings.UPSTREAM_CACHE_LOCK:
+        # Expires on its own if the worker holding it dies mid-fetch
+        lock_timeout = int(settings.UPSTREAM_TIMEOUT) + 1
+        locked = await _cache_call(cache.add, 'quran-upstream-lock', url, True, lock_timeout)
+        if not locked:
+            entry = await _wait_for_peer(url, newer_than)
+            if entry is not None:
+                return entry[1]
+    try:
+        data = await _fetch(url)
+        await _cache_call(cache.set, 'quran-upstream', url, (time.time(), data), settings.UPSTREAM_STALE_TTL)
+        return data
+    finally:
+        if locked:
+            await _cache_call(cache.delete, 'quran-upstream-lock', url)
+
+
+def _flight(url, newer_than=0):
+    """The running fetch of `url` in this loop, starting one if there is none"""
+    flights = _flights.setdefault(asyncio.get_running_loop(), {})
+    task = flights.get(url)
+    if task is None:
+        task = flights[url] = asyncio.ensure_future(_fetch_and_store(url, newer_than))
+        task.add_done_callback(lambda done: flights.pop(url, None))
+    return task
+
+
+def _log_revalidation(url, task):
+    # Nobody awaits a background refresh; the stale answer stays in place
+    # until the next try
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning('Refreshing %s from the Quran API failed: %s', url, task.exception())
+
+
+async def fetch_data(path, background_refresh=True):
+    """
+    The `data` of the Quran API response for `path`, from the cache when
+    possible. Raises UpstreamError if it has to be fetched and that fails.
+    A stale answer is refreshed in a background task, or, without
+    `background_refresh` (no long-lived event loop), before returning.
+    """
+    url = quran_api_url(path)
+    entry = await _cache_call(cache.get, 'quran-upstream', url)
+    if entry is None:
+        # Shielded so a client disconnecting does not cancel the fetch
+        # other requests are waiting on
+        return await asyncio.shield(_flight(url))
+
+    fetched_at, data = entry
+    if time.time() - fetched_at >= settings.UPSTREAM_FRESH_TTL:
+        flight = _flight(url, newer_than=fetched_at)
+        if background_refresh:
+            flight.add_done_callback(functools.partial(_log_revalidation, url))
+            return data
+        try:
+            return await asyncio.shield(flight)
+        except UpstreamError as e:
+            logger.warning('Refreshing %s from the Quran API failed: %s', url, e)
+    return data
@@ -0,0 +1,154 @@
+"""
+A local stand-in for the Quran API, for tests and benchmarks.
+
+StubQuranUpstream serves the /juz/<n>/<edition> and /surah/<n>/<edition>
+endpoints of api.alquran.cloud from a full-Quran dump (the import_quran
+source format) over plain HTTP/1.1 with keep-alive, optionally adding a
+fixed latency to every response and a handshake delay to every new
+connection, standing in for the TCP and TLS round trips to the real API.
+synthetic_dump() builds a small dump for when no real one is at hand.
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from . import quran
+
+SURAH_INFO_FIELDS = ('number', 'name', 'englishName', 'englishNameTranslation', 'revelationType')
+
+
+def synthetic_dump(edition=quran.DEFAULT_EDITION, ayahs_per_surah=3):
+    """
+    A synthetic full-Quran dump in the alquran.cloud format: every surah has
+    `ayahs_per_surah` ayahs and four consecutive surahs share a juz.
+    """
+    surahs = []
+    number = 0
+    for surah_number in range(1, quran.SURAH_COUNT + 1):
+        ayahs = []
+        for number_in_surah in range(1, ayahs_per_surah + 1):
+            number += 1
+            ayahs.append({
+                'number': number,
+                'text': f'{edition} {surah_number}:{number_in_surah}',
+                'numberInSurah': number_in_surah,
+                'juz': min((surah_number - 1) // 4 + 1, quran.JUZ_COUNT),
+                'manzil': min((surah_number - 1) // 17 + 1, 7),
+                'page': (number - 1) // 5 + 1,
+                'ruku': surah_number,
+                'hizbQuarter': (number - 1) // 3 + 1,
+                'sajda': False,
+            })
+        surahs.append({
+            'number': surah_number,
+            'name': f'سورة {surah_number}',
+            'englishName': f'Surah {surah_number}',
+            'englishNameTranslation': f'Translation {surah_number}',
+            'revelationType': 'Meccan',
+            'ayahs': ayahs,
+        })
+    return {'code': 200, 'status': 'OK', 'data': {'surahs': surahs, 'edition': {'identifier': edition}}}
+
+
+def _render_responses(dump):
+    """Pre-serialized upstream bodies keyed by request path"""
+    data = dump.get('data', dump)
+    edition = (data.get('edition') or {}).get('identifier') or quran.DEFAULT_EDITION
+    bodies = {}
+    juz_ayahs = {}
+    for surah in data['surahs']:
+        info = {field: surah[field] for field in SURAH_INFO_FIELDS}
+        info['numberOfAyahs'] = len(surah['ayahs'])
+        bodies[f"/surah/{surah['number']}/{edition}"] = {**info, 'ayahs': surah['ayahs']}
+        for ayah in surah['ayahs']:
+            juz_ayahs.setdefault(ayah['juz'], []).append({**ayah, 'surah': info})
+    for juz_number, ayahs in juz_ayahs.items():
+        bodies[f'/juz/{juz_number}/{edition}'] = {'number': juz_number, 'ayahs': ayahs}
+    return {
+        path: json.dumps({'code': 200, 'status': 'OK', 'data': body}, ensure_ascii=False).encode('utf-8')
+        for path, body in bodies.items()
+    }
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Benchmarks open many connections at once
+    request_queue_size = 128
+
+
+class StubQuranUpstream:
+    """
+    Serves a dump on 127.0.0.1 from a background thread. Use as a context
+    manager, or call start()/stop(); `base_url` replaces
+    settings.QURAN_API_BASE_URL.
+    """
+
+    def __init__(self, dump=None, port=0, latency=0.0, handshake=0.0):
+        self.latency = latency
+        self.handshake = handshake
+        self.request_count = 0
+        self.connection_count = 0
+        self._bodies = _render_responses(dump or synthetic_dump())
+        self._count_lock = threading.Lock()
+        self._server = _Server(('127.0.0.1', port), self._handler_class())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/v1'
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive
+            # Headers and body go out as separate writes; without this Nagle's
+            # algorithm stalls every reused connection on a delayed ACK
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with stub._count_lock:
+                    stub.connection_count += 1
+                if stub.handshake:
+                    time.sleep(stub.handshake)
+
+            def do_GET(self):
+                with stub._count_lock:
+                    stub.request_count += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+                path = re.sub(r'^/v1', '', self.path.split('?', 1)[0])
+                body = stub._bodies.get(path)
+                if body is None:
+                    self.send_response(404)
+                    body = json.dumps({'code': 404, 'status': 'Not Found', 'data': path}).encode('utf-8')
+                else:
+                    self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -4,7 +4,9 @@ from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from .views import (
     home, get_juz_text, get_surah_text, KhatmahViewSet, ParticipantViewSet, JuzAssignmentViewSet,
     SurahAssignmentViewSet, HijriMonthViewSet, HijriEventViewSet, AstronomicalEventViewSet, 
-    test_api_view, get_hijri_calendar, calendar_dashboard, get_qibla_direction, compass_view
+    test_api_view, get_hijri_calendar, calendar_dashboard, get_qibla_direction, compass_view,
+    cache_stats, get_qibla_directions_batch, khatmah_events, convert_date,
+    get_hijri_year, search_quran, suggest_quran, get_quran_division, get_quran_ayah, get_quran_ayahs
 )
 
 router = DefaultRouter()
@@ -19,8 +21,20 @@ router.register(r'astronomical-events', AstronomicalEventViewSet)
 # Common API patterns
 api_patterns = [
     path('hijri-calendar/', get_hijri_calendar, name='hijri-calendar'),
+    path('hijri-years/<int:year>/', get_hijri_year, name='hijri-year'),
+    path('convert/', convert_date, name='convert-date'),
     path('juz/<int:juz_number>/text/', get_juz_text, name='juz-text'),
     path('surah/<int:surah_number>/text/', get_surah_text, name='surah-text'),
+    path('quran/page/<int:number>/', get_quran_division, {'division': 'page'}, name='quran-page'),
+    path('quran/hizb/<int:number>/', get_quran_division, {'division': 'hizb'}, name='quran-hizb'),
+    path('quran/rub/<int:number>/', get_quran_division, {'division': 'rub'}, name='quran-rub'),
+    path('quran/manzil/<int:number>/', get_quran_division, {'division': 'manzil'}, name='quran-manzil'),
+    path('quran/ayah/<str:ref>/', get_quran_ayah, name='quran-ayah'),
+    path('quran/ayahs/', get_quran_ayahs, name='quran-ayahs'),
+    path('quran/search/', search_quran, name='quran-search'),
+    path('quran/suggest/', suggest_quran, name='quran-suggest'),
+    path('khatmahs/<uuid:khatmah_id>/events/', khatmah_events, name='khatmah-events'),
+    path('qibla/batch/', get_qibla_directions_batch, name='qibla-batch'),
     path('qibla/<str:latitude>/<str:longitude>/', get_qibla_direction, name='qibla-direction'),
     path('', include(router.urls)),
 ]
@@ -35,6 +49,7 @@ urlpatterns = [
     path('test/', test_api_view, name='test-api'),
     path('calendar-dashboard/', calendar_dashboard, name='calendar-dashboard'),
     path('compass/', compass_view, name='compass'),
+    path('cache-stats/', cache_stats, name='cache-stats'),
     
     # API endpoints (both versioned and unversioned)
     *api_patterns,  # Unversioned endpoints
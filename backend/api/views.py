@@ -1,6 +1,12 @@
-from django.http import JsonResponse
-from rest_framework import viewsets, status
-from rest_framework.decorators import api_view, action
+from django.core.handlers.asgi import ASGIRequest
+from django.http import (
+    HttpResponse, HttpResponseNotAllowed, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+)
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import exceptions, viewsets, status
+from rest_framework.decorators import api_view, action, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 from .models import Khatmah, Participant, JuzAssignment, SurahAssignment, HijriMonth, HijriEvent, AstronomicalEvent
@@ -9,13 +15,19 @@ from .serializers import (
     SurahAssignmentSerializer, HijriMonthDetailSerializer, HijriMonthListSerializer, 
     HijriEventSerializer, AstronomicalEventSerializer
 )
-import requests
-from django.shortcuts import render
+import functools
+import hashlib
 import math
 import uuid
+from asgiref.sync import sync_to_async
+from django.shortcuts import render
+from rest_framework.settings import api_settings
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.conf import settings
-from django.core.cache import cache
+from . import cache
+from django.db.models import Count, IntegerField, Max, OuterRef, Prefetch, Subquery, Value
+from django.db.models.functions import Coalesce
+from . import assignments, events, hijri, hijri_convert, progress, qibla, quran, quran_search, upstream
 
 
 def home(request):
@@ -66,162 +78,385 @@ def test_api_view(request):
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-@api_view(['GET'])
-def get_juz_text(request, juz_number):
+def _async_api_get(view):
+    """
+    For async function views, which DRF's @api_view cannot wrap: allow GET
+    only and apply the default DRF throttles like @api_view would
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return HttpResponseNotAllowed(['GET'])
+        try:
+            wait = await sync_to_async(_throttle_wait)(request)
+        except exceptions.APIException as e:
+            # A bad token is refused like @api_view would refuse it
+            return JsonResponse({'detail': e.detail}, status=e.status_code)
+        if wait is not None:
+            response = JsonResponse({'detail': 'Request was throttled.'}, status=status.HTTP_429_TOO_MANY_REQUESTS)
+            response['Retry-After'] = str(math.ceil(wait))
+            return response
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+def _throttle_wait(request):
+    """Seconds to wait if one of the default throttles refuses the request, else None"""
+    # Authenticate first, so signed-in users get the user rate and not the anonymous one
+    request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES:
+        throttle = throttle_class()
+        if not throttle.allow_request(request, None):
+            return throttle.wait() or 0
+    return None
+
+async def _fetch_quran_api(request, path):
+    """
+    Fetch `path` from the Quran API (cached and coalesced, see
+    api/upstream.py). Returns (data, None) on success or (None, error
+    response) when the upstream call fails.
+    """
+    # Only the ASGI server keeps the event loop alive after the response;
+    # under WSGI every request runs in a loop of its own
+    asgi = isinstance(request, ASGIRequest)
+    try:
+        return await upstream.fetch_data(path, background_refresh=asgi), None
+    except upstream.UpstreamError as e:
+        return None, JsonResponse(e.payload(), status=status.HTTP_502_BAD_GATEWAY)
+    finally:
+        if not asgi:
+            # The loop ends with the request, so would its client and connections
+            await upstream.close_client()
+
+def _quran_data_unavailable_response():
+    return JsonResponse(
+        {'error': 'Quran text has not been imported on this server'},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+def _edition_unavailable_response(error):
+    return JsonResponse({'error': str(error)}, status=status.HTTP_404_NOT_FOUND)
+
+# The local Quran text only changes when an edition is re-imported, so let
+# clients and proxies keep it for a day, then revalidate with the ETag
+QURAN_TEXT_CACHE_CONTROL = 'public, max-age=86400'
+
+def _not_modified(request, etag, last_modified=None):
     """
-    Fetch the text content for a specific Juz from the Quran API
+    Whether the client's cached copy is still current. If-None-Match takes
+    precedence; If-Modified-Since is only consulted without it.
+    """
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return '*' in etags or etag in etags
+    if last_modified is not None:
+        since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE'))
+        return since is not None and int(last_modified.timestamp()) <= since
+    return False
+
+def _rendered_text_response(request, rendered):
+    """
+    Send a pre-rendered Quran text body, or 304 when the client already holds
+    the same ETag
+    """
+    if _not_modified(request, rendered.etag):
+        response = HttpResponseNotModified()
+        response['ETag'] = rendered.etag
+        response['Cache-Control'] = QURAN_TEXT_CACHE_CONTROL
+        return response
+    
+    response = HttpResponse(rendered.body, content_type='application/json; charset=utf-8')
+    response['ETag'] = rendered.etag
+    response['Cache-Control'] = QURAN_TEXT_CACHE_CONTROL
+    return response
+
+# Response bodies proxied from the Quran API keep the Arabic text readable
+UNICODE_JSON = {'ensure_ascii': False}
+
+async def _local_text(endpoint, number, editions=()):
+    # No database access: run in the thread pool rather than the shared
+    # sync thread so concurrent requests do not queue behind each other
+    return await sync_to_async(quran.render_text, thread_sensitive=False)(endpoint, number, editions=editions)
+
+@_async_api_get
+async def get_juz_text(request, juz_number):
+    """
+    Get the text content for a specific Juz from the local Quran text store,
+    with each ayah's translations in the locally imported ?editions= (comma
+    separated). Falls back to the Quran API only if the text has not been
+    imported yet and no editions were asked for.
     """
     if juz_number < 1 or juz_number > 30:
-        return Response({'error': 'Invalid Juz number. Must be between 1 and 30.'}, 
-                        status=status.HTTP_400_BAD_REQUEST)
+        return JsonResponse({'error': 'Invalid Juz number. Must be between 1 and 30.'}, 
+                            status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        # Fetch Arabic text from the Quran API
-        api_url = f"https://api.alquran.cloud/v1/juz/{juz_number}/quran-uthmani"
-        
-        # Add proper headers to the request
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'application/json',
-        }
-        
-        response = requests.get(api_url, headers=headers, timeout=10)
-        
-        # Check if the response is valid
-        if response.status_code != 200:
-            return Response(
-                {'error': f'Failed to fetch Juz text from Quran API: {response.status_code}', 'details': response.text[:200]},
-                status=status.HTTP_502_BAD_GATEWAY
-            )
-        
-        # Try to parse the JSON response
+        editions = quran.parse_editions(request.GET.get('editions', ''))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
         try:
-            data = response.json()
-        except ValueError as e:
-            return Response(
-                {'error': 'Invalid JSON response from Quran API', 'details': str(e), 'response': response.text[:200]},
-                status=status.HTTP_502_BAD_GATEWAY
-            )
-        
-        # Check if the API response is valid
-        if data.get('code') != 200 or 'data' not in data:
-            return Response(
-                {'error': 'Invalid response format from Quran API', 'response': data},
-                status=status.HTTP_502_BAD_GATEWAY
-            )
-        
-        # Extract the ayahs from the response
-        ayahs = data['data']['ayahs']
-        
-        # Format the response
-        formatted_text = juz_number
-        
-        # Group ayahs by surah
-        current_surah = None
-        for ayah in ayahs:
-            surah_name = ayah['surah']['name']
-            
-            # Add surah header when changing to a new surah
-            if current_surah != surah_name:
-                current_surah = surah_name
-                formatted_text += f"\n## {surah_name}\n\n"
-            
-            # Add the ayah text
-            formatted_text += f"{ayah['text']} ({ayah['numberInSurah']})\n\n"
+            return _rendered_text_response(request, await _local_text('juz', juz_number, editions))
+        except quran.EditionUnavailable as e:
+            return _edition_unavailable_response(e)
+        except quran.QuranDataUnavailable:
+            if editions or not settings.QURAN_UPSTREAM_FALLBACK:
+                return _quran_data_unavailable_response()
+        
+        data, error_response = await _fetch_quran_api(request, f'juz/{juz_number}/{quran.DEFAULT_EDITION}')
+        if error_response:
+            return error_response
+        ayahs = data['ayahs']
         
-        return Response({
+        return JsonResponse({
             'juz_number': juz_number,
-            'text': formatted_text,
+            'text': quran.format_juz_text(ayahs),
             'ayahs': ayahs
-        })
-    except requests.exceptions.RequestException as e:
-        return Response(
-            {'error': f'Network error when connecting to Quran API: {str(e)}'},
-            status=status.HTTP_502_BAD_GATEWAY
-        )
+        }, json_dumps_params=UNICODE_JSON)
     except Exception as e:
-        return Response(
+        return JsonResponse(
             {'error': f'An error occurred: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
-@api_view(['GET'])
-def get_surah_text(request, surah_number):
+@_async_api_get
+async def get_surah_text(request, surah_number):
     """
-    Fetch the text content for a specific Surah from the Quran API
+    Get the text content for a specific Surah from the local Quran text store,
+    with each ayah's translations in the locally imported ?editions= (comma
+    separated). Falls back to the Quran API only if the text has not been
+    imported yet and no editions were asked for.
     """
     if surah_number < 1 or surah_number > 114:
-        return Response({'error': 'Invalid Surah number. Must be between 1 and 114.'}, 
-                        status=status.HTTP_400_BAD_REQUEST)
+        return JsonResponse({'error': 'Invalid Surah number. Must be between 1 and 114.'}, 
+                            status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        # Fetch Arabic text from the Quran API
-        api_url = f"https://api.alquran.cloud/v1/surah/{surah_number}/quran-uthmani"
-        
-        # Add proper headers to the request
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'application/json',
-        }
-        
-        response = requests.get(api_url, headers=headers, timeout=10)
-        
-        # Check if the response is valid
-        if response.status_code != 200:
-            return Response(
-                {'error': f'Failed to fetch Surah text from Quran API: {response.status_code}', 'details': response.text[:200]},
-                status=status.HTTP_502_BAD_GATEWAY
-            )
-        
-        # Try to parse the JSON response
+        editions = quran.parse_editions(request.GET.get('editions', ''))
+    except ValueError as e:
+        return JsonResponse({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
         try:
-            data = response.json()
-        except ValueError as e:
-            return Response(
-                {'error': 'Invalid JSON response from Quran API', 'details': str(e), 'response': response.text[:200]},
-                status=status.HTTP_502_BAD_GATEWAY
-            )
-        
-        # Check if the API response is valid
-        if data.get('code') != 200 or 'data' not in data:
-            return Response(
-                {'error': 'Invalid response format from Quran API', 'response': data},
-                status=status.HTTP_502_BAD_GATEWAY
-            )
-        
-        # Extract the ayahs from the response
-        ayahs = data['data']['ayahs']
-        surah_name = data['data']['name']
-        
-        # Format the response
-        formatted_text = f"## {surah_name}\n\n"
-        
-        # Add each ayah to the formatted text
-        for ayah in ayahs:
-            formatted_text += f"{ayah['text']} ({ayah['numberInSurah']})\n\n"
+            return _rendered_text_response(request, await _local_text('surah', surah_number, editions))
+        except quran.EditionUnavailable as e:
+            return _edition_unavailable_response(e)
+        except quran.QuranDataUnavailable:
+            if editions or not settings.QURAN_UPSTREAM_FALLBACK:
+                return _quran_data_unavailable_response()
+        
+        data, error_response = await _fetch_quran_api(request, f'surah/{surah_number}/{quran.DEFAULT_EDITION}')
+        if error_response:
+            return error_response
+        ayahs = data['ayahs']
+        surah_name = data['name']
         
-        return Response({
+        return JsonResponse({
             'surah_number': surah_number,
             'surah_name': surah_name,
-            'text': formatted_text,
+            'text': quran.format_surah_text(surah_name, ayahs),
             'ayahs': ayahs
-        })
-    except requests.exceptions.RequestException as e:
-        return Response(
-            {'error': f'Network error when connecting to Quran API: {str(e)}'},
-            status=status.HTTP_502_BAD_GATEWAY
-        )
+        }, json_dumps_params=UNICODE_JSON)
     except Exception as e:
-        return Response(
+        return JsonResponse(
             {'error': f'An error occurred: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+def _positive_int_param(request, name, default, maximum=None):
+    """A positive integer query parameter; raises ValueError with a message for the client"""
+    value = request.query_params.get(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise ValueError(f'{name} must be a positive integer')
+    return min(number, maximum) if maximum else number
+
+@api_view(['GET'])
+def get_quran_division(request, division, number):
+    """
+    The ayahs of one page, hizb, rub (quarter hizb) or manzil of the mushaf
+    from the local Quran text store, with the verse keys of the first and
+    last ayah and each ayah's translations in the imported ?editions=
+    """
+    try:
+        editions = quran.parse_editions(request.query_params.get('editions', ''))
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        return _rendered_text_response(request, quran.render_text(division, number, editions=editions))
+    except quran.EditionUnavailable as e:
+        return _edition_unavailable_response(e)
+    except quran.QuranDataUnavailable:
+        return _quran_data_unavailable_response()
+    except KeyError:
+        return Response({'error': f'There is no {division} {number}'}, status=status.HTTP_404_NOT_FOUND)
+
+@api_view(['GET'])
+def get_quran_ayah(request, ref):
+    """One ayah by its number in the mushaf (262) or surah:ayah (2:255)"""
+    try:
+        number = quran.get_edition().ayah_row(ref) + 1
+        return _rendered_text_response(request, quran.render_text('ayah', number))
+    except quran.QuranDataUnavailable:
+        return _quran_data_unavailable_response()
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+@api_view(['GET'])
+def get_quran_ayahs(request):
+    """
+    The ayahs from ?from= to ?to= inclusive, both given as ayah numbers or
+    surah:ayah, at most QURAN_RANGE_MAX_AYAHS of them
+    """
+    if 'from' not in request.query_params or 'to' not in request.query_params:
+        return Response({'error': 'Provide from and to (ayah number or surah:ayah)'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    try:
+        text = quran.get_edition()
+        start = text.ayah_row(request.query_params['from'])
+        end = text.ayah_row(request.query_params['to']) + 1
+    except quran.QuranDataUnavailable:
+        return _quran_data_unavailable_response()
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if end <= start:
+        return Response({'error': 'from must not come after to'}, status=status.HTTP_400_BAD_REQUEST)
+    if end - start > settings.QURAN_RANGE_MAX_AYAHS:
+        return Response({'error': f'At most {settings.QURAN_RANGE_MAX_AYAHS} ayahs per request'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    return _rendered_text_response(request, quran.render_range(text, start, end))
+
+@api_view(['GET'])
+def search_quran(request):
+    """
+    Search the local Quran text: ?q= words (all must occur), "quoted
+    phrases" and prefixes (word*), diacritics optional. Results are ranked
+    best first and paged with ?page= and ?size=; `highlights` are the
+    indexes of the matched words in text.split(' ').
+    """
+    edition = request.query_params.get('edition', quran.DEFAULT_EDITION)
+    try:
+        page = _positive_int_param(request, 'page', 1)
+        size = _positive_int_param(request, 'size', quran_search.DEFAULT_PAGE_SIZE, quran_search.MAX_PAGE_SIZE)
+        index = quran_search.get_index(edition)
+        results = index.search(request.query_params.get('q', ''))
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except quran.QuranDataUnavailable:
+        return Response({'error': f'Edition {edition} has not been imported on this server'},
+                        status=status.HTTP_404_NOT_FOUND)
+
+    text = index.text
+    matches = []
+    for result in results[(page - 1) * size:page * size]:
+        row = text.ayahs[result.row]
+        surah = text.surah_info(row[1])
+        matches.append({
+            'number': row[0],
+            'verse_key': f'{row[1]}:{row[2]}',
+            'surah': {'number': surah['number'], 'name': surah['name'], 'englishName': surah['englishName']},
+            'numberInSurah': row[2],
+            'juz': row[3],
+            'page': row[5],
+            'text': text.ayah_text(result.row),
+            'score': result.score,
+            'highlights': results.highlights(result),
+        })
+    return Response({
+        'query': request.query_params.get('q', ''),
+        'edition': edition,
+        'count': len(results),
+        'page': page,
+        'size': size,
+        'results': matches,
+    })
+
+@api_view(['GET'])
+def suggest_quran(request):
+    """
+    Type-ahead for the Quran search: completions of the last word of ?q=
+    among the words of the Quran, most frequent first, and the surahs whose
+    Arabic or English name completes ?q=. At most ?limit= of each.
+    """
+    query = request.query_params.get('q', '')
+    edition = request.query_params.get('edition', quran.DEFAULT_EDITION)
+    try:
+        limit = _positive_int_param(request, 'limit', quran_search.DEFAULT_SUGGESTIONS, quran_search.MAX_SUGGESTIONS)
+        index = quran_search.get_index(edition)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except quran.QuranDataUnavailable:
+        return Response({'error': f'Edition {edition} has not been imported on this server'},
+                        status=status.HTTP_404_NOT_FOUND)
+
+    suggester = index.suggester
+    last_word = query.split()[-1] if query.split() else ''
+    surahs = [index.text.surah_info(number) for number in suggester.surahs(quran_search.normalize_words(query), limit)]
+    return Response({
+        'query': query,
+        'words': [
+            {'text': form, 'count': count}
+            for form, count in suggester.words(quran_search.normalize(last_word), limit)
+        ],
+        'surahs': [
+            {'number': surah['number'], 'name': surah['name'], 'englishName': surah['englishName']}
+            for surah in surahs
+        ],
+    })
+
+def _count_subquery(model, **filters):
+    """
+    Correlated COUNT(*) subquery over `model` rows belonging to the outer khatmah.
+    Used instead of Count() over joins so several counts don't multiply rows.
+    """
+    counts = (
+        model.objects.filter(khatmah=OuterRef('pk'), **filters)
+        .order_by()
+        .values('khatmah')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+def _khatmah_detail_prefetches():
+    """
+    Prefetch tree matching the nesting of KhatmahSerializer so the whole detail
+    payload is loaded in a fixed number of queries.
+    """
+    juz_assignments = JuzAssignment.objects.select_related('participant')
+    surah_assignments = SurahAssignment.objects.select_related('participant')
+    participants = Participant.objects.prefetch_related(
+        Prefetch('assignments', queryset=juz_assignments),
+        Prefetch('surah_assignments', queryset=surah_assignments),
+    )
+    return (
+        Prefetch('participants', queryset=participants),
+        Prefetch('assignments', queryset=juz_assignments),
+        Prefetch('surah_assignments', queryset=surah_assignments),
+    )
+
 class KhatmahPagination(PageNumberPagination):
     page_size = 12
     page_size_query_param = 'page_size'
     max_page_size = 100
 
+# Khatmah payloads change with every join and claim: let clients keep them
+# but make them revalidate (cheaply, see KhatmahViewSet.list/retrieve)
+KHATMAH_CACHE_CONTROL = 'private, no-cache'
+
+def _with_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    response['Cache-Control'] = KHATMAH_CACHE_CONTROL
+    return response
+
 class KhatmahViewSet(viewsets.ModelViewSet):
     """
     Khatmah API endpoints.
@@ -264,6 +499,22 @@ class KhatmahViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         queryset = Khatmah.objects.all()
         
+        if self.action == 'list':
+            # Compute every count the list serializer needs in the main query
+            # and fetch participant id/name with a single prefetch
+            queryset = queryset.annotate(
+                participant_count=_count_subquery(Participant),
+                completed_juz_count=_count_subquery(JuzAssignment, completed=True),
+                completed_surah_count=_count_subquery(SurahAssignment, completed=True),
+            ).prefetch_related(
+                Prefetch('participants', queryset=Participant.objects.only('id', 'name', 'khatmah_id'))
+            )
+        elif self.action in ('retrieve', 'remove_participant'):
+            queryset = queryset.select_related('creator').prefetch_related(*_khatmah_detail_prefetches())
+        
+        return self.filter_private(queryset)
+    
+    def filter_private(self, queryset):
         # Check if is_private filter is in the request
         is_private = self.request.query_params.get('is_private', None)
         if is_private is not None:
@@ -275,6 +526,41 @@ class KhatmahViewSet(viewsets.ModelViewSet):
             
         return queryset
     
+    def list_validators(self, request):
+        """
+        ETag and Last-Modified of a list page, from one aggregate over the
+        filtered khatmahs: every change touches updated_at, and deletions
+        change the count
+        """
+        stamp = self.filter_private(Khatmah.objects.all()).aggregate(
+            count=Count('pk'), last_modified=Max('updated_at')
+        )
+        key = f"{request.get_full_path()}|{stamp['count']}|{stamp['last_modified']}"
+        return '"khatmahs-%s"' % hashlib.sha256(key.encode('utf-8')).hexdigest()[:32], stamp['last_modified']
+    
+    def detail_validators(self, request, pk):
+        """
+        ETag and Last-Modified of a khatmah from its version columns, or None
+        if it does not exist. Owners (matching creator_token) see the token in
+        the payload, so they get a distinct ETag.
+        """
+        if not self.validate_uuid(pk):
+            return None
+        row = Khatmah.objects.filter(pk=pk).values_list('version', 'updated_at', 'creator_token').first()
+        if row is None:
+            return None
+        version, updated_at, token = row
+        creator_token = request.query_params.get('creator_token')
+        scope = 'owner' if creator_token and str(creator_token) == str(token) else 'public'
+        return f'"khatmah-{version}.{int(updated_at.timestamp() * 1000000)}-{scope}"', updated_at
+    
+    def list(self, request, *args, **kwargs):
+        # Answer revalidations before the page queries and serializers run
+        etag, last_modified = self.list_validators(request)
+        if _not_modified(request, etag, last_modified):
+            return _with_validators(HttpResponseNotModified(), etag, last_modified)
+        return _with_validators(super().list(request, *args, **kwargs), etag, last_modified)
+    
     def create(self, request, *args, **kwargs):
         # Validate the creator_token if provided (must be a valid UUID)
         creator_token_from_request = request.data.get('creator_token')
@@ -344,9 +630,59 @@ class KhatmahViewSet(viewsets.ModelViewSet):
             khatmah.creator = participant
             khatmah.save()
         
+        events.publish(khatmah.id, events.JOIN, {'participant': {'id': str(participant.id), 'name': participant.name}})
+        
         serializer = ParticipantSerializer(participant)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     
+    @action(detail=True, methods=['post'])
+    def claim(self, request, pk=None):
+        """
+        Claim one or many juz/surah numbers for a participant in one
+        transaction. Body: {"participant": id, "numbers": [..] or "number": n,
+        "type": "juz"|"surah" (defaults to the khatmah type)}. Responds with
+        the numbers won, their assignments, and the numbers already taken.
+        """
+        khatmah = self.get_object()
+        kind = request.data.get('type') or khatmah.khatmah_type
+        if kind not in assignments.CLAIM_KINDS:
+            return Response({'error': 'Type must be juz or surah'}, status=status.HTTP_400_BAD_REQUEST)
+
+        participant_id = request.data.get('participant')
+        if not self.validate_uuid(participant_id):
+            return Response({'error': 'Invalid UUID format for participant ID'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            numbers = assignments.parse_numbers(kind, request.data.get('numbers', request.data.get('number')))
+            won, taken = assignments.claim(khatmah.id, participant_id, kind, numbers)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Participant.DoesNotExist:
+            return Response({'error': 'Participant not found in this khatmah'}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer_class = JuzAssignmentSerializer if kind == Khatmah.JUZ_TYPE else SurahAssignmentSerializer
+        _, field, _ = assignments.CLAIM_KINDS[kind]
+        return Response({
+            'type': kind,
+            'claimed': [getattr(assignment, field) for assignment in won],
+            'taken': taken,
+            'assignments': serializer_class(won, many=True).data,
+        }, status=status.HTTP_201_CREATED if won else status.HTTP_200_OK)
+    
+    @action(detail=True, methods=['get'])
+    def progress(self, request, pk=None):
+        """
+        Assigned/completed state of every juz or surah as two hex bitmaps
+        (bit n - 1 is number n) with a version that changes with every
+        assignment change. Served from the cache until the next change.
+        """
+        if not self.validate_uuid(pk):
+            return Response({'error': 'Invalid khatmah ID format'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            return Response(progress.get_progress(pk))
+        except Khatmah.DoesNotExist:
+            return Response({'error': 'Khatmah not found'}, status=status.HTTP_404_NOT_FOUND)
+    
     def update(self, request, *args, **kwargs):
         khatmah = self.get_object()
         
@@ -454,6 +790,11 @@ class KhatmahViewSet(viewsets.ModelViewSet):
         return super().destroy(request, *args, **kwargs)
 
     def retrieve(self, request, *args, **kwargs):
+        # Answer revalidations before the detail prefetches and serializers run
+        validators = self.detail_validators(request, kwargs['pk'])
+        if validators and _not_modified(request, *validators):
+            return _with_validators(HttpResponseNotModified(), *validators)
+        
         khatmah = self.get_object()
         
         # Validate the creator_token if provided (must be a valid UUID)
@@ -471,7 +812,15 @@ class KhatmahViewSet(viewsets.ModelViewSet):
                 # Don't return an error for GET requests, just don't authenticate
                 pass
         
-        return super().retrieve(request, *args, **kwargs)
+        # Serialize the instance loaded above rather than letting the parent
+        # retrieve() run the detail queryset and its prefetches a second time
+        serializer = self.get_serializer(khatmah)
+        response = Response(serializer.data)
+        # Validators read before the body: a change in between only costs the
+        # client one more full response
+        if validators:
+            _with_validators(response, *validators)
+        return response
 
     @action(detail=True, methods=['post'])
     def remove_participant(self, request, pk=None):
@@ -534,9 +883,12 @@ class KhatmahViewSet(viewsets.ModelViewSet):
                 )
             
             # Delete the participant (this will cascade delete their assignments due to FK)
+            removed_id = str(participant.id)
             participant.delete()
+            events.publish(khatmah.id, events.REMOVE_PARTICIPANT, {'participant': removed_id})
             
-            # Refresh khatmah data
+            # Refresh khatmah data; the prefetched collections are stale now
+            khatmah = self.get_queryset().get(pk=khatmah.pk)
             serializer = self.get_serializer(khatmah)
             return Response(serializer.data)
             
@@ -590,14 +942,23 @@ class JuzAssignmentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
             
-        # Check if the juz is already assigned in this khatmah
-        if JuzAssignment.objects.filter(khatmah_id=khatmah_id, juz_number=juz_number).exists():
+        # Insert with ON CONFLICT DO NOTHING so concurrent claims of the same
+        # juz cannot fail with an IntegrityError
+        try:
+            won, taken = assignments.claim(khatmah_id, participant_id, Khatmah.JUZ_TYPE, [juz_number])
+        except Participant.DoesNotExist:
+            return Response(
+                {'error': 'Participant not found in this khatmah'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if taken:
             return Response(
                 {'error': f'Juz {juz_number} is already assigned in this khatmah'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(won[0])
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
     
     @action(detail=True, methods=['post'])
     def toggle_complete(self, request, pk=None):
@@ -613,6 +974,10 @@ class JuzAssignmentViewSet(viewsets.ModelViewSet):
         assignment = self.get_object()
         assignment.completed = not assignment.completed
         assignment.save()
+        events.publish(assignment.khatmah_id, events.TOGGLE_COMPLETE, {
+            'assignment': str(assignment.id), 'type': Khatmah.JUZ_TYPE, 'number': assignment.juz_number,
+            'participant': str(assignment.participant_id), 'completed': assignment.completed,
+        })
         serializer = self.get_serializer(assignment)
         return Response(serializer.data)
 
@@ -656,14 +1021,23 @@ class SurahAssignmentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Check if the surah is already assigned in this khatmah
-        if SurahAssignment.objects.filter(khatmah_id=khatmah_id, surah_number=surah_number).exists():
+        # Insert with ON CONFLICT DO NOTHING so concurrent claims of the same
+        # surah cannot fail with an IntegrityError
+        try:
+            won, taken = assignments.claim(khatmah_id, participant_id, Khatmah.SURAH_TYPE, [surah_number])
+        except Participant.DoesNotExist:
+            return Response(
+                {'error': 'Participant not found in this khatmah'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if taken:
             return Response(
                 {'error': f'Surah {surah_number} is already assigned in this khatmah'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(won[0])
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
     
     @action(detail=True, methods=['post'])
     def toggle_complete(self, request, pk=None):
@@ -679,6 +1053,10 @@ class SurahAssignmentViewSet(viewsets.ModelViewSet):
         assignment = self.get_object()
         assignment.completed = not assignment.completed
         assignment.save()
+        events.publish(assignment.khatmah_id, events.TOGGLE_COMPLETE, {
+            'assignment': str(assignment.id), 'type': Khatmah.SURAH_TYPE, 'number': assignment.surah_number,
+            'participant': str(assignment.participant_id), 'completed': assignment.completed,
+        })
         serializer = self.get_serializer(assignment)
         return Response(serializer.data)
 
@@ -698,6 +1076,14 @@ class HijriMonthViewSet(viewsets.ModelViewSet):
             return HijriMonthListSerializer
         return HijriMonthDetailSerializer
     
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # One query for the page instead of a COUNT per month; the
+            # aggregate drops Meta.ordering, so keep it explicitly
+            queryset = queryset.annotate(event_count=Count('events')).order_by('year', 'number')
+        return queryset
+    
     @action(detail=False, methods=['get'])
     def by_number(self, request):
         """Get a Hijri month by its number and year"""
@@ -737,39 +1123,12 @@ class HijriMonthViewSet(viewsets.ModelViewSet):
             from datetime import date
             today = date.today()
             
-            # Find the Hijri month that contains today's date
-            current_month = HijriMonth.objects.filter(
-                gregorian_start__lte=today,
-                gregorian_end__gte=today
-            ).first()
-            
-            # If no month contains today's date (might happen if data is incomplete)
+            # Find the Hijri month that contains today's date, or the closest
+            # one if the data is incomplete
+            current_month = hijri.resolve_month(today)
             if not current_month:
-                # Try to find the closest month
-                future_months = HijriMonth.objects.filter(
-                    gregorian_start__gt=today
-                ).order_by('gregorian_start')
-                
-                past_months = HijriMonth.objects.filter(
-                    gregorian_end__lt=today
-                ).order_by('-gregorian_end')
-                
-                if future_months.exists() and past_months.exists():
-                    # Calculate which is closer - the most recent past month or the nearest future month
-                    future_month = future_months.first()
-                    past_month = past_months.first()
-                    
-                    days_to_future = (future_month.gregorian_start - today).days
-                    days_from_past = (today - past_month.gregorian_end).days
-                    
-                    current_month = future_month if days_to_future < days_from_past else past_month
-                elif future_months.exists():
-                    current_month = future_months.first()
-                elif past_months.exists():
-                    current_month = past_months.first()
-                else:
-                    return Response({'error': 'No Hijri months found in the database'}, 
-                                  status=status.HTTP_404_NOT_FOUND)
+                return Response({'error': 'No Hijri months found in the database'}, 
+                              status=status.HTTP_404_NOT_FOUND)
             
             serializer = HijriMonthDetailSerializer(current_month)
             return Response(serializer.data)
@@ -854,13 +1213,20 @@ class AstronomicalEventViewSet(viewsets.ModelViewSet):
 @api_view(['GET'])
 def get_hijri_calendar(request):
     """
-    Get Hijri calendar data for a specific month or the current month
+    Get Hijri calendar data for a specific month or the current month.
+    Pass ?shape=compact to receive each event once, referenced by id from the days.
     """
     month_name = request.query_params.get('month')
     month_number = request.query_params.get('month_number')
     year = request.query_params.get('year')
     gregorian_date = request.query_params.get('gregorian_date')
     
+    # 'compact' lists each event once and references it by id from the days
+    shape = request.query_params.get('shape', hijri.FULL_SHAPE)
+    if shape not in hijri.CALENDAR_SHAPES:
+        return Response({'error': f"Invalid shape. Use one of: {', '.join(hijri.CALENDAR_SHAPES)}"}, 
+                      status=status.HTTP_400_BAD_REQUEST)
+    
     try:
         # If gregorian_date is provided, find the Hijri month containing this date
         if gregorian_date:
@@ -868,42 +1234,15 @@ def get_hijri_calendar(request):
                 # Parse the date string (format: YYYY-MM-DD)
                 from datetime import datetime
                 date_obj = datetime.strptime(gregorian_date, '%Y-%m-%d').date()
-                
-                # Find the Hijri month that contains this Gregorian date
-                month = HijriMonth.objects.filter(
-                    gregorian_start__lte=date_obj,
-                    gregorian_end__gte=date_obj
-                ).first()
-                
-                if not month:
-                    # If no exact match, get the closest month
-                    future_months = HijriMonth.objects.filter(
-                        gregorian_start__gt=date_obj
-                    ).order_by('gregorian_start')
-                    
-                    past_months = HijriMonth.objects.filter(
-                        gregorian_end__lt=date_obj
-                    ).order_by('-gregorian_end')
-                    
-                    if future_months.exists() and past_months.exists():
-                        # Calculate which is closer
-                        future_month = future_months.first()
-                        past_month = past_months.first()
-                        
-                        days_to_future = (future_month.gregorian_start - date_obj).days
-                        days_from_past = (date_obj - past_month.gregorian_end).days
-                        
-                        month = future_month if days_to_future < days_from_past else past_month
-                    elif future_months.exists():
-                        month = future_months.first()
-                    elif past_months.exists():
-                        month = past_months.first()
-                    else:
-                        return Response({'error': 'No Hijri months found in the database'}, 
-                                      status=status.HTTP_404_NOT_FOUND)
             except ValueError:
                 return Response({'error': 'Invalid date format. Use YYYY-MM-DD'}, 
                               status=status.HTTP_400_BAD_REQUEST)
+            
+            # Find the Hijri month that contains this Gregorian date, or the closest one
+            month_id = hijri.month_resolver.nearest(date_obj)
+            if not month_id:
+                return Response({'error': 'No Hijri months found in the database'}, 
+                              status=status.HTTP_404_NOT_FOUND)
         # If month_number and year are provided, get that specific month by number
         elif month_number and year:
             try:
@@ -914,9 +1253,9 @@ def get_hijri_calendar(request):
                     return Response({'error': 'Month number must be between 1 and 12'}, 
                                   status=status.HTTP_400_BAD_REQUEST)
                 
-                month = HijriMonth.objects.filter(number=month_number, year=year).first()
+                month_id = HijriMonth.objects.filter(number=month_number, year=year).values_list('id', flat=True).first()
                 
-                if not month:
+                if not month_id:
                     return Response({'error': f'No Hijri month found with number: {month_number} and year: {year}'}, 
                                   status=status.HTTP_404_NOT_FOUND)
             except ValueError:
@@ -925,13 +1264,13 @@ def get_hijri_calendar(request):
         # If month name and year are provided, get that specific month by name
         elif month_name and year:
             # Try to find by English name first (case insensitive)
-            month = HijriMonth.objects.filter(name_en__iexact=month_name, year=year).first()
+            month_id = HijriMonth.objects.filter(name_en__iexact=month_name, year=year).values_list('id', flat=True).first()
             
             # If not found, try Arabic name
-            if not month:
-                month = HijriMonth.objects.filter(name_ar__iexact=month_name, year=year).first()
+            if not month_id:
+                month_id = HijriMonth.objects.filter(name_ar__iexact=month_name, year=year).values_list('id', flat=True).first()
                 
-            if not month:
+            if not month_id:
                 return Response({'error': f'No Hijri month found with name: {month_name} and year: {year}'}, 
                               status=status.HTTP_404_NOT_FOUND)
         else:
@@ -939,90 +1278,42 @@ def get_hijri_calendar(request):
             from datetime import date
             today = date.today()
             
-            # Find the Hijri month that contains today's date
-            month = HijriMonth.objects.filter(
-                gregorian_start__lte=today,
-                gregorian_end__gte=today
-            ).first()
-            
-            # If no month contains today's date (might happen if data is incomplete)
-            if not month:
-                # Try to find the closest month
-                future_months = HijriMonth.objects.filter(
-                    gregorian_start__gt=today
-                ).order_by('gregorian_start')
-                
-                past_months = HijriMonth.objects.filter(
-                    gregorian_end__lt=today
-                ).order_by('-gregorian_end')
-                
-                if future_months.exists() and past_months.exists():
-                    # Calculate which is closer
-                    future_month = future_months.first()
-                    past_month = past_months.first()
-                    
-                    days_to_future = (future_month.gregorian_start - today).days
-                    days_from_past = (today - past_month.gregorian_end).days
-                    
-                    month = future_month if days_to_future < days_from_past else past_month
-                elif future_months.exists():
-                    month = future_months.first()
-                elif past_months.exists():
-                    month = past_months.first()
-                else:
-                    return Response({'error': 'No Hijri months found in the database'}, 
-                                  status=status.HTTP_404_NOT_FOUND)
-        
-        # Get events for this month
-        events = HijriEvent.objects.filter(month=month)
-        events_data = HijriEventSerializer(events, many=True).data
-        
-        # Get astronomical events for this month
-        astro_events = AstronomicalEvent.objects.filter(month=month)
-        astro_events_data = AstronomicalEventSerializer(astro_events, many=True).data
-        
-        # Format the calendar data
-        calendar_data = []
-        if month.calendar_data and 'gregorian_dates' in month.calendar_data:
-            for date_mapping in month.calendar_data['gregorian_dates']:
-                hijri_day = date_mapping['hijri']
-                gregorian_date = date_mapping['gregorian']
-                
-                # Find events for this day
-                day_events = [event for event in events_data if event['day'] == hijri_day]
-                
-                # Find astronomical events for this day (comparing gregorian date)
-                day_astro_events = [
-                    event for event in astro_events_data 
-                    if event['date'] == gregorian_date
-                ]
-                
-                calendar_data.append({
-                    'hijri_day': hijri_day,
-                    'gregorian_date': gregorian_date,
-                    'events': day_events,
-                    'astronomical_events': day_astro_events
-                })
+            # Find the Hijri month that contains today's date, or the closest
+            # one if the data is incomplete
+            month_id = hijri.month_resolver.nearest(today)
+            if not month_id:
+                return Response({'error': 'No Hijri months found in the database'}, 
+                              status=status.HTTP_404_NOT_FOUND)
         
-        # Return the data
-        return Response({
-            'month': {
-                'id': str(month.id),
-                'name_ar': month.name_ar,
-                'name_en': month.name_en,
-                'number': month.number,
-                'year': month.year,
-                'gregorian_start': month.gregorian_start,
-                'gregorian_end': month.gregorian_end,
-                'moon_sighting_data': month.moon_sighting_data
-            },
-            'calendar': calendar_data,
-            'events': events_data,
-            'astronomical_events': astro_events_data
-        })
+        # Payloads are materialized when the month or its events change, so
+        # date lookups are normally a single cache fetch
+        return Response(hijri.get_month_calendar(month_id, shape))
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+async def khatmah_events(request, khatmah_id):
+    """
+    Server-sent events (text/event-stream) of a khatmah: join, claim,
+    toggle_complete and remove_participant. Reconnecting clients resume from
+    the Last-Event-ID header (or ?last_event_id=), and get a `reset` event
+    when the missed events are gone and they should re-fetch the khatmah.
+    Needs the ASGI application (backend/asgi.py) to stream: under WSGI the
+    stream would hold a worker forever, so it answers 501 instead.
+    """
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({'error': 'Live events need the ASGI server'}, status=status.HTTP_501_NOT_IMPLEMENTED)
+    if not await Khatmah.objects.filter(pk=khatmah_id).aexists():
+        return JsonResponse({'error': 'Khatmah not found'}, status=404)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id') or None
+    response = StreamingHttpResponse(events.stream(khatmah_id, last_event_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Keep nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
 @api_view(['GET'])
 def get_qibla_direction(request, latitude, longitude):
     """
@@ -1033,36 +1324,169 @@ def get_qibla_direction(request, latitude, longitude):
         # Convert string coordinates to float
         lat = float(latitude)
         lng = float(longitude)
-        
-        # Mecca coordinates
-        mecca_lat = 21.422487
-        mecca_lng = 39.826206
-        
-        # Convert to radians
-        lat_rad = math.radians(lat)
-        lng_rad = math.radians(lng)
-        mecca_lat_rad = math.radians(mecca_lat)
-        mecca_lng_rad = math.radians(mecca_lng)
-        
-        # Calculate qibla direction
-        y = math.sin(mecca_lng_rad - lng_rad)
-        x = math.cos(lat_rad) * math.tan(mecca_lat_rad) - math.sin(lat_rad) * math.cos(mecca_lng_rad - lng_rad)
-        qibla = math.atan2(y, x)
-        qibla = math.degrees(qibla)
-        
-        # Convert to 0-360 range
-        if qibla < 0:
-            qibla += 360
-            
-        return JsonResponse({
-            'direction': round(qibla, 2),
-            'from_coordinates': f"{lat}, {lng}",
-            'to_coordinates': f"{mecca_lat}, {mecca_lng}"
-        })
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            raise ValueError('Latitude must be within [-90, 90] and longitude within [-180, 180]')
+
+        exact = request.GET.get('exact', '').lower() in ('true', '1')
+        if settings.QIBLA_GRID_ENABLED and not exact:
+            # The grid tiles already are a quantized cache of the bearings
+            return JsonResponse(_qibla_payload(lat, lng, qibla.bearing_grid().direction(lat, lng), 'grid'))
+
+        # Not cached: the formula is cheaper than a cache round trip, and
+        # client-chosen coordinates would grow the key space without bound
+        return JsonResponse(_qibla_payload(lat, lng, qibla.qibla_direction(lat, lng), 'exact'))
         
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=400)
 
+def _qibla_payload(lat, lng, direction, method):
+    return {
+        'direction': round(direction, 2),
+        'method': method,
+        'from_coordinates': f"{lat}, {lng}",
+        'to_coordinates': f"{qibla.MECCA_LAT}, {qibla.MECCA_LNG}"
+    }
+
+def _parse_qibla_batch(request):
+    """
+    Read the coordinate pairs of a batch Qibla request, in input order.
+    Accepts a JSON list of [lat, lng] pairs or {"latitude", "longitude"}
+    objects (optionally wrapped in {"coordinates": [...]}), or a CSV body with
+    one "lat,lng" pair per line and an optional header row.
+    Raises ValueError with a message for the client on bad input.
+    """
+    if request.content_type.startswith('text/csv'):
+        rows = [line.split(',') for line in request.body.decode('utf-8-sig').splitlines() if line.strip()]
+        if rows and rows[0][0].strip().lower() in ('lat', 'latitude'):
+            rows = rows[1:]
+    else:
+        rows = request.data.get('coordinates') if isinstance(request.data, dict) else request.data
+        if not isinstance(rows, list):
+            raise ValueError('Expected a list of coordinate pairs')
+        rows = [
+            (row.get('latitude'), row.get('longitude')) if isinstance(row, dict) else row
+            for row in rows
+        ]
+    
+    if not rows:
+        raise ValueError('No coordinates provided')
+    if len(rows) > settings.QIBLA_BATCH_MAX_POINTS:
+        raise ValueError(f'Too many coordinates. At most {settings.QIBLA_BATCH_MAX_POINTS} per request.')
+    
+    lats = []
+    lngs = []
+    for index, row in enumerate(rows):
+        # Only a real pair: a string such as "12" would unpack to (1, 2)
+        if not isinstance(row, (list, tuple)) or len(row) != 2 or any(isinstance(value, bool) for value in row):
+            raise ValueError(f'Coordinate pair {index} is not a valid (latitude, longitude) pair')
+        try:
+            lat, lng = (float(value) for value in row)
+        except (TypeError, ValueError):
+            raise ValueError(f'Coordinate pair {index} is not a valid (latitude, longitude) pair')
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            raise ValueError(f'Coordinate pair {index} is out of range')
+        lats.append(lat)
+        lngs.append(lng)
+    return lats, lngs
+
+@api_view(['POST'])
+def get_qibla_directions_batch(request):
+    """
+    Calculate Qibla directions and distances to the Kaaba for many locations
+    in one request. Results are returned in input order.
+    """
+    try:
+        lats, lngs = _parse_qibla_batch(request)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    bearings, distances = qibla.qibla_directions(lats, lngs)
+    return Response({
+        'count': len(lats),
+        'to_coordinates': f"{qibla.MECCA_LAT}, {qibla.MECCA_LNG}",
+        'results': [
+            {'latitude': lat, 'longitude': lng, 'direction': direction, 'distance_km': distance}
+            for lat, lng, direction, distance in zip(
+                lats, lngs, bearings.round(2).tolist(), distances.round(3).tolist()
+            )
+        ]
+    })
+
+@api_view(['GET'])
+def get_hijri_year(request, year):
+    """
+    Every month of a Hijri year with its day-by-day Gregorian mapping and
+    event summaries, in one response
+    """
+    try:
+        return Response(hijri.get_year_calendar(year))
+    except HijriMonth.DoesNotExist:
+        return Response({'error': f'No Hijri months found for year {year}'}, status=status.HTTP_404_NOT_FOUND)
+
+def _parse_convert_batch(request):
+    """
+    Read the {"gregorian": [...], "hijri": [...]} body of a batch conversion.
+    Raises ValueError with a message for the client on bad input.
+    """
+    if not isinstance(request.data, dict):
+        raise ValueError('Expected {"gregorian": [...], "hijri": [...]}')
+    batches = {}
+    for calendar in ('gregorian', 'hijri'):
+        values = request.data.get(calendar, [])
+        if not isinstance(values, list):
+            raise ValueError(f'"{calendar}" must be a list of YYYY-MM-DD dates')
+        batches[calendar] = values
+    count = sum(len(values) for values in batches.values())
+    if not count:
+        raise ValueError('No dates provided')
+    if count > settings.CONVERT_BATCH_MAX_DATES:
+        raise ValueError(f'Too many dates. At most {settings.CONVERT_BATCH_MAX_DATES} per request.')
+    return batches
+
+@api_view(['GET', 'POST'])
+def convert_date(request):
+    """
+    Convert between Gregorian and Hijri dates locally: GET with
+    ?gregorian=YYYY-MM-DD or ?hijri=YYYY-MM-DD, or POST
+    {"gregorian": [...], "hijri": [...]} to convert many dates at once
+    (results in input order).
+    """
+    converter = hijri_convert.get_converter()
+    converters = {'gregorian': hijri_convert.convert_gregorian, 'hijri': hijri_convert.convert_hijri}
+
+    if request.method == 'POST':
+        try:
+            batches = _parse_convert_batch(request)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        results = {}
+        for calendar, values in batches.items():
+            results[calendar] = []
+            for index, value in enumerate(values):
+                try:
+                    results[calendar].append(converters[calendar](converter, value))
+                except ValueError as e:
+                    return Response({'error': f'{calendar}[{index}]: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'count': sum(len(values) for values in results.values()), **results})
+
+    given = [calendar for calendar in converters if calendar in request.query_params]
+    if len(given) != 1:
+        return Response({'error': 'Provide exactly one of gregorian or hijri (YYYY-MM-DD)'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    try:
+        return Response(converters[given[0]](converter, request.query_params[given[0]]))
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def cache_stats(request):
+    """
+    Cache hit/miss counters of the worker process that served this request
+    (staff only: it reveals the process id and cache backend)
+    """
+    return Response(cache.stats())
+
 def compass_view(request):
     """
     Render the compass page
@@ -111,6 +111,8 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'backend.wsgi.application'
+# The khatmah event streams need the ASGI application
+ASGI_APPLICATION = 'backend.asgi.application'
 
 
 # Database
@@ -220,11 +222,80 @@ if 'corsheaders' not in INSTALLED_APPS:
 # The CorsMiddleware is already placed at the beginning of MIDDLEWARE
 # No need to check or modify it here
 
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+# Cache timeout in seconds (24 hours)
+CACHE_TTL = 60 * 60 * 24
+
+# Cache backend shared by all workers: 'redis', 'file' or 'locmem'.
+# locmem is per process and only meant for development and tests.
+CACHE_BACKEND = os.environ.get('DJANGO_CACHE_BACKEND', 'locmem')
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', 'redis://127.0.0.1:6379/1'),
+            'KEY_PREFIX': '7sanah',
+            'TIMEOUT': CACHE_TTL,
+        }
+    }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', os.path.join(BASE_DIR, 'cache')),
+            'KEY_PREFIX': '7sanah',
+            'TIMEOUT': CACHE_TTL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'TIMEOUT': CACHE_TTL,
+        }
     }
-}
 
-# Cache timeout in seconds (24 hours)
-CACHE_TTL = 60 * 60 * 24
\ No newline at end of file
+# Local Quran text store (filled by `python manage.py import_quran`)
+QURAN_DATA_DIR = os.environ.get('QURAN_DATA_DIR', os.path.join(BASE_DIR, 'data', 'quran'))
+
+# Hijri year files loaded by `python manage.py load_hijri_year`
+HIJRI_DATA_DIR = os.environ.get('HIJRI_DATA_DIR', os.path.join(BASE_DIR, 'data', 'hijri'))
+
+# Most ayahs served by one GET /api/quran/ayahs/?from=&to= request
+QURAN_RANGE_MAX_AYAHS = int(os.environ.get('QURAN_RANGE_MAX_AYAHS', '1000'))
+# Most translations merged into one text response with ?editions=
+QURAN_MAX_EDITIONS_PER_REQUEST = int(os.environ.get('QURAN_MAX_EDITIONS_PER_REQUEST', '5'))
+# Memory each worker may spend on loaded editions, with their search indexes
+# and rendered bodies, before dropping the least recently used ones (one
+# edition is always kept). Packed text counts as its whole mapped file, so
+# this bounds mapped bytes; the resident, shared part is usually smaller.
+QURAN_EDITIONS_MEMORY_MB = int(os.environ.get('QURAN_EDITIONS_MEMORY_MB', '64'))
+
+# Proxy the Quran API for editions that have not been imported yet
+QURAN_UPSTREAM_FALLBACK = os.environ.get('QURAN_UPSTREAM_FALLBACK', 'True') == 'True'
+QURAN_API_BASE_URL = os.environ.get('QURAN_API_BASE_URL', 'https://api.alquran.cloud/v1')
+# Pooled async client used for the upstream calls (see api/upstream.py)
+UPSTREAM_TIMEOUT = float(os.environ.get('UPSTREAM_TIMEOUT', '10'))  # seconds
+UPSTREAM_MAX_CONNECTIONS = int(os.environ.get('UPSTREAM_MAX_CONNECTIONS', '20'))  # per worker
+# Upstream answers are served from the cache for UPSTREAM_FRESH_TTL seconds,
+# then served stale and refreshed in the background until UPSTREAM_STALE_TTL
+UPSTREAM_FRESH_TTL = int(os.environ.get('UPSTREAM_FRESH_TTL', str(60 * 60)))
+UPSTREAM_STALE_TTL = int(os.environ.get('UPSTREAM_STALE_TTL', str(CACHE_TTL * 7)))
+# Coalesce identical fetches across worker processes through a lock in the shared cache
+UPSTREAM_CACHE_LOCK = os.environ.get('UPSTREAM_CACHE_LOCK', 'False') == 'True'
+
+# Maximum number of coordinate pairs accepted by POST /api/qibla/batch/
+QIBLA_BATCH_MAX_POINTS = int(os.environ.get('QIBLA_BATCH_MAX_POINTS', '10000'))
+
+# Maximum number of dates accepted by POST /api/convert/
+CONVERT_BATCH_MAX_DATES = int(os.environ.get('CONVERT_BATCH_MAX_DATES', '10000'))
+
+# Answer GET /api/qibla/ from the interpolated bearing grid (see api/qibla.py)
+# instead of the exact formula; ?exact=true always uses the formula
+QIBLA_GRID_ENABLED = os.environ.get('QIBLA_GRID_ENABLED', 'False') == 'True'
+QIBLA_GRID_MAX_TILES = int(os.environ.get('QIBLA_GRID_MAX_TILES', '256'))
+
+# Live khatmah events (GET /api/khatmahs/{id}/events/)
+KHATMAH_EVENTS_BROKER = os.environ.get('KHATMAH_EVENTS_BROKER', 'api.events.InProcessBroker')
+KHATMAH_EVENTS_BUFFER = int(os.environ.get('KHATMAH_EVENTS_BUFFER', '100'))  # events kept per khatmah for resume
+KHATMAH_EVENTS_KEEPALIVE = int(os.environ.get('KHATMAH_EVENTS_KEEPALIVE', '15'))  # seconds